@@ -0,0 +1,49 @@
+"""Process-wide boto3 client registry shared by the CLI and the TUI."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+# Deploy monitoring and image pushes fan out across worker threads; the
+# botocore default of 10 pooled connections per client would make them queue.
+MAX_POOL_CONNECTIONS = 50
+MAX_ATTEMPTS = 10
+
+CLIENT_CONFIG = Config(
+    retries={"max_attempts": MAX_ATTEMPTS, "mode": "adaptive"},
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+)
+
+_lock = threading.Lock()
+_session: boto3.session.Session | None = None
+_clients: dict[tuple[str, str | None], Any] = {}
+
+
+def aws_client(service_name: str, region_name: str | None = None) -> Any:
+    """Return the shared client for *service_name* in *region_name*.
+
+    Clients are created once per (service, region) from a single session and
+    reused for the life of the process, so repeated calls keep their warm
+    connection pools. botocore clients are thread-safe once built; only
+    construction is serialised here because sessions are not.
+    """
+    key = (service_name, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            global _session
+            if _session is None:
+                _session = boto3.session.Session()
+            client = _session.client(
+                service_name, region_name=region_name, config=CLIENT_CONFIG
+            )
+            _clients[key] = client
+        return client
+
@@ -5,7 +5,12 @@ from __future__ import annotations
 import click
 
 from .helpers import require_config
-from .image_ops import build_images
+from .image_ops import (
+    DEFAULT_MAX_GROWTH_PERCENT,
+    IMAGE_COMPRESSIONS,
+    analyze_build_contexts,
+    build_images,
+)
 
 
 @click.command()
@@ -15,7 +20,155 @@ from .image_ops import build_images
     default=None,
     help="Build only a specific service. Builds all if omitted.",
 )
-def build(service_name: str | None) -> None:
-    """Build Docker images for configured services."""
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        "Maximum concurrent image builds. Defaults to a CPU/memory-aware value. "
+        "After a failure, queued builds are cancelled (unless --keep-going) and "
+        "running builds finish."
+    ),
+)
+@click.option(
+    "--keep-going",
+    is_flag=True,
+    default=False,
+    help="Keep building remaining services after a build fails.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help=(
+        "Rebuild every service. By default a service whose Dockerfile, "
+        ".dockerignore-filtered context and build options match its last "
+        "recorded build, and whose image still exists, is skipped."
+    ),
+)
+@click.option(
+    "--bake",
+    is_flag=True,
+    default=False,
+    help=(
+        "Build all services with one 'docker buildx bake' run so shared stages "
+        "are built once. The bake file is written to .darth-infra/build/."
+    ),
+)
+@click.option(
+    "--registry-cache",
+    "registry_cache_env",
+    default=None,
+    metavar="ENV",
+    help=(
+        "Import/export a BuildKit registry cache in the ECR repositories of "
+        "environment ENV (requires a docker-container buildx builder)."
+    ),
+)
+@click.option(
+    "--push-to",
+    "push_env",
+    default=None,
+    metavar="ENV",
+    help=(
+        "Push images straight to the ECR repositories of environment ENV "
+        "(immutable + latest tags) instead of loading them into the local "
+        "docker daemon. Unchanged services are retagged in ECR, not rebuilt."
+    ),
+)
+@click.option(
+    "--multi-arch",
+    is_flag=True,
+    default=False,
+    help=(
+        "With --push-to, publish linux/amd64 + linux/arm64 manifest lists "
+        "(built in parallel) instead of one image for each service's own "
+        "architecture."
+    ),
+)
+@click.option(
+    "--compression",
+    type=click.Choice(IMAGE_COMPRESSIONS),
+    default=None,
+    help=(
+        "With --push-to, force-recompress every layer (zstd layers are smaller "
+        "and unpack faster when ECS pulls them). Each built service's ECR size "
+        "is reported before and after."
+    ),
+)
+@click.option(
+    "--compression-level",
+    type=click.IntRange(min=0, max=22),
+    default=None,
+    help="Compression level for --compression (gzip 0-9, zstd 0-22).",
+)
+@click.option(
+    "--size-budget",
+    "size_budget_mb",
+    type=click.IntRange(min=1),
+    default=None,
+    metavar="MB",
+    help=(
+        "Warn about locally built images larger than MB megabytes. Image sizes "
+        "are recorded in .darth-infra/build/image-history.json."
+    ),
+)
+@click.option(
+    "--max-growth",
+    "max_growth_percent",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MAX_GROWTH_PERCENT,
+    show_default=True,
+    metavar="PERCENT",
+    help="Warn when an image grew more than PERCENT since its previous build.",
+)
+@click.option(
+    "--analyze-context",
+    is_flag=True,
+    default=False,
+    help=(
+        "Report build context size, largest directories and suggested "
+        ".dockerignore entries instead of building."
+    ),
+)
+def build(
+    service_name: str | None,
+    jobs: int | None,
+    keep_going: bool,
+    force: bool,
+    bake: bool,
+    registry_cache_env: str | None,
+    push_env: str | None,
+    multi_arch: bool,
+    compression: str | None,
+    compression_level: int | None,
+    size_budget_mb: int | None,
+    max_growth_percent: float,
+    analyze_context: bool,
+) -> None:
+    """Build Docker images for configured services.
+
+    Services with the same Dockerfile, build context, target and platform are
+    built once and tagged for each service.
+    """
     config, project_dir = require_config()
-    build_images(config, project_dir, service_name)
+    if analyze_context:
+        analyze_build_contexts(config, project_dir, service_name)
+        return
+    build_images(
+        config,
+        project_dir,
+        service_name,
+        jobs=jobs,
+        keep_going=keep_going,
+        force=force,
+        bake=bake,
+        registry_cache_env=registry_cache_env,
+        push_env=push_env,
+        multi_arch=multi_arch,
+        compression=compression,
+        compression_level=compression_level,
+        size_budget_mb=size_budget_mb,
+        max_growth_percent=max_growth_percent,
+    )
@@ -0,0 +1,390 @@
+"""Docker build context walking and hashing with ``.dockerignore`` semantics."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import stat
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+# Rough local BuildKit context-transfer costs, used only for estimates.
+_TRANSFER_BYTES_PER_SECOND = 100 * 1024 * 1024
+_TRANSFER_SECONDS_PER_FILE = 0.00005
+
+# Directory names that are almost never needed inside an image build.
+_NOISY_DIR_NAMES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".cache",
+        ".next",
+        "htmlcov",
+        ".darth-infra",
+    }
+)
+_BULKY_FILE_SUFFIXES = (".sql", ".dump", ".gz", ".zip", ".tar", ".tgz", ".sqlite3", ".bak")
+_BULKY_FILE_MIN_BYTES = 10 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ContextFile:
+    """A regular file or symlink that would be sent to BuildKit."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    mode: int
+
+
+@dataclass(frozen=True)
+class _IgnorePattern:
+    text: str
+    parts: tuple[str, ...]
+    regex: re.Pattern[str]
+    exclusion: bool
+
+
+class DockerIgnore:
+    """Match context-relative paths the way BuildKit applies ``.dockerignore``.
+
+    Patterns are evaluated in order and the last matching pattern wins; a
+    leading ``!`` re-includes paths. A pattern also matches everything below
+    a directory it matches, so ``node_modules`` excludes the whole tree.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.patterns: list[_IgnorePattern] = []
+        for raw in patterns:
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            exclusion = line.startswith("!")
+            if exclusion:
+                line = line[1:].strip()
+            cleaned = os.path.normpath(line).replace(os.sep, "/").lstrip("/")
+            if not cleaned or cleaned == ".":
+                continue
+            self.patterns.append(
+                _IgnorePattern(
+                    text=cleaned,
+                    parts=tuple(cleaned.split("/")),
+                    regex=_compile_ignore_pattern(cleaned),
+                    exclusion=exclusion,
+                )
+            )
+        self._has_exclusions = any(p.exclusion for p in self.patterns)
+
+    @classmethod
+    def for_build(
+        cls, project_dir: Path, dockerfile: str, build_context: str
+    ) -> DockerIgnore:
+        """Load the ignore file BuildKit would use for this Dockerfile/context.
+
+        A ``<Dockerfile>.dockerignore`` next to the Dockerfile takes
+        precedence over ``<context>/.dockerignore``.
+        """
+        candidates = [
+            project_dir / f"{dockerfile}.dockerignore",
+            project_dir / build_context / ".dockerignore",
+        ]
+        for candidate in candidates:
+            if candidate.is_file():
+                return cls(candidate.read_text().splitlines())
+        return cls([])
+
+    def matches(self, rel_path: str) -> bool:
+        """Return True when *rel_path* is excluded from the build context."""
+        parts = rel_path.split("/")
+        matched = False
+        for pattern in self.patterns:
+            if pattern.regex.match(rel_path) or (
+                len(pattern.parts) < len(parts)
+                and pattern.regex.match("/".join(parts[: len(pattern.parts)]))
+            ):
+                matched = not pattern.exclusion
+        return matched
+
+    def can_prune(self, rel_dir: str) -> bool:
+        """Return True when nothing under excluded *rel_dir* can be re-included."""
+        if not self.matches(rel_dir):
+            return False
+        if not self._has_exclusions:
+            return True
+        dir_parts = rel_dir.split("/")
+        for pattern in self.patterns:
+            if pattern.exclusion and _could_match_below(dir_parts, pattern.parts):
+                return False
+        return True
+
+
+def walk_context(
+    context_dir: Path,
+    ignore: DockerIgnore,
+    *,
+    jobs: int | None = None,
+) -> list[ContextFile]:
+    """List every file BuildKit would send for *context_dir*, sorted by path.
+
+    Every directory is scanned as its own task on a thread pool, so one huge
+    subtree (``node_modules``, a vendored SDK) is spread across all workers.
+    Excluded directories are pruned without being descended into whenever no
+    ``!`` pattern could re-include something inside them.
+    """
+    files, subdirs = _scan_dir(context_dir, "", ignore)
+    if subdirs:
+        with ThreadPoolExecutor(max_workers=jobs or _default_io_jobs()) as executor:
+            pending: set[Future[tuple[list[ContextFile], list[str]]]] = {
+                executor.submit(_scan_dir, context_dir, rel, ignore) for rel in subdirs
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub_files, sub_dirs = future.result()
+                    files.extend(sub_files)
+                    pending.update(
+                        executor.submit(_scan_dir, context_dir, rel, ignore)
+                        for rel in sub_dirs
+                    )
+    files.sort(key=lambda item: item.path)
+    return files
+
+
+def hash_context(
+    context_dir: Path,
+    files: list[ContextFile],
+    *,
+    file_cache: dict[str, list[object]] | None = None,
+    jobs: int | None = None,
+) -> str:
+    """Return a content digest over *files* (as listed by ``walk_context``).
+
+    ``file_cache`` maps relative path to ``[size, mtime_ns, digest]``. Files
+    whose size and mtime still match reuse the cached digest instead of being
+    re-read; the rest are hashed concurrently and written back to the cache.
+    """
+    cache = file_cache if file_cache is not None else {}
+    to_hash: list[ContextFile] = []
+    for item in files:
+        cached = cache.get(item.path)
+        if not (cached and cached[0] == item.size and cached[1] == item.mtime_ns):
+            to_hash.append(item)
+
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=jobs or _default_io_jobs()) as executor:
+            digests = executor.map(
+                lambda item: _hash_file(context_dir / item.path, item.mode), to_hash
+            )
+            for item, digest in zip(to_hash, digests):
+                cache[item.path] = [item.size, item.mtime_ns, digest]
+
+    live_paths = {item.path for item in files}
+    for stale in [path for path in cache if path not in live_paths]:
+        del cache[stale]
+
+    hasher = hashlib.sha256()
+    for item in files:
+        executable = "x" if item.mode & stat.S_IXUSR else "-"
+        hasher.update(f"{item.path}\0{executable}\0{cache[item.path][2]}\n".encode())
+    return f"sha256:{hasher.hexdigest()}"
+
+
+@dataclass
+class ContextReport:
+    """What a build context would send to BuildKit, and how to shrink it.
+
+    Attributes:
+        total_bytes: Bytes of every file that survives ``.dockerignore``.
+        file_count: Number of those files.
+        largest_dirs: ``(directory, bytes, files)`` for the heaviest
+            directories, largest first.
+        suggestions: Proposed ``.dockerignore`` entries, heaviest first.
+    """
+
+    total_bytes: int = 0
+    file_count: int = 0
+    largest_dirs: list[tuple[str, int, int]] = field(default_factory=list)
+    suggestions: list[tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def estimated_transfer_seconds(self) -> float:
+        return (
+            self.total_bytes / _TRANSFER_BYTES_PER_SECOND
+            + self.file_count * _TRANSFER_SECONDS_PER_FILE
+        )
+
+
+def analyze_context(
+    files: list[ContextFile],
+    *,
+    max_depth: int = 3,
+    top: int = 10,
+) -> ContextReport:
+    """Summarise *files* (as listed by ``walk_context``) into a ``ContextReport``.
+
+    Directory totals are aggregated down to ``max_depth`` levels. Suggestions
+    cover well-known tool/cache directories and large dumps or archives.
+    """
+    report = ContextReport()
+    dir_bytes: dict[str, int] = {}
+    dir_files: dict[str, int] = {}
+    suggestions: dict[str, int] = {}
+    for item in files:
+        report.total_bytes += item.size
+        report.file_count += 1
+        parents = PurePosixPath(item.path).parts[:-1]
+        for depth in range(1, min(len(parents), max_depth) + 1):
+            rel_dir = "/".join(parents[:depth])
+            dir_bytes[rel_dir] = dir_bytes.get(rel_dir, 0) + item.size
+            dir_files[rel_dir] = dir_files.get(rel_dir, 0) + 1
+
+        noisy = next(
+            (index for index, part in enumerate(parents) if part in _NOISY_DIR_NAMES),
+            None,
+        )
+        if noisy is not None:
+            entry = parents[noisy] if noisy == 0 else f"**/{parents[noisy]}"
+            suggestions[entry] = suggestions.get(entry, 0) + item.size
+        elif (
+            item.size >= _BULKY_FILE_MIN_BYTES
+            and item.path.lower().endswith(_BULKY_FILE_SUFFIXES)
+        ):
+            suggestions[item.path] = suggestions.get(item.path, 0) + item.size
+
+    report.largest_dirs = sorted(
+        ((rel_dir, size, dir_files[rel_dir]) for rel_dir, size in dir_bytes.items()),
+        key=lambda row: (-row[1], row[0]),
+    )[:top]
+    report.suggestions = sorted(
+        suggestions.items(), key=lambda row: (-row[1], row[0])
+    )[:top]
+    return report
+
+
+def _scan_dir(
+    context_dir: Path, rel_dir: str, ignore: DockerIgnore
+) -> tuple[list[ContextFile], list[str]]:
+    """Return the context files directly in *rel_dir* and the subdirs to walk.
+
+    Unreadable subdirectories are skipped; the context root itself must be
+    readable.
+    """
+    files: list[ContextFile] = []
+    subdirs: list[str] = []
+    try:
+        entries = _scandir_sorted(context_dir / rel_dir if rel_dir else context_dir)
+    except OSError:
+        if not rel_dir:
+            raise
+        return files, subdirs
+    for entry in entries:
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            if not ignore.can_prune(rel):
+                subdirs.append(rel)
+            continue
+        context_file = _context_file(entry, rel, ignore)
+        if context_file:
+            files.append(context_file)
+    return files, subdirs
+
+
+def _context_file(
+    entry: os.DirEntry[str], rel: str, ignore: DockerIgnore
+) -> ContextFile | None:
+    if ignore.matches(rel):
+        return None
+    try:
+        info = entry.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    if not (stat.S_ISREG(info.st_mode) or stat.S_ISLNK(info.st_mode)):
+        return None
+    return ContextFile(
+        path=rel,
+        size=info.st_size,
+        mtime_ns=info.st_mtime_ns,
+        mode=info.st_mode,
+    )
+
+
+def _scandir_sorted(path: Path) -> list[os.DirEntry[str]]:
+    with os.scandir(path) as it:
+        return sorted(it, key=lambda entry: entry.name)
+
+
+def _hash_file(path: Path, mode: int) -> str:
+    hasher = hashlib.sha256()
+    if stat.S_ISLNK(mode):
+        hasher.update(os.readlink(path).encode())
+        return hasher.hexdigest()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK_BYTES):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _default_io_jobs() -> int:
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
+def _compile_ignore_pattern(pattern: str) -> re.Pattern[str]:
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            if pattern.startswith("**", i):
+                i += 2
+                if i < len(pattern) and pattern[i] == "/":
+                    out.append("(?:.*/)?")
+                    i += 1
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith(("!", "^")):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def _could_match_below(dir_parts: list[str], pattern_parts: tuple[str, ...]) -> bool:
+    for index, dir_part in enumerate(dir_parts):
+        if index >= len(pattern_parts):
+            return False
+        pattern_part = pattern_parts[index]
+        if "**" in pattern_part:
+            return True
+        if not _compile_ignore_pattern(pattern_part).match(dir_part):
+            return False
+    return len(pattern_parts) > len(dir_parts)
@@ -0,0 +1,190 @@
+"""Local build manifest used to skip rebuilding unchanged service images."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ..config.models import ServiceConfig
+from .build_context import DockerIgnore, hash_context, walk_context
+
+STATE_DIR = Path(".darth-infra")
+BUILD_DIR = STATE_DIR / "build"
+MANIFEST_FILENAME = "image-manifest.json"
+CONTEXT_CACHE_FILENAME = "context-cache.json"
+HISTORY_FILENAME = "image-history.json"
+HISTORY_LIMIT = 50
+
+
+@dataclass
+class ImageManifestEntry:
+    """Last successful build of a service image.
+
+    Attributes:
+        build_hash: Digest over the Dockerfile, filtered build context and
+            build command that produced the image.
+        image_id: Local Docker image ID produced by that build, if it was
+            loaded into the local daemon.
+        built_at: UTC ISO-8601 timestamp of the build.
+        pushed_digests: Environment name -> ECR manifest digest for builds
+            pushed straight to the registry without a local load.
+    """
+
+    build_hash: str
+    image_id: str
+    built_at: str
+    pushed_digests: dict[str, str] = field(default_factory=dict)
+
+
+class BuildManifest:
+    """Per-project build manifest plus the file-digest cache behind it.
+
+    Stored under ``.darth-infra/build/``. Safe to share between build worker
+    threads; call ``save`` once the build flow finishes.
+    """
+
+    def __init__(self, project_dir: Path) -> None:
+        self.build_dir = project_dir / BUILD_DIR
+        self.entries: dict[str, ImageManifestEntry] = {}
+        self._context_cache: dict[str, dict[str, list[object]]] = {}
+        self._lock = threading.Lock()
+
+        raw_manifest = _read_json(self.build_dir / MANIFEST_FILENAME)
+        for name, raw in raw_manifest.get("services", {}).items():
+            try:
+                self.entries[name] = ImageManifestEntry(**raw)
+            except TypeError:
+                continue
+        raw_cache = _read_json(self.build_dir / CONTEXT_CACHE_FILENAME)
+        self._context_cache = {
+            key: value for key, value in raw_cache.items() if isinstance(value, dict)
+        }
+
+    def compute_build_hash(
+        self,
+        project_dir: Path,
+        service: ServiceConfig,
+        build_command: list[str],
+    ) -> str:
+        """Fingerprint everything that feeds the build of *service*."""
+        context_dir = (project_dir / service.build_context).resolve()
+        ignore = DockerIgnore.for_build(
+            project_dir, service.dockerfile, service.build_context
+        )
+        files = walk_context(context_dir, ignore)
+
+        # Our own state directory changes on every build; never let it count
+        # as a build input even when it sits inside the build context.
+        state_dir = (project_dir / STATE_DIR).resolve()
+        if state_dir.is_relative_to(context_dir):
+            state_prefix = state_dir.relative_to(context_dir).as_posix() + "/"
+            files = [item for item in files if not item.path.startswith(state_prefix)]
+
+        cache_key = str(context_dir)
+        with self._lock:
+            file_cache = dict(self._context_cache.get(cache_key, {}))
+        context_hash = hash_context(context_dir, files, file_cache=file_cache)
+        with self._lock:
+            self._context_cache[cache_key] = file_cache
+
+        hasher = hashlib.sha256()
+        hasher.update(context_hash.encode())
+        hasher.update(b"\0")
+        dockerfile = project_dir / service.dockerfile
+        if dockerfile.is_file():
+            hasher.update(dockerfile.read_bytes())
+        hasher.update(b"\0")
+        hasher.update(json.dumps(build_command).encode())
+        return f"sha256:{hasher.hexdigest()}"
+
+    def lookup(self, service_name: str) -> ImageManifestEntry | None:
+        with self._lock:
+            return self.entries.get(service_name)
+
+    def record(self, service_name: str, entry: ImageManifestEntry) -> None:
+        with self._lock:
+            self.entries[service_name] = entry
+
+    def save(self) -> None:
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            manifest = {
+                "version": 1,
+                "services": {
+                    name: asdict(entry) for name, entry in sorted(self.entries.items())
+                },
+            }
+            cache = dict(self._context_cache)
+        (self.build_dir / MANIFEST_FILENAME).write_text(
+            json.dumps(manifest, indent=2) + "\n"
+        )
+        (self.build_dir / CONTEXT_CACHE_FILENAME).write_text(json.dumps(cache))
+
+
+@dataclass
+class ImageSizeRecord:
+    """Size snapshot of one built service image.
+
+    Attributes:
+        built_at: UTC ISO-8601 timestamp of the build.
+        image_id: Local Docker image ID.
+        size_bytes: Uncompressed image size reported by ``docker image inspect``.
+        layer_count: Number of layers in ``docker history``.
+        largest_layers: ``[size_bytes, created_by]`` pairs, largest first.
+    """
+
+    built_at: str
+    image_id: str
+    size_bytes: int
+    layer_count: int
+    largest_layers: list[list[object]] = field(default_factory=list)
+
+
+class BuildHistory:
+    """Per-service image size history stored next to the build manifest."""
+
+    def __init__(self, project_dir: Path) -> None:
+        self.build_dir = project_dir / BUILD_DIR
+        self.records: dict[str, list[ImageSizeRecord]] = {}
+        raw_history = _read_json(self.build_dir / HISTORY_FILENAME)
+        for name, raw_records in raw_history.get("services", {}).items():
+            records: list[ImageSizeRecord] = []
+            for raw in raw_records if isinstance(raw_records, list) else []:
+                try:
+                    records.append(ImageSizeRecord(**raw))
+                except TypeError:
+                    continue
+            self.records[name] = records
+
+    def latest(self, service_name: str) -> ImageSizeRecord | None:
+        records = self.records.get(service_name)
+        return records[-1] if records else None
+
+    def append(self, service_name: str, record: ImageSizeRecord) -> None:
+        records = self.records.setdefault(service_name, [])
+        records.append(record)
+        del records[:-HISTORY_LIMIT]
+
+    def save(self) -> None:
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        history = {
+            "version": 1,
+            "services": {
+                name: [asdict(record) for record in records]
+                for name, records in sorted(self.records.items())
+            },
+        }
+        (self.build_dir / HISTORY_FILENAME).write_text(
+            json.dumps(history, indent=2) + "\n"
+        )
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
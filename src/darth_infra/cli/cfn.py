@@ -2,25 +2,33 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
 import subprocess
 import time
-from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-import boto3
 from botocore.exceptions import ClientError
 from rich.console import Group
 from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 
+from ..aws_clients import aws_client
 from ..config.models import ProjectConfig
+from .cfn_package import package_nested_templates
+from .deploy_ledger import DeployFingerprint, DeployLedger
 from .helpers import console, get_cluster_name, get_service_name
+from .lookup_cache import LookupCache
+from .poller import AdaptivePoller, is_throttling_error
+from .stack_events import RecentKeys, StackEventReader
 
 
 @dataclass
@@ -41,29 +49,122 @@ class ResolvedLookupData:
 
 @dataclass
 class DeployMonitorState:
-    seen_stack_event_ids: set[str]
-    seen_service_event_keys: set[str]
-    seen_task_failure_keys: set[str]
+    stack_events: StackEventReader
+    seen_service_event_keys: RecentKeys
+    stopped_tasks: dict[str, dict[str, Any]]
     log_since_ms_by_service: dict[str, int]
     last_pending_signature: str
+    started_at: datetime | None = None
+    completed_logical_ids: set[str] = field(default_factory=set)
+    settled_nested_stacks: dict[str, tuple[tuple[str, str], list[dict[str, str]]]] = (
+        field(default_factory=dict)
+    )
+    primary_task_definitions: dict[str, str] = field(default_factory=dict)
 
 
-def resolve_lookup_data(config: ProjectConfig, env_name: str) -> ResolvedLookupData:
-    ec2 = boto3.client("ec2", region_name=config.aws_region)
-    elbv2 = boto3.client("elbv2", region_name=config.aws_region)
-    sd = boto3.client("servicediscovery", region_name=config.aws_region)
-    route53 = boto3.client("route53")
+@dataclass(frozen=True)
+class FailFastPolicy:
+    """Cancel a deploy once one service keeps crashing.
 
-    vpc_id, vpc_cidr, private_subnets, public_subnets = _resolve_network(config, ec2)
-    listener_arn, alb_sg, alb_dns_name = _resolve_shared_alb(config, elbv2)
-    default_priority, path_priorities = _resolve_listener_priorities(
-        config, env_name, elbv2, listener_arn
-    )
-    snapshot = _resolve_rds_snapshot(config, env_name)
-    external_secrets = _resolve_external_secrets(config)
-    namespace_id = _resolve_existing_service_discovery_namespace(
-        config, sd, route53, vpc_id
+    Trips when ``max_failed_tasks`` tasks of the same service stopped with a
+    non-zero exit code (or failed to start) within ``window_minutes``. Only
+    tasks of the service's new PRIMARY deployment count; old-revision tasks
+    that the scheduler stops during a rolling update do not.
+    """
+
+    max_failed_tasks: int = 3
+    window_minutes: float = 5.0
+
+
+_LOOKUP_WORKERS = 8
+_STACK_EVENT_CLOCK_SKEW = timedelta(seconds=60)
+_MONITOR_TICK_BUDGET_SECONDS = 4.0
+# ECS caps list_tasks pages and describe_tasks batches at 100 tasks.
+_TASK_BATCH_SIZE = 100
+# ECS lists stopped tasks for about an hour; cached ones are kept as long.
+_STOPPED_TASK_RETENTION = timedelta(hours=1)
+
+
+def resolve_lookup_data(
+    config: ProjectConfig,
+    env_name: str,
+    *,
+    cache: LookupCache | None = None,
+) -> ResolvedLookupData:
+    """Resolve everything the stack parameters need from the AWS account.
+
+    With ``cache`` the VPC, subnets, shared ALB and Cloud Map namespace are
+    reused from an earlier validated lookup when still fresh; listener
+    priorities, the RDS snapshot and external secrets are always resolved
+    live.
+    """
+    ec2 = aws_client("ec2", region_name=config.aws_region)
+    elbv2 = aws_client("elbv2", region_name=config.aws_region)
+    sd = aws_client("servicediscovery", region_name=config.aws_region)
+    route53 = aws_client("route53")
+    rds = aws_client("rds", region_name=config.aws_region)
+    sm = aws_client("secretsmanager", region_name=config.aws_region)
+
+    cache_key = ""
+    cached: dict[str, Any] | None = None
+    if cache is not None:
+        account = aws_client("sts").get_caller_identity()["Account"]
+        cache_key = _stable_lookup_cache_key(config, account)
+        cached = cache.get(cache_key)
+
+    lookups: dict[str, tuple[tuple[str, ...], Callable[..., Any]]] = {
+        "network": ((), lambda: _resolve_network(config, ec2)),
+        "alb": ((), lambda: _resolve_shared_alb(config, elbv2)),
+        "namespace": (
+            ("network",),
+            lambda network: _resolve_existing_service_discovery_namespace(
+                config, sd, route53, network[0]
+            ),
+        ),
+    }
+    if cached is not None:
+        lookups["network"] = (
+            (),
+            lambda: (
+                cached["vpc_id"],
+                cached["vpc_cidr"],
+                list(cached["private_subnet_ids"]),
+                list(cached["public_subnet_ids"]),
+            ),
+        )
+        lookups["alb"] = (
+            (),
+            lambda: (
+                cached["shared_listener_arn"],
+                cached["shared_alb_security_group_id"],
+                cached["shared_alb_dns_name"],
+            ),
+        )
+        if cached["existing_service_discovery_namespace_id"]:
+            lookups["namespace"] = (
+                (),
+                lambda: cached["existing_service_discovery_namespace_id"],
+            )
+
+    results = _run_dependent_lookups(
+        {
+            **lookups,
+            "priorities": (
+                ("alb",),
+                lambda alb: _resolve_listener_priorities(
+                    config, env_name, elbv2, alb[0]
+                ),
+            ),
+            "snapshot": ((), lambda: _resolve_rds_snapshot(config, env_name, rds)),
+            "secrets": ((), lambda: _resolve_external_secrets(config, sm)),
+        }
     )
+    vpc_id, vpc_cidr, private_subnets, public_subnets = results["network"]
+    listener_arn, alb_sg, alb_dns_name = results["alb"]
+    default_priority, path_priorities = results["priorities"]
+    snapshot = results["snapshot"]
+    external_secrets = results["secrets"]
+    namespace_id = results["namespace"]
 
     resolved = ResolvedLookupData(
         vpc_id=vpc_id,
@@ -80,10 +181,93 @@ def resolve_lookup_data(config: ProjectConfig, env_name: str) -> ResolvedLookupD
         existing_service_discovery_namespace_id=namespace_id,
     )
 
+    if cached is not None:
+        console.print(
+            "[dim]Using cached VPC/ALB lookups (--refresh-lookups to re-resolve).[/dim]"
+        )
+        return resolved
+
     _validate_resolved_lookup_data(config, resolved, ec2, elbv2)
+    if cache is not None:
+        cache.put(
+            cache_key,
+            {
+                "vpc_id": resolved.vpc_id,
+                "vpc_cidr": resolved.vpc_cidr,
+                "private_subnet_ids": resolved.private_subnet_ids,
+                "public_subnet_ids": resolved.public_subnet_ids,
+                "shared_listener_arn": resolved.shared_listener_arn,
+                "shared_alb_security_group_id": resolved.shared_alb_security_group_id,
+                "shared_alb_dns_name": resolved.shared_alb_dns_name,
+                # An empty namespace may be created by a later deploy, so only
+                # a found namespace is worth caching.
+                "existing_service_discovery_namespace_id": (
+                    resolved.existing_service_discovery_namespace_id
+                ),
+            },
+        )
     return resolved
 
 
+def _stable_lookup_cache_key(config: ProjectConfig, account: str) -> str:
+    """Fingerprint the account, region and config fields the cached lookups use."""
+    inputs = {
+        "account": account,
+        "region": config.aws_region,
+        "vpc_id": config.vpc_id,
+        "vpc_name": config.vpc_name,
+        "private_subnet_ids": config.private_subnet_ids,
+        "public_subnet_ids": config.public_subnet_ids,
+        "alb_mode": config.alb.mode.value,
+        "shared_alb_name": config.alb.shared_alb_name,
+        "shared_listener_arn": config.alb.shared_listener_arn,
+        "shared_alb_security_group_id": config.alb.shared_alb_security_group_id,
+        "cloudfront_enabled": config.cloudfront.enabled,
+        "cloudfront_origin_https_only": config.cloudfront.origin_https_only,
+        "service_discovery": any(s.enable_service_discovery for s in config.services),
+    }
+    digest = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+    return f"{config.project_name}:{digest[:16]}"
+
+
+def _run_dependent_lookups(
+    lookups: dict[str, tuple[tuple[str, ...], Callable[..., Any]]],
+    *,
+    max_workers: int = _LOOKUP_WORKERS,
+) -> dict[str, Any]:
+    """Run named lookups on a thread pool as soon as their dependencies finish.
+
+    Each entry maps a name to ``(dependencies, func)``; ``func`` is called
+    with the results of its dependencies as positional arguments. The first
+    lookup to fail cancels everything not yet started and its exception is
+    re-raised.
+    """
+    results: dict[str, Any] = {}
+    waiting = dict(lookups)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running: dict[Future[Any], str] = {}
+        while waiting or running:
+            for name, (deps, func) in list(waiting.items()):
+                if all(dep in results for dep in deps):
+                    del waiting[name]
+                    args = [results[dep] for dep in deps]
+                    running[executor.submit(func, *args)] = name
+            if not running:
+                raise RuntimeError(
+                    f"Unresolvable lookup dependencies: {', '.join(sorted(waiting))}"
+                )
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except BaseException:
+                    for other in running:
+                        other.cancel()
+                    raise
+    return results
+
+
 def _validate_resolved_lookup_data(
     config: ProjectConfig,
     lookups: ResolvedLookupData,
@@ -230,10 +414,10 @@ def _validate_subnet_ids(
 
 
 def ensure_artifact_bucket(config: ProjectConfig) -> str:
-    sts = boto3.client("sts")
+    sts = aws_client("sts")
     account = sts.get_caller_identity()["Account"]
     bucket_name = f"darth-infra-artifacts-{account}-{config.aws_region}".lower()
-    s3 = boto3.client("s3", region_name=config.aws_region)
+    s3 = aws_client("s3", region_name=config.aws_region)
 
     try:
         s3.head_bucket(Bucket=bucket_name)
@@ -263,24 +447,18 @@ def package_template(
         )
 
     output_template = build_dir / "packaged-root.yaml"
-    cmd = [
-        "aws",
-        "cloudformation",
-        "package",
-        "--region",
-        config.aws_region,
-        "--template-file",
-        str(template_file),
-        "--s3-bucket",
-        bucket,
-        "--output-template-file",
-        str(output_template),
-    ]
-
-    console.print(f"[dim]$ {' '.join(cmd)}[/dim]")
-    result = subprocess.run(cmd, cwd=str(project_dir))
-    if result.returncode != 0:
-        raise RuntimeError("cloudformation package failed")
+    packaged = package_nested_templates(
+        template_file,
+        s3=aws_client("s3", region_name=config.aws_region),
+        bucket=bucket,
+        region=config.aws_region,
+        key_prefix=f"templates/{config.project_name}",
+    )
+    output_template.write_text(packaged.body)
+    console.print(
+        f"[dim]Packaged {len(packaged.uploads)} nested template(s) to s3://{bucket}: "
+        f"{len(packaged.uploaded)} uploaded, {len(packaged.reused)} unchanged.[/dim]"
+    )
 
     return output_template
 
@@ -293,15 +471,21 @@ def deploy_changeset(
     *,
     no_execute: bool,
     changeset_name: str | None,
+    lookup_cache: LookupCache | None = None,
+    deploy_ledger: DeployLedger | None = None,
+    fail_fast: FailFastPolicy | None = None,
 ) -> int:
-    cf = boto3.client("cloudformation", region_name=config.aws_region)
+    cf = aws_client("cloudformation", region_name=config.aws_region)
     stack_name = f"{config.project_name}-ecs-{env_name}"
 
     template_body = template_path.read_text()
     parameters = _build_parameters(config, env_name, lookups)
+    tags = _stack_tags(config, env_name)
+    fingerprint = DeployFingerprint.compute(template_body, parameters, tags)
 
     change_set_type = "UPDATE"
     existing_status: str | None = None
+    stack: dict[str, Any] | None = None
     try:
         stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
         existing_status = stack.get("StackStatus")
@@ -319,6 +503,25 @@ def deploy_changeset(
         )
         return 1
 
+    # The ledger only counts while the stack is exactly as our last deploy
+    # left it; an update from anywhere else changes LastUpdatedTime. A change
+    # set that is only prepared, or explicitly named, must always be created.
+    use_ledger = deploy_ledger is not None and not no_execute and not changeset_name
+    previous = deploy_ledger.get(stack_name) if use_ledger and stack else None
+    in_sync = previous is not None and stack is not None and previous.matches_stack(stack)
+    if (
+        in_sync
+        and previous.template_sha256 == fingerprint.template_sha256
+        and previous.parameters_sha256 == fingerprint.parameters_sha256
+    ):
+        console.print(
+            "[green]No infrastructure changes detected (template and parameters match the last deploy).[/green]"
+        )
+        return 0
+    use_previous_template = (
+        in_sync and previous.template_sha256 == fingerprint.template_sha256
+    )
+
     if change_set_type == "UPDATE":
         update_error = _validate_update_stack_named_resource_collisions(
             cf=cf,
@@ -335,25 +538,26 @@ def deploy_changeset(
 
     cs_name = changeset_name or f"darth-{env_name}-{int(time.time())}"
 
+    template_kwargs: dict[str, Any] = {"TemplateBody": template_body}
+    if use_previous_template:
+        console.print(
+            "[dim]Template unchanged since the last deploy; updating parameters only.[/dim]"
+        )
+        template_kwargs = {"UsePreviousTemplate": True}
+
     resp = cf.create_change_set(
         StackName=stack_name,
         ChangeSetName=cs_name,
         ChangeSetType=change_set_type,
         Description=f"darth-infra deploy {env_name}",
-        TemplateBody=template_body,
+        **template_kwargs,
         Capabilities=[
             "CAPABILITY_IAM",
             "CAPABILITY_NAMED_IAM",
             "CAPABILITY_AUTO_EXPAND",
         ],
         Parameters=parameters,
-        Tags=[
-            {"Key": "project", "Value": config.project_name},
-            {"Key": "environment", "Value": env_name},
-            {"Key": "managed-by", "Value": "darth-infra"},
-            {"Key": "deployment-type", "Value": "ecs"},
-            *[{"Key": k, "Value": v} for k, v in config.tags.items()],
-        ],
+        Tags=tags,
     )
     cs_arn = resp["Id"]
 
@@ -361,6 +565,8 @@ def deploy_changeset(
     if status == "FAILED":
         if "didn't contain changes" in reason.lower():
             console.print("[green]No infrastructure changes detected.[/green]")
+            if deploy_ledger is not None and stack is not None:
+                _record_deploy(cf, deploy_ledger, stack_name, fingerprint)
             return 0
         console.print(f"[red]Change set failed: {reason}[/red]")
         _print_changeset_failure_diagnostics(cf, cs_arn, stack_name)
@@ -371,6 +577,11 @@ def deploy_changeset(
             console.print(
                 "[yellow]Check IDs/ARNs for VPC, subnets, shared ALB listener/security group, and external secrets.[/yellow]"
             )
+            if lookup_cache is not None:
+                lookup_cache.invalidate()
+                console.print(
+                    "[dim]Cleared cached VPC/ALB lookups; the next deploy re-resolves them.[/dim]"
+                )
         _print_recent_stack_events(
             cf,
             stack_name,
@@ -402,26 +613,55 @@ def deploy_changeset(
         config=config,
         env_name=env_name,
         stack_name=stack_name,
-        poll_interval_seconds=15,
+        max_poll_interval_seconds=15,
+        fail_fast=fail_fast,
+        changed_logical_ids={
+            str(c.get("ResourceChange", {}).get("LogicalResourceId", ""))
+            for c in changes
+        }
+        - {""},
     )
     if success:
+        if deploy_ledger is not None:
+            _record_deploy(cf, deploy_ledger, stack_name, fingerprint)
         return 0
 
     _print_stack_failure_details(cf, stack_name)
     return 1
 
 
+def _stack_tags(config: ProjectConfig, env_name: str) -> list[dict[str, str]]:
+    return [
+        {"Key": "project", "Value": config.project_name},
+        {"Key": "environment", "Value": env_name},
+        {"Key": "managed-by", "Value": "darth-infra"},
+        {"Key": "deployment-type", "Value": "ecs"},
+        *[{"Key": k, "Value": v} for k, v in config.tags.items()],
+    ]
+
+
+def _record_deploy(
+    cf, deploy_ledger: DeployLedger, stack_name: str, fingerprint: DeployFingerprint
+) -> None:
+    try:
+        stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
+        deploy_ledger.record(stack_name, fingerprint, stack)
+    except (ClientError, OSError) as exc:
+        # Without a record the next deploy simply creates a change set.
+        console.print(f"[yellow]Could not record deploy fingerprint: {exc}[/yellow]")
+
+
 def _validate_create_stack_named_resource_collisions(
     config: ProjectConfig,
     env_name: str,
 ) -> None:
     collisions: list[str] = []
 
-    ecr = boto3.client("ecr", region_name=config.aws_region)
-    ecs = boto3.client("ecs", region_name=config.aws_region)
-    sm = boto3.client("secretsmanager", region_name=config.aws_region)
-    s3 = boto3.client("s3", region_name=config.aws_region)
-    rds = boto3.client("rds", region_name=config.aws_region)
+    ecr = aws_client("ecr", region_name=config.aws_region)
+    ecs = aws_client("ecs", region_name=config.aws_region)
+    sm = aws_client("secretsmanager", region_name=config.aws_region)
+    s3 = aws_client("s3", region_name=config.aws_region)
+    rds = aws_client("rds", region_name=config.aws_region)
 
     cluster_name = get_cluster_name(config.project_name, env_name)
     try:
@@ -509,11 +749,11 @@ def _validate_update_stack_named_resource_collisions(
     managed_logical_ids = _stack_logical_resource_ids(cf, stack_name)
     collisions: list[str] = []
 
-    ecr = boto3.client("ecr", region_name=config.aws_region)
-    ecs = boto3.client("ecs", region_name=config.aws_region)
-    sm = boto3.client("secretsmanager", region_name=config.aws_region)
-    s3 = boto3.client("s3", region_name=config.aws_region)
-    rds = boto3.client("rds", region_name=config.aws_region)
+    ecr = aws_client("ecr", region_name=config.aws_region)
+    ecs = aws_client("ecs", region_name=config.aws_region)
+    sm = aws_client("secretsmanager", region_name=config.aws_region)
+    s3 = aws_client("s3", region_name=config.aws_region)
+    rds = aws_client("rds", region_name=config.aws_region)
 
     if "EcsCluster" not in managed_logical_ids:
         cluster_name = get_cluster_name(config.project_name, env_name)
@@ -651,48 +891,48 @@ def _secret_logical_suffix(secret_name: str) -> str:
 
 
 def delete_stack(config: ProjectConfig, env_name: str) -> int:
-    cf = boto3.client("cloudformation", region_name=config.aws_region)
+    cf = aws_client("cloudformation", region_name=config.aws_region)
     stack_name = f"{config.project_name}-ecs-{env_name}"
     try:
         cf.delete_stack(StackName=stack_name)
-        waiter = cf.get_waiter("stack_delete_complete")
-        waiter.wait(StackName=stack_name)
-        return 0
     except ClientError as exc:
         console.print(f"[red]Delete failed: {exc}[/red]")
         return 1
 
+    poller = AdaptivePoller(min_interval=2, max_interval=30)
+    while True:
+        try:
+            stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
+        except ClientError as exc:
+            if is_throttling_error(exc):
+                poller.throttled()
+                poller.wait()
+                continue
+            message = str(exc.response.get("Error", {}).get("Message", ""))
+            if "does not exist" in message:
+                return 0
+            console.print(f"[red]Delete failed: {exc}[/red]")
+            return 1
 
-def cancel_stack_update(config: ProjectConfig, env_name: str) -> int:
-    cf = boto3.client("cloudformation", region_name=config.aws_region)
-    stack_name = f"{config.project_name}-ecs-{env_name}"
-
-    try:
-        stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
-    except ClientError as exc:
-        code = str(exc.response.get("Error", {}).get("Code", ""))
-        message = str(exc.response.get("Error", {}).get("Message", ""))
-        if code == "ValidationError" and "does not exist" in message:
-            console.print(f"[red]Stack '{stack_name}' does not exist.[/red]")
+        status = str(stack.get("StackStatus", "UNKNOWN"))
+        if poller.observe(status):
+            console.print(
+                f"[bold]Stack status:[/bold] [cyan]{status}[/cyan] [dim]({poller.describe()})[/dim]"
+            )
+        if status == "DELETE_COMPLETE":
+            return 0
+        if status == "DELETE_FAILED":
+            reason = str(stack.get("StackStatusReason", ""))
+            console.print(f"[red]Delete failed: {reason or status}[/red]")
             return 1
-        console.print(f"[red]Could not inspect stack '{stack_name}': {exc}[/red]")
-        return 1
+        poller.wait()
 
-    stack_status = str(stack.get("StackStatus", "UNKNOWN"))
-    cancellable_statuses = {
-        "UPDATE_IN_PROGRESS",
-        "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS",
-    }
-    if stack_status not in cancellable_statuses:
-        console.print(
-            f"[yellow]Stack '{stack_name}' is '{stack_status}', so there is no in-progress update to cancel.[/yellow]"
-        )
-        return 1
 
-    try:
-        cf.cancel_update_stack(StackName=stack_name)
-    except ClientError as exc:
-        console.print(f"[red]Cancel update failed: {exc}[/red]")
+def cancel_stack_update(config: ProjectConfig, env_name: str) -> int:
+    cf = aws_client("cloudformation", region_name=config.aws_region)
+    stack_name = f"{config.project_name}-ecs-{env_name}"
+
+    if not _request_stack_cancel(cf, stack_name):
         return 1
 
     console.print(
@@ -700,19 +940,24 @@ def cancel_stack_update(config: ProjectConfig, env_name: str) -> int:
     )
 
     terminal_success_statuses = {"UPDATE_ROLLBACK_COMPLETE"}
-    last_stack_status: str | None = None
+    poller = AdaptivePoller(min_interval=2, max_interval=15)
     while True:
-        current_status, current_reason = _get_stack_status(cf, stack_name)
-        if current_status != last_stack_status:
+        try:
+            current_status, current_reason = _get_stack_status(cf, stack_name)
+        except ClientError:
+            poller.throttled()
+            poller.wait()
+            continue
+        if poller.observe(current_status):
+            timing = f" [dim]({poller.describe()})[/dim]"
             if current_reason:
                 console.print(
-                    f"[bold]Stack status:[/bold] [cyan]{current_status}[/cyan] - {current_reason}"
+                    f"[bold]Stack status:[/bold] [cyan]{current_status}[/cyan] - {current_reason}{timing}"
                 )
             else:
                 console.print(
-                    f"[bold]Stack status:[/bold] [cyan]{current_status}[/cyan]"
+                    f"[bold]Stack status:[/bold] [cyan]{current_status}[/cyan]{timing}"
                 )
-            last_stack_status = current_status
 
         if _is_stack_terminal(current_status):
             if current_status in terminal_success_statuses:
@@ -726,17 +971,60 @@ def cancel_stack_update(config: ProjectConfig, env_name: str) -> int:
             )
             return 1
 
-        time.sleep(5)
+        poller.wait()
+
+
+def _request_stack_cancel(cf, stack_name: str) -> bool:
+    """Ask CloudFormation to cancel an in-progress update of *stack_name*."""
+    try:
+        stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", ""))
+        message = str(exc.response.get("Error", {}).get("Message", ""))
+        if code == "ValidationError" and "does not exist" in message:
+            console.print(f"[red]Stack '{stack_name}' does not exist.[/red]")
+            return False
+        console.print(f"[red]Could not inspect stack '{stack_name}': {exc}[/red]")
+        return False
+
+    stack_status = str(stack.get("StackStatus", "UNKNOWN"))
+    cancellable_statuses = {
+        "UPDATE_IN_PROGRESS",
+        "UPDATE_COMPLETE_CLEANUP_IN_PROGRESS",
+    }
+    if stack_status not in cancellable_statuses:
+        console.print(
+            f"[yellow]Stack '{stack_name}' is '{stack_status}', so there is no in-progress update to cancel.[/yellow]"
+        )
+        return False
+
+    try:
+        cf.cancel_update_stack(StackName=stack_name)
+    except ClientError as exc:
+        console.print(f"[red]Cancel update failed: {exc}[/red]")
+        return False
+    return True
 
 
 def _wait_for_changeset(cf, cs_arn: str) -> tuple[str, str, list[dict]]:
+    # Small change sets are usually ready within a few seconds, so start
+    # tight; large nested-stack change sets back off towards 5 s.
+    poller = AdaptivePoller(min_interval=0.5, max_interval=5)
     while True:
-        desc = cf.describe_change_set(ChangeSetName=cs_arn)
+        try:
+            desc = cf.describe_change_set(ChangeSetName=cs_arn)
+        except ClientError as exc:
+            if not is_throttling_error(exc):
+                raise
+            poller.throttled()
+            poller.wait()
+            continue
         status = desc.get("Status", "")
         reason = desc.get("StatusReason", "")
         if status in {"CREATE_COMPLETE", "FAILED"}:
             return status, reason, desc.get("Changes", [])
-        time.sleep(2)
+        poller.observe(status)
+        poller.wait()
 
 
 def _print_changeset_failure_diagnostics(cf, cs_arn: str, stack_name: str) -> None:
@@ -866,57 +1154,136 @@ def _monitor_stack_deploy(
     config: ProjectConfig,
     env_name: str,
     stack_name: str,
-    poll_interval_seconds: int,
+    max_poll_interval_seconds: float,
+    changed_logical_ids: set[str] | None = None,
+    fail_fast: FailFastPolicy | None = None,
 ) -> bool:
-    ecs = boto3.client("ecs", region_name=config.aws_region)
-    logs = boto3.client("logs", region_name=config.aws_region)
+    ecs = aws_client("ecs", region_name=config.aws_region)
+    logs = aws_client("logs", region_name=config.aws_region)
+    started_at = datetime.now(UTC)
     state = DeployMonitorState(
-        seen_stack_event_ids=set(),
-        seen_service_event_keys=set(),
-        seen_task_failure_keys=set(),
+        # Allow for clock skew so the first events of this deploy are kept.
+        stack_events=StackEventReader(
+            cf, stack_name, since=started_at - _STACK_EVENT_CLOCK_SKEW
+        ),
+        seen_service_event_keys=RecentKeys(),
+        stopped_tasks={},
         log_since_ms_by_service={},
         last_pending_signature="",
+        started_at=started_at,
     )
+    poller = AdaptivePoller(min_interval=3, max_interval=max_poll_interval_seconds)
+
+    # Each source only touches its own slice of ``state``, so the sources can
+    # run side by side. A source that misses the tick budget keeps running
+    # and its result is picked up on a later tick; until then the view shows
+    # its previous result.
+    sources: dict[str, Callable[[], Any]] = {
+        "status": lambda: _get_stack_status(cf, stack_name),
+        "events": lambda: _collect_new_stack_events(state),
+        "incomplete": lambda: _collect_incomplete_resources(
+            cf, stack_name, settled_stacks=state.settled_nested_stacks
+        ),
+        "ecs": lambda: _collect_ecs_deploy_observability(
+            config=config,
+            env_name=env_name,
+            ecs=ecs,
+            logs=logs,
+            state=state,
+        ),
+    }
+    latest: dict[str, Any] = {
+        "status": ("UNKNOWN", ""),
+        "events": [],
+        "incomplete": [],
+        "ecs": {"rows": [], "messages": []},
+    }
+    in_flight: dict[str, Future] = {}
+    progress: float | None = None
+    cancel_requested = False
 
-    last_stack_status: str | None = None
     final_status: str = "UNKNOWN"
     final_reason: str = ""
     success = False
 
-    with Live(console=console, refresh_per_second=4, transient=False) as live:
-        while True:
-            stack_status, stack_reason = _get_stack_status(cf, stack_name)
-            if stack_status != last_stack_status:
-                last_stack_status = stack_status
-
-            stack_events = _collect_new_stack_events(cf, stack_name, state)
-            incomplete = _collect_incomplete_resources(cf, stack_name)
-            ecs_snapshot = _collect_ecs_deploy_observability(
-                config=config,
-                env_name=env_name,
-                ecs=ecs,
-                logs=logs,
-                state=state,
-            )
-
-            live.update(
-                _render_deploy_live_view(
-                    stack_name=stack_name,
-                    stack_status=stack_status,
-                    stack_reason=stack_reason,
-                    stack_events=stack_events,
-                    incomplete_resources=incomplete,
-                    ecs_snapshot=ecs_snapshot,
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    try:
+        with Live(console=console, refresh_per_second=4, transient=False) as live:
+            while True:
+                for name, source in sources.items():
+                    if name not in in_flight:
+                        in_flight[name] = executor.submit(source)
+                wait(in_flight.values(), timeout=_MONITOR_TICK_BUDGET_SECONDS)
+
+                fresh: set[str] = set()
+                throttled = False
+                for name, future in list(in_flight.items()):
+                    if not future.done():
+                        continue
+                    del in_flight[name]
+                    try:
+                        latest[name] = future.result()
+                    except ClientError as exc:
+                        if not is_throttling_error(exc):
+                            raise
+                        throttled = True
+                        continue
+                    fresh.add(name)
+                if "events" not in fresh:
+                    latest["events"] = []
+                elif changed_logical_ids:
+                    done = changed_logical_ids & state.completed_logical_ids
+                    progress = len(done) / len(changed_logical_ids)
+
+                # stopped_tasks belongs to the ECS source; only read it
+                # between runs of that source.
+                if fail_fast and not cancel_requested and "ecs" in fresh:
+                    crash_loop = _detect_crash_loop(config, env_name, state, fail_fast)
+                    if crash_loop:
+                        console.print(f"[red]Fail-fast: {crash_loop}[/red]")
+                        if _request_stack_cancel(cf, stack_name):
+                            console.print(
+                                "[bold]Cancel requested; streaming the rollback...[/bold]"
+                            )
+                        cancel_requested = True
+
+                stack_status, stack_reason = latest["status"]
+                poller.observe(
+                    (
+                        stack_status,
+                        state.stack_events.events_read,
+                        tuple(
+                            (item["logical_id"], item["status"])
+                            for item in latest["incomplete"]
+                        ),
+                    ),
+                    progress=progress,
+                )
+                if throttled:
+                    poller.throttled()
+
+                live.update(
+                    _render_deploy_live_view(
+                        stack_name=stack_name,
+                        stack_status=stack_status,
+                        stack_reason=stack_reason,
+                        stack_events=latest["events"],
+                        incomplete_resources=latest["incomplete"],
+                        ecs_snapshot=latest["ecs"],
+                        timing=poller.describe(),
+                    )
                 )
-            )
 
-            if _is_stack_terminal(stack_status):
-                final_status = stack_status
-                final_reason = stack_reason
-                success = _is_stack_success(stack_status)
-                break
+                if "status" in fresh and _is_stack_terminal(stack_status):
+                    final_status = stack_status
+                    final_reason = stack_reason
+                    success = _is_stack_success(stack_status)
+                    break
 
-            time.sleep(poll_interval_seconds)
+                poller.wait()
+    finally:
+        # Do not hold up the result on a slow straggler from the last tick.
+        executor.shutdown(wait=False, cancel_futures=True)
 
     if success:
         console.print(
@@ -936,9 +1303,12 @@ def _monitor_stack_deploy(
 
 
 def _get_stack_status(cf, stack_name: str) -> tuple[str, str]:
+    """Return the stack status and reason; throttling errors are re-raised."""
     try:
         stack = cf.describe_stacks(StackName=stack_name)["Stacks"][0]
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         return "UNKNOWN", str(exc)
     return str(stack.get("StackStatus", "UNKNOWN")), str(
         stack.get("StackStatusReason", "")
@@ -964,34 +1334,27 @@ def _is_stack_success(status: str) -> bool:
 
 
 def _collect_new_stack_events(
-    cf,
-    stack_name: str,
     state: DeployMonitorState,
     *,
     max_events: int = 12,
 ) -> list[dict[str, str]]:
-    try:
-        events = cf.describe_stack_events(StackName=stack_name).get("StackEvents", [])
-    except ClientError as exc:
-        return [{"summary": f"Could not load stack events: {exc}", "style": "yellow"}]
-
-    new_events: list[dict[str, Any]] = []
-    for event in events:
-        event_id = str(event.get("EventId", "")).strip()
-        if not event_id or event_id in state.seen_stack_event_ids:
-            continue
-        state.seen_stack_event_ids.add(event_id)
-        new_events.append(event)
-
-    if not new_events:
-        return []
-
-    new_events.sort(key=lambda event: _event_datetime_sort_key(event.get("Timestamp")))
-    trimmed = new_events[-max_events:]
+    new_events = state.stack_events.read_new()
+    for event in new_events:
+        if "StackLabel" not in event:
+            _track_completed_resource(state, event)
 
     output: list[dict[str, str]] = []
-    for event in trimmed:
+    if state.stack_events.last_error:
+        output.append(
+            {
+                "summary": f"Could not load stack events: {state.stack_events.last_error}",
+                "style": "yellow",
+            }
+        )
+    for event in new_events[-max_events:]:
         logical_id = event.get("LogicalResourceId", "?")
+        if "StackLabel" in event:
+            logical_id = f"[{event['StackLabel']}] {logical_id}"
         resource_type = event.get("ResourceType", "?")
         status = event.get("ResourceStatus", "?")
         reason = event.get("ResourceStatusReason")
@@ -1012,6 +1375,20 @@ def _collect_new_stack_events(
     return output
 
 
+def _track_completed_resource(state: DeployMonitorState, event: dict[str, Any]) -> None:
+    """Remember resources that finished during this deploy (for progress)."""
+    status = str(event.get("ResourceStatus", ""))
+    if not status.endswith("_COMPLETE") or "ROLLBACK" in status:
+        return
+    timestamp = event.get("Timestamp")
+    if state.started_at and isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=UTC)
+        if timestamp < state.started_at:
+            return
+    state.completed_logical_ids.add(str(event.get("LogicalResourceId", "")))
+
+
 def _print_incomplete_resource_summary(
     cf,
     stack_name: str,
@@ -1053,7 +1430,19 @@ def _print_incomplete_resource_summary(
         console.print(f"[dim]... and {remaining} more resources[/dim]")
 
 
-def _collect_incomplete_resources(cf, stack_name: str) -> list[dict[str, str]]:
+def _collect_incomplete_resources(
+    cf,
+    stack_name: str,
+    *,
+    settled_stacks: dict[str, tuple[tuple[str, str], list[dict[str, str]]]]
+    | None = None,
+) -> list[dict[str, str]]:
+    """List resources not yet in a complete state, across nested stacks.
+
+    ``settled_stacks`` is a per-deploy cache of nested stacks whose parent
+    reports them finished, keyed by stack ID. A cached stack is not walked
+    again while its parent's status and timestamp for it stay the same.
+    """
     out: list[dict[str, str]] = []
     visited: set[str] = set()
     _collect_incomplete_resources_recursive(
@@ -1062,6 +1451,7 @@ def _collect_incomplete_resources(cf, stack_name: str) -> list[dict[str, str]]:
         stack_label=stack_name,
         visited=visited,
         out=out,
+        settled_stacks=settled_stacks,
     )
     out.sort(key=lambda item: (item["stack"], item["logical_id"]))
     return out
@@ -1074,9 +1464,11 @@ def _collect_incomplete_resources_recursive(
     stack_label: str,
     visited: set[str],
     out: list[dict[str, str]],
-) -> None:
+    settled_stacks: dict[str, tuple[tuple[str, str], list[dict[str, str]]]]
+    | None = None,
+) -> bool:
     if stack_name in visited:
-        return
+        return True
     visited.add(stack_name)
 
     try:
@@ -1085,7 +1477,7 @@ def _collect_incomplete_resources_recursive(
         for page in paginator.paginate(StackName=stack_name):
             summaries.extend(page.get("StackResourceSummaries", []))
     except ClientError:
-        return
+        return False
 
     for summary in summaries:
         status = str(summary.get("ResourceStatus", ""))
@@ -1106,13 +1498,32 @@ def _collect_incomplete_resources_recursive(
         nested_logical_id = str(summary.get("LogicalResourceId", "nested"))
         if not nested_stack_id or nested_stack_id == "None":
             continue
-        _collect_incomplete_resources_recursive(
+
+        # A nested stack that has not started updating yet still reports its
+        # previous *_COMPLETE status, so the timestamp is part of the key.
+        signature = (status, str(summary.get("LastUpdatedTimestamp", "")))
+        cached = (settled_stacks or {}).get(nested_stack_id)
+        if cached is not None and cached[0] == signature:
+            out.extend(cached[1])
+            continue
+
+        nested_out: list[dict[str, str]] = []
+        walked = _collect_incomplete_resources_recursive(
             cf=cf,
             stack_name=nested_stack_id,
             stack_label=nested_logical_id,
             visited=visited,
-            out=out,
+            out=nested_out,
+            settled_stacks=settled_stacks,
         )
+        out.extend(nested_out)
+        if settled_stacks is None:
+            continue
+        if walked and "IN_PROGRESS" not in status:
+            settled_stacks[nested_stack_id] = (signature, nested_out)
+        else:
+            settled_stacks.pop(nested_stack_id, None)
+    return True
 
 
 def _is_resource_incomplete(status: str) -> bool:
@@ -1163,6 +1574,13 @@ def _collect_ecs_deploy_observability(
             ],
         }
 
+    task_failures = _collect_recent_task_failures(
+        cluster,
+        {full: short for short, full in short_to_full_service_name.items()},
+        ecs,
+        state,
+    )
+
     rows: list[dict[str, str]] = []
     messages: list[dict[str, str]] = []
     for service_cfg in config.services:
@@ -1207,6 +1625,10 @@ def _collect_ecs_deploy_observability(
 
         deployments = service.get("deployments", [])
         for deployment in deployments:
+            if deployment.get("status") == "PRIMARY" and deployment.get("taskDefinition"):
+                state.primary_task_definitions[short_name] = str(
+                    deployment["taskDefinition"]
+                )
             rollout = deployment.get("rolloutState", "UNKNOWN")
             rollout_reason = deployment.get("rolloutStateReason", "")
             task_def = str(deployment.get("taskDefinition", "")).split("/")[-1]
@@ -1228,15 +1650,7 @@ def _collect_ecs_deploy_observability(
             )
 
         messages.extend(_collect_new_ecs_service_events(short_name, service, state))
-        messages.extend(
-            _collect_recent_task_failures(
-                cluster,
-                full_name,
-                short_name,
-                ecs,
-                state,
-            )
-        )
+        messages.extend(task_failures.get(short_name, []))
 
         is_deploying = pending > 0 or running < desired or deployment_count > 1
         if is_deploying:
@@ -1271,9 +1685,10 @@ def _collect_new_ecs_service_events(
         if not message:
             continue
         key = f"{service_name}|{created_at}|{message}"
-        if key in state.seen_service_event_keys:
+        if not isinstance(created_at, datetime):
+            continue
+        if not state.seen_service_event_keys.add(key, created_at):
             continue
-        state.seen_service_event_keys.add(key)
         new_events.append(event)
 
     if not new_events:
@@ -1297,67 +1712,180 @@ def _collect_new_ecs_service_events(
 
 def _collect_recent_task_failures(
     cluster: str,
-    full_service_name: str,
-    short_service_name: str,
+    short_names_by_service: dict[str, str],
     ecs,
     state: DeployMonitorState,
-) -> list[dict[str, str]]:
-    output: list[dict[str, str]] = []
-    try:
-        stopped_tasks = ecs.list_tasks(
-            cluster=cluster,
-            serviceName=full_service_name,
-            desiredStatus="STOPPED",
-            maxResults=5,
-        ).get("taskArns", [])
-    except ClientError:
-        return output
-
-    if not stopped_tasks:
-        return output
+) -> dict[str, list[dict[str, str]]]:
+    """Report newly stopped tasks of this deploy, grouped by short service name.
+
+    Stopped tasks are listed per service of this stack (``serviceName`` is
+    filtered server-side, so the cost follows this stack rather than the
+    cluster's history) and only tasks not described before are passed to
+    ``describe_tasks``, in batches of 100. Fully stopped tasks are cached in
+    ``state.stopped_tasks`` until their ``stoppedAt`` is older than
+    ``_STOPPED_TASK_RETENTION``, so each one is described and reported
+    exactly once.
+    """
+    failures: dict[str, list[dict[str, str]]] = {}
+    short_name_by_arn: dict[str, str] = {}
+    for full_name, short_name in short_names_by_service.items():
+        kwargs: dict[str, Any] = {
+            "cluster": cluster,
+            "serviceName": full_name,
+            "desiredStatus": "STOPPED",
+            "maxResults": _TASK_BATCH_SIZE,
+        }
+        try:
+            while True:
+                page = ecs.list_tasks(**kwargs)
+                for task_arn in page.get("taskArns", []):
+                    short_name_by_arn[task_arn] = short_name
+                if not page.get("nextToken"):
+                    break
+                kwargs["nextToken"] = page["nextToken"]
+        except ClientError:
+            # The service may not exist yet; the other services still report.
+            continue
 
-    try:
-        described = ecs.describe_tasks(cluster=cluster, tasks=stopped_tasks).get(
-            "tasks", []
-        )
-    except ClientError:
-        return output
+    retain_after = datetime.now(UTC) - _STOPPED_TASK_RETENTION
+    for task_arn, task in list(state.stopped_tasks.items()):
+        if _stopped_before(task, retain_after):
+            del state.stopped_tasks[task_arn]
 
-    for task in described:
-        task_arn = str(task.get("taskArn", ""))
-        if not task_arn:
+    to_describe = [arn for arn in short_name_by_arn if arn not in state.stopped_tasks]
+    for idx in range(0, len(to_describe), _TASK_BATCH_SIZE):
+        batch = to_describe[idx : idx + _TASK_BATCH_SIZE]
+        try:
+            described = ecs.describe_tasks(cluster=cluster, tasks=batch).get("tasks", [])
+        except ClientError:
             continue
-        task_id = task_arn.split("/")[-1]
-        stopped_reason = str(task.get("stoppedReason", "")).strip()
-        if stopped_reason:
-            key = f"{task_arn}|{stopped_reason}"
-            if key not in state.seen_task_failure_keys:
-                state.seen_task_failure_keys.add(key)
-                output.append(
-                    {
-                        "key": f"{short_service_name} task",
-                        "value": f"stopped ({task_id}): {stopped_reason}",
-                        "style": "red",
-                    }
-                )
-
-        containers = task.get("containers", [])
-        for container in containers:
-            name = str(container.get("name", ""))
-            reason = str(container.get("reason", "")).strip()
-            if not reason:
+        for task in described:
+            task_arn = str(task.get("taskArn", ""))
+            # Tasks that are still stopping have no exit codes yet; look
+            # at them again on the next tick. Tasks past the retention were
+            # evicted above and must not be reported a second time.
+            if not task_arn or task.get("lastStatus") != "STOPPED":
                 continue
-            key = f"{task_arn}|{name}|{reason}"
-            if key in state.seen_task_failure_keys:
+            if _stopped_before(task, retain_after):
                 continue
-            state.seen_task_failure_keys.add(key)
-            output.append(
-                {
-                    "key": f"{short_service_name} container",
-                    "value": f"issue ({task_id}/{name}): {reason}",
-                    "style": "red",
-                }
+            state.stopped_tasks[task_arn] = task
+            short_name = short_name_by_arn.get(task_arn)
+            if short_name is None or not _stopped_during_deploy(task, state):
+                continue
+            failures.setdefault(short_name, []).extend(
+                _task_failure_messages(short_name, task)
+            )
+    return failures
+
+
+def _stopped_before(task: dict[str, Any], cutoff: datetime) -> bool:
+    stopped_at = task.get("stoppedAt")
+    if not isinstance(stopped_at, datetime):
+        return False
+    if stopped_at.tzinfo is None:
+        stopped_at = stopped_at.replace(tzinfo=UTC)
+    return stopped_at < cutoff
+
+
+def _stopped_during_deploy(task: dict[str, Any], state: DeployMonitorState) -> bool:
+    stopped_at = task.get("stoppedAt")
+    if state.started_at is None or not isinstance(stopped_at, datetime):
+        return True
+    if stopped_at.tzinfo is None:
+        stopped_at = stopped_at.replace(tzinfo=UTC)
+    return stopped_at >= state.started_at - _STACK_EVENT_CLOCK_SKEW
+
+
+def _detect_crash_loop(
+    config: ProjectConfig,
+    env_name: str,
+    state: DeployMonitorState,
+    policy: FailFastPolicy,
+) -> str | None:
+    """Describe the first service that breaches *policy*, if any."""
+    window_start = datetime.now(UTC) - timedelta(minutes=policy.window_minutes)
+    short_names = {
+        f"service:{get_service_name(config.project_name, env_name, s.name)}": s.name
+        for s in config.services
+    }
+    failed: dict[str, int] = {}
+    for task in state.stopped_tasks.values():
+        short_name = short_names.get(str(task.get("group", "")))
+        stopped_at = task.get("stoppedAt")
+        if short_name is None or not isinstance(stopped_at, datetime):
+            continue
+        if stopped_at.tzinfo is None:
+            stopped_at = stopped_at.replace(tzinfo=UTC)
+        if stopped_at < window_start or not _stopped_during_deploy(task, state):
+            continue
+        if not _task_failed(task):
+            continue
+        if not _task_of_new_revision(short_name, task, state):
+            continue
+        failed[short_name] = failed.get(short_name, 0) + 1
+        if failed[short_name] >= policy.max_failed_tasks:
+            return (
+                f"{failed[short_name]} '{short_name}' tasks failed within "
+                f"{policy.window_minutes:g} minutes"
             )
+    return None
+
+
+def _task_of_new_revision(
+    short_name: str, task: dict[str, Any], state: DeployMonitorState
+) -> bool:
+    """Whether *task* was started by this deploy's PRIMARY deployment."""
+    primary = state.primary_task_definitions.get(short_name)
+    if primary is None or task.get("taskDefinitionArn") != primary:
+        return False
+    created_at = task.get("createdAt")
+    if state.started_at is None or not isinstance(created_at, datetime):
+        return True
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=UTC)
+    return created_at >= state.started_at - _STACK_EVENT_CLOCK_SKEW
+
+
+def _task_failed(task: dict[str, Any]) -> bool:
+    # Scale-in during a rolling update stops old tasks with SIGTERM/SIGKILL
+    # (exit 143/137); that is the deploy working, not the task crashing.
+    if task.get("stopCode") == "ServiceSchedulerInitiated":
+        return False
+    if task.get("stopCode") == "TaskFailedToStart":
+        return True
+    return any(
+        container.get("exitCode") not in (None, 0)
+        for container in task.get("containers", [])
+    )
+
+
+def _task_failure_messages(
+    short_service_name: str, task: dict[str, Any]
+) -> list[dict[str, str]]:
+    output: list[dict[str, str]] = []
+    task_id = str(task.get("taskArn", "")).split("/")[-1]
+    stopped_reason = str(task.get("stoppedReason", "")).strip()
+    if stopped_reason:
+        output.append(
+            {
+                "key": f"{short_service_name} task",
+                "value": f"stopped ({task_id}): {stopped_reason}",
+                "style": "red",
+            }
+        )
+
+    for container in task.get("containers", []):
+        name = str(container.get("name", ""))
+        reason = str(container.get("reason", "")).strip()
+        if not reason:
+            continue
+        output.append(
+            {
+                "key": f"{short_service_name} container",
+                "value": f"issue ({task_id}/{name}): {reason}",
+                "style": "red",
+            }
+        )
     return output
 
 
@@ -1436,12 +1964,14 @@ def _render_deploy_live_view(
     stack_events: list[dict[str, str]],
     incomplete_resources: list[dict[str, str]],
     ecs_snapshot: dict[str, Any],
+    timing: str = "",
 ) -> Group:
     stack_kv = _build_key_value_table(
         "Stack",
         [
             ("Name", stack_name, "cyan"),
             ("Status", stack_status, "cyan"),
+            ("Time", timing or "-", "dim"),
             (
                 "Reason",
                 stack_reason if stack_reason else "-",
@@ -1820,7 +2350,7 @@ def _resolve_stack_owned_listener_rule_priorities(
     elbv2,
 ) -> set[int]:
     stack_name = f"{config.project_name}-ecs-{env_name}"
-    cf = boto3.client("cloudformation", region_name=config.aws_region)
+    cf = aws_client("cloudformation", region_name=config.aws_region)
 
     rule_arns = _list_listener_rule_arns_for_stack(cf, stack_name)
 
@@ -1899,7 +2429,7 @@ def _list_stack_resource_summaries(cf, stack_name: str) -> list[dict[str, Any]]:
 
 def _stack_exists_for_env(config: ProjectConfig, env_name: str) -> bool:
     stack_name = f"{config.project_name}-ecs-{env_name}"
-    cf = boto3.client("cloudformation", region_name=config.aws_region)
+    cf = aws_client("cloudformation", region_name=config.aws_region)
     try:
         cf.describe_stacks(StackName=stack_name)
         return True
@@ -1911,11 +2441,10 @@ def _stack_exists_for_env(config: ProjectConfig, env_name: str) -> bool:
         raise
 
 
-def _resolve_rds_snapshot(config: ProjectConfig, env_name: str) -> str:
+def _resolve_rds_snapshot(config: ProjectConfig, env_name: str, rds) -> str:
     if not config.rds or env_name == "prod":
         return ""
 
-    rds = boto3.client("rds", region_name=config.aws_region)
     db_id = f"{config.project_name}-prod-db"
     try:
         snapshots = rds.describe_db_snapshots(
@@ -1931,9 +2460,9 @@ def _resolve_rds_snapshot(config: ProjectConfig, env_name: str) -> str:
     return latest["DBSnapshotIdentifier"]
 
 
-def _resolve_external_secrets(config: ProjectConfig) -> dict[str, str]:
+def _resolve_external_secrets(config: ProjectConfig, sm) -> dict[str, str]:
     out: dict[str, str] = {}
-    sm = boto3.client("secretsmanager", region_name=config.aws_region)
+    to_describe: dict[str, str] = {}
     for sec in config.secrets:
         if sec.source.value in {"generate", "rds"}:
             continue
@@ -1947,8 +2476,8 @@ def _resolve_external_secrets(config: ProjectConfig) -> dict[str, str]:
             if value.startswith("arn:"):
                 out[sec.name] = value
                 continue
-            info = sm.describe_secret(SecretId=value)
-            out[sec.name] = info["ARN"]
+            out[sec.name] = ""
+            to_describe[sec.name] = value
             continue
 
         if sec.source.value == "existing":
@@ -1960,11 +2489,22 @@ def _resolve_external_secrets(config: ProjectConfig) -> dict[str, str]:
             if value.startswith("arn:"):
                 out[sec.name] = value
                 continue
-            info = sm.describe_secret(SecretId=value)
-            out[sec.name] = info["ARN"]
+            out[sec.name] = ""
+            to_describe[sec.name] = value
             continue
 
         raise RuntimeError(f"Unsupported secret source '{sec.source.value}'")
+
+    if to_describe:
+        with ThreadPoolExecutor(
+            max_workers=min(_LOOKUP_WORKERS, len(to_describe))
+        ) as executor:
+            arns = executor.map(
+                lambda secret_id: sm.describe_secret(SecretId=secret_id)["ARN"],
+                to_describe.values(),
+            )
+            for name, arn in zip(to_describe, arns):
+                out[name] = arn
     return out
 
 
@@ -1987,10 +2527,15 @@ def _resolve_existing_service_discovery_namespace(
     except Exception:
         return ""
 
-    for ns in resp.get("Namespaces", []):
-        namespace_id = str(ns.get("Id", "")).strip()
-        if not namespace_id:
-            continue
+    namespace_ids = [
+        namespace_id
+        for namespace_id in (
+            str(ns.get("Id", "")).strip() for ns in resp.get("Namespaces", [])
+        )
+        if namespace_id
+    ]
+
+    def is_associated_with_vpc(namespace_id: str) -> bool:
         try:
             details = servicediscovery.get_namespace(Id=namespace_id)
             hosted_zone_id = (
@@ -2000,19 +2545,31 @@ def _resolve_existing_service_discovery_namespace(
                 .get("HostedZoneId")
             )
             if not hosted_zone_id:
-                continue
+                return False
 
             hosted_zone = route53.get_hosted_zone(Id=hosted_zone_id)
-            for associated_vpc in hosted_zone.get("VPCs", []):
-                if (
-                    associated_vpc.get("VPCId") == vpc_id
-                    and associated_vpc.get("VPCRegion") == config.aws_region
-                ):
-                    return namespace_id
+            return any(
+                associated_vpc.get("VPCId") == vpc_id
+                and associated_vpc.get("VPCRegion") == config.aws_region
+                for associated_vpc in hosted_zone.get("VPCs", [])
+            )
         except Exception:
-            continue
+            return False
 
-    return ""
+    if not namespace_ids:
+        return ""
+    with ThreadPoolExecutor(
+        max_workers=min(_LOOKUP_WORKERS, len(namespace_ids))
+    ) as executor:
+        matches = list(executor.map(is_associated_with_vpc, namespace_ids))
+    return next(
+        (
+            namespace_id
+            for namespace_id, matched in zip(namespace_ids, matches)
+            if matched
+        ),
+        "",
+    )
 
 
 def _build_parameters(
@@ -2105,7 +2662,7 @@ def run_seed_copy_tasks(config: ProjectConfig, env_name: str) -> int:
     if not seed_buckets:
         return 0
 
-    s3 = boto3.client("s3", region_name=config.aws_region)
+    s3 = aws_client("s3", region_name=config.aws_region)
     failures: list[str] = []
 
     for bucket in seed_buckets:
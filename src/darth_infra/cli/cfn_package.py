@@ -0,0 +1,133 @@
+"""Native replacement for ``aws cloudformation package`` on nested stacks."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+_UPLOAD_WORKERS = 8
+
+# ``TemplateURL: services/web.yaml`` on an ``AWS::CloudFormation::Stack``.
+# Intrinsics (``!Sub ...``) and values that are already URLs are left alone.
+_TEMPLATE_URL_LINE = re.compile(
+    r"^(?P<prefix>\s*TemplateURL:\s*)(?P<quote>['\"]?)(?P<value>[^'\"\s#!{][^'\"\s#]*)"
+    r"(?P=quote)(?P<suffix>\s*(?:#.*)?)$"
+)
+_REMOTE_PREFIXES = ("https://", "http://", "s3://")
+
+
+@dataclass
+class PackagedTemplate:
+    """Result of packaging a root template.
+
+    Attributes:
+        body: Root template with every local ``TemplateURL`` rewritten to S3.
+        uploads: ``(key, body)`` for each distinct nested template.
+        uploaded: Keys that had to be uploaded.
+        reused: Keys that were already present in the artifact bucket.
+    """
+
+    body: str
+    uploads: dict[str, str] = field(default_factory=dict)
+    uploaded: list[str] = field(default_factory=list)
+    reused: list[str] = field(default_factory=list)
+
+
+def package_nested_templates(
+    template_file: Path,
+    *,
+    s3: Any,
+    bucket: str,
+    region: str,
+    key_prefix: str,
+    jobs: int = _UPLOAD_WORKERS,
+) -> PackagedTemplate:
+    """Upload the nested stack templates of *template_file* and rewrite it.
+
+    Local ``TemplateURL`` paths are resolved relative to the template that
+    references them, packaged recursively, and stored under
+    ``<key_prefix>/<sha256>.yaml``. Keys already in *bucket* are not
+    uploaded again; the rest are uploaded concurrently.
+    """
+    uploads: dict[str, str] = {}
+    body = _rewrite_template(
+        template_file.resolve(),
+        uploads=uploads,
+        bucket=bucket,
+        region=region,
+        key_prefix=key_prefix,
+        active=(),
+    )
+    packaged = PackagedTemplate(body=body, uploads=uploads)
+    if not uploads:
+        return packaged
+
+    keys = sorted(uploads)
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(keys)))) as executor:
+        results = executor.map(
+            lambda key: _upload_if_missing(s3, bucket, key, uploads[key]), keys
+        )
+        for key, uploaded in zip(keys, results):
+            (packaged.uploaded if uploaded else packaged.reused).append(key)
+    return packaged
+
+
+def _rewrite_template(
+    path: Path,
+    *,
+    uploads: dict[str, str],
+    bucket: str,
+    region: str,
+    key_prefix: str,
+    active: tuple[Path, ...],
+) -> str:
+    if path in active:
+        chain = " -> ".join(str(item) for item in (*active, path))
+        raise RuntimeError(f"Nested stack templates reference each other: {chain}")
+    if not path.is_file():
+        raise FileNotFoundError(f"Missing nested stack template: {path}")
+
+    lines = path.read_text().splitlines(keepends=True)
+    for index, line in enumerate(lines):
+        content = line.rstrip("\r\n")
+        match = _TEMPLATE_URL_LINE.match(content)
+        if not match or match.group("value").startswith(_REMOTE_PREFIXES):
+            continue
+        nested_body = _rewrite_template(
+            (path.parent / match.group("value")).resolve(),
+            uploads=uploads,
+            bucket=bucket,
+            region=region,
+            key_prefix=key_prefix,
+            active=(*active, path),
+        )
+        digest = hashlib.sha256(nested_body.encode()).hexdigest()
+        key = f"{key_prefix}/{digest}.yaml"
+        uploads[key] = nested_body
+        url = f"https://{bucket}.s3.{region}.amazonaws.com/{key}"
+        newline = line[len(content) :]
+        lines[index] = f"{match.group('prefix')}{url}{match.group('suffix')}{newline}"
+    return "".join(lines)
+
+
+def _upload_if_missing(s3: Any, bucket: str, key: str, body: str) -> bool:
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+        return False
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", ""))
+        if code not in {"404", "NoSuchKey", "NotFound"}:
+            raise
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body.encode("utf-8"),
+        ContentType="application/x-yaml",
+    )
+    return True
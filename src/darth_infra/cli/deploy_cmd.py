@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import copy
 
-import boto3
 import click
 from botocore.exceptions import ClientError
 
+from ..aws_clients import aws_client
 from .cfn import (
+    FailFastPolicy,
     cancel_stack_update,
     deploy_changeset,
     ensure_artifact_bucket,
@@ -16,6 +17,7 @@ from .cfn import (
     resolve_lookup_data,
     run_seed_copy_tasks,
 )
+from .deploy_ledger import DeployLedger
 from .helpers import (
     console,
     get_cluster_name,
@@ -24,6 +26,7 @@ from .helpers import (
     require_prod_deployed,
 )
 from .image_ops import build_images, push_images, select_internal_services
+from .lookup_cache import DEFAULT_LOOKUP_CACHE_TTL_SECONDS, LookupCache
 from ..scaffold.generator import generate_project
 
 
@@ -51,6 +54,59 @@ from ..scaffold.generator import generate_project
     default=False,
     help="Build and push service images before deploying infrastructure.",
 )
+@click.option(
+    "--registry-cache",
+    is_flag=True,
+    default=False,
+    help="With --with-images, use a BuildKit registry cache in this environment's ECR repositories.",
+)
+@click.option(
+    "--direct-push",
+    is_flag=True,
+    default=False,
+    help="With --with-images, push images from BuildKit straight to ECR without loading them into the local docker daemon.",
+)
+@click.option(
+    "--refresh-lookups",
+    is_flag=True,
+    default=False,
+    help="Re-resolve VPC, subnet, shared ALB and Cloud Map lookups instead of using .darth-infra/cache/.",
+)
+@click.option(
+    "--lookup-cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_LOOKUP_CACHE_TTL_SECONDS,
+    show_default=True,
+    metavar="SECONDS",
+    help="How long cached VPC/ALB lookups stay valid. 0 disables the cache.",
+)
+@click.option(
+    "--force-changeset",
+    is_flag=True,
+    default=False,
+    help="Create a change set even when the template and parameters match the last successful deploy.",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Cancel the stack update automatically when a service's tasks keep crashing.",
+)
+@click.option(
+    "--fail-fast-tasks",
+    type=click.IntRange(min=1),
+    default=FailFastPolicy.max_failed_tasks,
+    show_default=True,
+    help="With --fail-fast, failed tasks of one service that trigger the cancel.",
+)
+@click.option(
+    "--fail-fast-window",
+    type=click.FloatRange(min=0, min_open=True),
+    default=FailFastPolicy.window_minutes,
+    show_default=True,
+    metavar="MINUTES",
+    help="With --fail-fast, window in which --fail-fast-tasks failures are counted.",
+)
 @click.option(
     "--cancel",
     "cancel_update",
@@ -63,6 +119,14 @@ def deploy(
     no_execute: bool,
     changeset_name: str | None,
     with_images: bool,
+    registry_cache: bool,
+    direct_push: bool,
+    refresh_lookups: bool,
+    lookup_cache_ttl: int,
+    force_changeset: bool,
+    fail_fast: bool,
+    fail_fast_tasks: int,
+    fail_fast_window: float,
     cancel_update: bool,
 ) -> None:
     """Deploy the CloudFormation stack for a given environment."""
@@ -100,21 +164,51 @@ def deploy(
         console.print("[red]--with-images cannot be combined with --no-execute.[/red]")
         raise SystemExit(1)
 
+    if registry_cache and not with_images:
+        console.print("[red]--registry-cache requires --with-images.[/red]")
+        raise SystemExit(1)
+
+    if direct_push and not with_images:
+        console.print("[red]--direct-push requires --with-images.[/red]")
+        raise SystemExit(1)
+
+    if fail_fast and no_execute:
+        console.print("[red]--fail-fast cannot be combined with --no-execute.[/red]")
+        raise SystemExit(1)
+
     console.print(
         f"[bold]Deploying [cyan]{config.project_name}[/cyan] "
         f"environment [cyan]{env_name}[/cyan]...[/bold]"
     )
 
+    lookup_cache = LookupCache(
+        project_dir, ttl_seconds=lookup_cache_ttl, refresh=refresh_lookups
+    )
+    deploy_ledger = DeployLedger(project_dir, refresh=force_changeset)
+    fail_fast_policy = (
+        FailFastPolicy(max_failed_tasks=fail_fast_tasks, window_minutes=fail_fast_window)
+        if fail_fast
+        else None
+    )
+
     try:
         if with_images:
-            _prepare_images_for_deploy(config, project_dir, env_name)
+            _prepare_images_for_deploy(
+                config,
+                project_dir,
+                env_name,
+                registry_cache=registry_cache,
+                direct_push=direct_push,
+                lookup_cache=lookup_cache,
+                deploy_ledger=deploy_ledger,
+            )
 
         console.print(
             "[dim]Refreshing CloudFormation templates from darth-infra.toml...[/dim]"
         )
         generate_project(config, project_dir)
 
-        lookups = resolve_lookup_data(config, env_name)
+        lookups = resolve_lookup_data(config, env_name, cache=lookup_cache)
         bucket = ensure_artifact_bucket(config)
         packaged_template = package_template(project_dir, config, env_name, bucket)
         rc = deploy_changeset(
@@ -124,6 +218,9 @@ def deploy(
             lookups,
             no_execute=no_execute,
             changeset_name=changeset_name,
+            lookup_cache=lookup_cache,
+            deploy_ledger=deploy_ledger,
+            fail_fast=fail_fast_policy,
         )
     except Exception as exc:
         console.print(f"[red]Deploy setup failed: {exc}[/red]")
@@ -149,7 +246,16 @@ def deploy(
         raise SystemExit(rc)
 
 
-def _prepare_images_for_deploy(config, project_dir, env_name: str) -> None:
+def _prepare_images_for_deploy(
+    config,
+    project_dir,
+    env_name: str,
+    *,
+    registry_cache: bool = False,
+    direct_push: bool = False,
+    lookup_cache: LookupCache | None = None,
+    deploy_ledger: DeployLedger | None = None,
+) -> None:
     internal_services = select_internal_services(config, None)
     if not internal_services:
         console.print(
@@ -167,7 +273,7 @@ def _prepare_images_for_deploy(config, project_dir, env_name: str) -> None:
                 service.desired_count = 0
 
         generate_project(bootstrap_config, project_dir)
-        lookups = resolve_lookup_data(config, env_name)
+        lookups = resolve_lookup_data(config, env_name, cache=lookup_cache)
         bucket = ensure_artifact_bucket(config)
         packaged_template = package_template(project_dir, config, env_name, bucket)
         bootstrap_rc = deploy_changeset(
@@ -177,19 +283,37 @@ def _prepare_images_for_deploy(config, project_dir, env_name: str) -> None:
             lookups,
             no_execute=False,
             changeset_name=None,
+            lookup_cache=lookup_cache,
+            deploy_ledger=deploy_ledger,
         )
         if bootstrap_rc != 0:
             raise RuntimeError("bootstrap deploy failed")
 
+    if direct_push:
+        console.print("[bold]Building and pushing Docker images to ECR...[/bold]")
+        build_images(
+            config,
+            project_dir,
+            None,
+            registry_cache_env=env_name if registry_cache else None,
+            push_env=env_name,
+        )
+        return
+
     console.print("[bold]Building Docker images for deploy...[/bold]")
-    build_images(config, project_dir, None)
+    build_images(
+        config,
+        project_dir,
+        None,
+        registry_cache_env=env_name if registry_cache else None,
+    )
     console.print("[bold]Pushing Docker images to ECR...[/bold]")
     push_images(config, env_name, None)
 
 
 def _stack_exists(project_name: str, region: str, env_name: str) -> bool:
     stack_name = f"{project_name}-ecs-{env_name}"
-    cf = boto3.client("cloudformation", region_name=region)
+    cf = aws_client("cloudformation", region_name=region)
     try:
         cf.describe_stacks(StackName=stack_name)
         return True
@@ -206,7 +330,7 @@ def _force_new_deployments_for_internal_services(config, env_name: str) -> None:
     if not services:
         return
 
-    ecs = boto3.client("ecs", region_name=config.aws_region)
+    ecs = aws_client("ecs", region_name=config.aws_region)
     cluster_name = get_cluster_name(config.project_name, env_name)
     restarted: list[str] = []
 
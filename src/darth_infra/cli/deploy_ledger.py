@@ -0,0 +1,125 @@
+"""Local record of the last template/parameters deployed to each stack."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .build_manifest import STATE_DIR
+
+DEPLOY_DIR = STATE_DIR / "deploy"
+LEDGER_FILENAME = "ledger.json"
+
+# Only stacks resting in one of these states can be compared to the ledger;
+# anything else means the last deploy did not finish the way it was recorded.
+_SETTLED_STACK_STATUSES = frozenset({"CREATE_COMPLETE", "UPDATE_COMPLETE"})
+
+
+@dataclass(frozen=True)
+class DeployFingerprint:
+    """Digests of what a change set would send to CloudFormation.
+
+    Attributes:
+        template_sha256: Digest of the packaged root template body. Nested
+            templates are covered through their content-hash S3 keys.
+        parameters_sha256: Digest of the stack parameters and tags.
+    """
+
+    template_sha256: str
+    parameters_sha256: str
+
+    @classmethod
+    def compute(
+        cls,
+        template_body: str,
+        parameters: list[dict[str, str]],
+        tags: list[dict[str, str]],
+    ) -> DeployFingerprint:
+        payload = json.dumps(
+            {"parameters": parameters, "tags": tags}, sort_keys=True
+        ).encode()
+        return cls(
+            template_sha256=hashlib.sha256(template_body.encode()).hexdigest(),
+            parameters_sha256=hashlib.sha256(payload).hexdigest(),
+        )
+
+
+@dataclass(frozen=True)
+class DeployLedgerEntry:
+    """Fingerprint of the last successful deploy plus the stack it produced.
+
+    Attributes:
+        template_sha256: See ``DeployFingerprint``.
+        parameters_sha256: See ``DeployFingerprint``.
+        stack_id: CloudFormation stack ID, so a recreated stack never matches.
+        stack_updated_at: ``LastUpdatedTime`` (or ``CreationTime``) reported
+            right after the deploy; any later update elsewhere changes it.
+    """
+
+    template_sha256: str
+    parameters_sha256: str
+    stack_id: str
+    stack_updated_at: str
+
+    def matches_stack(self, stack: dict[str, Any]) -> bool:
+        return (
+            stack.get("StackStatus") in _SETTLED_STACK_STATUSES
+            and stack.get("StackId") == self.stack_id
+            and _stack_updated_at(stack) == self.stack_updated_at
+        )
+
+
+class DeployLedger:
+    """Per-project deploy ledger stored at ``.darth-infra/deploy/ledger.json``.
+
+    Entries are keyed by stack name. With ``refresh`` every read misses so a
+    change set is always created, but successful deploys are still recorded.
+    """
+
+    def __init__(self, project_dir: Path, *, refresh: bool = False) -> None:
+        self.path = project_dir / DEPLOY_DIR / LEDGER_FILENAME
+        self.refresh = refresh
+
+    def get(self, stack_name: str) -> DeployLedgerEntry | None:
+        if self.refresh:
+            return None
+        raw = self._read().get(stack_name)
+        if not isinstance(raw, dict):
+            return None
+        try:
+            return DeployLedgerEntry(**raw)
+        except TypeError:
+            return None
+
+    def record(
+        self,
+        stack_name: str,
+        fingerprint: DeployFingerprint,
+        stack: dict[str, Any],
+    ) -> None:
+        entries = self._read()
+        entries[stack_name] = asdict(
+            DeployLedgerEntry(
+                template_sha256=fingerprint.template_sha256,
+                parameters_sha256=fingerprint.parameters_sha256,
+                stack_id=str(stack.get("StackId", "")),
+                stack_updated_at=_stack_updated_at(stack),
+            )
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(entries, indent=2, sort_keys=True) + "\n")
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def _stack_updated_at(stack: dict[str, Any]) -> str:
+    value = stack.get("LastUpdatedTime") or stack.get("CreationTime") or ""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
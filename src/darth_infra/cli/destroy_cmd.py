@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import boto3
 import click
 
+from ..aws_clients import aws_client
 from .cfn import delete_stack
 from .helpers import console, require_config
 
@@ -18,7 +18,7 @@ def destroy(env_name: str, force: bool) -> None:
 
     if env_name == "prod":
         # Verify no non-prod envs still exist
-        cf = boto3.client("cloudformation", region_name=config.aws_region)
+        cf = aws_client("cloudformation", region_name=config.aws_region)
         for other_env in config.environments:
             if other_env == "prod":
                 continue
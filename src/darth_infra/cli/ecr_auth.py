@@ -0,0 +1,113 @@
+"""ECR registry credentials backed by an on-disk token cache."""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..aws_clients import aws_client
+
+# Refresh tokens a little before ECR expires them so a long push never starts
+# with credentials that lapse halfway through.
+_EXPIRY_MARGIN = timedelta(minutes=10)
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class EcrCredentials:
+    """Docker registry credentials issued by ``ecr.get_authorization_token``."""
+
+    username: str
+    password: str
+    expires_at: datetime
+
+    def is_fresh(self, now: datetime | None = None) -> bool:
+        return (now or datetime.now(UTC)) + _EXPIRY_MARGIN < self.expires_at
+
+
+def default_token_cache_path() -> Path:
+    """Per-user cache file; tokens are per account/region, not per project."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "darth-infra" / "ecr-auth.json"
+
+
+def ecr_credentials(
+    account: str,
+    region: str,
+    *,
+    cache_path: Path | None = None,
+    ecr: Any = None,
+) -> EcrCredentials:
+    """Return registry credentials for *account* in *region*.
+
+    A cached token is reused until shortly before it expires (ECR tokens are
+    valid for 12 hours); otherwise a new one is requested and written back to
+    the cache, keyed by account and region.
+    """
+    path = cache_path or default_token_cache_path()
+    key = f"{account}/{region}"
+    with _cache_lock:
+        cache = _read_cache(path)
+        cached = _credentials_from_cache(cache.get(key))
+        if cached and cached.is_fresh():
+            return cached
+
+        client = ecr or aws_client("ecr", region_name=region)
+        data = client.get_authorization_token()["authorizationData"][0]
+        username, _, password = (
+            base64.b64decode(data["authorizationToken"]).decode().partition(":")
+        )
+        expires_at = data["expiresAt"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)
+        credentials = EcrCredentials(
+            username=username, password=password, expires_at=expires_at
+        )
+
+        cache[key] = {
+            "username": credentials.username,
+            "password": credentials.password,
+            "expires_at": credentials.expires_at.isoformat(),
+        }
+        _write_cache(path, cache)
+        return credentials
+
+
+def _credentials_from_cache(raw: Any) -> EcrCredentials | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        return EcrCredentials(
+            username=str(raw["username"]),
+            password=str(raw["password"]),
+            expires_at=datetime.fromisoformat(raw["expires_at"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _read_cache(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache(path: Path, cache: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as handle:
+            json.dump(cache, handle)
+        os.replace(tmp_path, path)
+    except OSError:
+        # The cache is an optimisation; a read-only home must not break pushes.
+        pass
@@ -5,9 +5,9 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from pathlib import Path
 
-import boto3
 import click
 
+from ..aws_clients import aws_client
 from .helpers import console, require_config
 from .secret_cmd import _extract_secret_value, _resolve_secret_id
 
@@ -29,7 +29,7 @@ def env_cmd(env_name: str, env_file: str) -> None:
         console.print("[yellow]No secrets defined in config.[/yellow]")
         return
 
-    sm = boto3.client("secretsmanager", region_name=config.aws_region)
+    sm = aws_client("secretsmanager", region_name=config.aws_region)
 
     entries: list[str] = []
     for secret_cfg in config.secrets:
@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import subprocess
 
-import boto3
 import click
 
+from ..aws_clients import aws_client
 from .helpers import console, get_cluster_name, get_service_name, require_config
 
 
@@ -38,7 +38,7 @@ def exec_cmd(service: str, env_name: str, shell_cmd: str) -> None:
         f"[bold]Finding running task for [cyan]{service_name}[/cyan]...[/bold]"
     )
 
-    ecs = boto3.client("ecs", region_name=config.aws_region)
+    ecs = aws_client("ecs", region_name=config.aws_region)
 
     # Find a running task
     tasks = ecs.list_tasks(
@@ -5,9 +5,9 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-import boto3
 from rich.console import Console
 
+from ..aws_clients import aws_client
 from ..config.loader import find_config, load_config
 from ..config.models import ProjectConfig
 
@@ -32,7 +32,7 @@ def require_prod_deployed(config: ProjectConfig, env: str) -> None:
 
     stack_name = f"{config.project_name}-ecs-prod"
     try:
-        cf = boto3.client("cloudformation", region_name=config.aws_region)
+        cf = aws_client("cloudformation", region_name=config.aws_region)
         cf.describe_stacks(StackName=stack_name)
     except Exception:
         console.print(
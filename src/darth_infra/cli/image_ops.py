@@ -2,19 +2,58 @@
 
 from __future__ import annotations
 
+import base64
+import codecs
+import json
+import os
+import re
 import subprocess
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
-import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 from rich.console import Group
 from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 
-from ..config.models import ProjectConfig, ServiceConfig
+from ..aws_clients import aws_client
+from ..config.models import Architecture, LaunchType, ProjectConfig, ServiceConfig
+from .build_context import DockerIgnore, analyze_context, walk_context
+from .build_manifest import (
+    BUILD_DIR,
+    BuildHistory,
+    BuildManifest,
+    ImageManifestEntry,
+    ImageSizeRecord,
+)
+from .ecr_auth import EcrCredentials, ecr_credentials
 from .helpers import console
 
+_BUILD_MEMORY_PER_JOB_BYTES = 2 * 1024**3
+BAKE_FILENAME = "docker-bake.json"
+BAKE_METADATA_FILENAME = "docker-bake.metadata.json"
+BUILD_CACHE_TAG = "buildcache"
+DEFAULT_PUSH_JOBS = 4
+MULTI_ARCH_PLATFORMS = ("linux/amd64", "linux/arm64")
+IMAGE_COMPRESSIONS = ("gzip", "zstd")
+DEFAULT_MAX_GROWTH_PERCENT = 20.0
+_REPORTED_LAYERS = 3
+
+# Registries this process has already run ``docker login`` for, mapped to the
+# token used, so build and push flows in one command log in only once.
+_docker_logins: dict[str, str] = {}
+_docker_login_lock = threading.Lock()
+
 
 def select_services(
     config: ProjectConfig,
@@ -46,416 +85,1794 @@ def build_images(
     config: ProjectConfig,
     project_dir: Path,
     service_name: str | None,
+    *,
+    jobs: int | None = None,
+    keep_going: bool = False,
+    force: bool = False,
+    bake: bool = False,
+    registry_cache_env: str | None = None,
+    push_env: str | None = None,
+    multi_arch: bool = False,
+    compression: str | None = None,
+    compression_level: int | None = None,
+    size_budget_mb: int | None = None,
+    max_growth_percent: float = DEFAULT_MAX_GROWTH_PERCENT,
 ) -> None:
-    """Build local Docker images for internal services."""
+    """Build Docker images for internal services on a bounded worker pool.
+
+    Option semantics are documented on the ``darth-infra build`` command.
+    """
+    if multi_arch and not push_env:
+        console.print(
+            "[red]Multi-arch images cannot be loaded into the local docker "
+            "daemon; push them directly to an environment instead.[/red]"
+        )
+        raise SystemExit(1)
+    if (compression or compression_level is not None) and not push_env:
+        console.print(
+            "[red]Layer compression only survives a direct registry push; "
+            "docker push from the local daemon re-compresses with gzip.[/red]"
+        )
+        raise SystemExit(1)
+
     ensure_docker_buildx()
     services = select_services(config, service_name)
+    manifest = BuildManifest(project_dir)
+
+    cache_refs: dict[str, str] = {}
+    push_target: _RegistryPushTarget | None = None
+    registry = ""
+    if registry_cache_env or push_env:
+        registry = resolve_ecr_registry(config)
+        login_result = ecr_docker_login(config, registry)
+        if login_result.returncode != 0:
+            console.print("[red]ECR login failed[/red]")
+            message = _tail_stderr(login_result.stderr)
+            if message:
+                console.print(f"[red]{message}[/red]")
+            raise SystemExit(login_result.returncode)
+    if push_env:
+        push_target = _RegistryPushTarget(
+            ecr=aws_client("ecr", region_name=config.aws_region),
+            registry=registry,
+            env_name=push_env,
+            immutable_tag=build_immutable_tag(),
+            multi_arch=multi_arch,
+            compression=compression,
+            compression_level=compression_level,
+        )
+    if registry_cache_env:
+        cache_refs = {
+            service.name: registry_cache_ref(
+                registry, config.project_name, registry_cache_env, service.name
+            )
+            for service in services
+            if not service.image
+        }
 
     status_by_service: dict[str, str] = {service.name: "queued" for service in services}
+    internal_services: list[ServiceConfig] = []
+    for service in services:
+        if service.image:
+            status_by_service[service.name] = "skipped (external image)"
+            continue
+        internal_services.append(service)
+
+    leaders: list[ServiceConfig] = []
+    followers_by_leader: dict[str, list[ServiceConfig]] = {}
+    for group in group_by_build_identity(internal_services):
+        leader, followers = group[0], group[1:]
+        leaders.append(leader)
+        followers_by_leader[leader.name] = followers
+        for follower in followers:
+            status_by_service[follower.name] = f"queued (same image as {leader.name})"
+
+    max_workers = jobs or default_build_jobs(len(leaders))
+    failures: list[tuple[str, int, str]] = []
+    bake_queue: list[tuple[ServiceConfig, str]] = []
+    previous_sizes: dict[str, int | None] = {}
+    built_services: list[ServiceConfig] = []
     last_update = "Starting build flow"
-    failed_code: int | None = None
-    failed_message = ""
+    last_update_style = "white"
+    stop_scheduling = threading.Event()
+
+    def run_build(service: ServiceConfig) -> _BuildOutcome:
+        if stop_scheduling.is_set():
+            return _BuildOutcome(cancelled=True)
+        if push_target:
+            previous_sizes[service.name] = _ecr_image_size(
+                push_target.ecr, push_target.repo(config, service), "latest"
+            )
+        outcome = _plan_service_build(
+            config,
+            project_dir,
+            service,
+            manifest=manifest,
+            force=force,
+            push_target=push_target,
+            followers=followers_by_leader[service.name],
+            status_by_service=status_by_service,
+        )
+        if outcome.pending and not bake:
+            outcome = _build_service_image(
+                config,
+                project_dir,
+                service,
+                manifest=manifest,
+                build_hash=outcome.build_hash,
+                cache_ref=cache_refs.get(service.name),
+                push_target=push_target,
+                followers=followers_by_leader[service.name],
+                status_by_service=status_by_service,
+            )
+        if outcome.returncode != 0 and not keep_going:
+            stop_scheduling.set()
+        return outcome
+
+    def mirror_followers(service: ServiceConfig) -> None:
+        for follower in followers_by_leader.get(service.name, []):
+            state = status_by_service[service.name].split(" (", 1)[0]
+            status_by_service[follower.name] = f"{state} (same image as {service.name})"
+
+    def render() -> Group:
+        active = [
+            name
+            for name, state in status_by_service.items()
+            if state in {"building", "building (bake)", "hashing context"}
+        ]
+        summary_rows = [
+            ("Phase", "Building internal service images", "cyan"),
+            ("Mode", "buildx bake" if bake else "buildx build", "white"),
+            (
+                "Output",
+                f"push to {registry} ({push_target.immutable_tag} + latest"
+                f"{', multi-arch' if push_target.multi_arch else ''})"
+                if push_target
+                else "local docker daemon",
+                "white",
+            ),
+            (
+                "Registry cache",
+                registry_cache_env if registry_cache_env else "off",
+                "white",
+            ),
+            ("Parallel jobs", str(max_workers), "white"),
+            ("Active builds", ", ".join(active) if active else "-", "cyan"),
+            ("Last update", last_update, last_update_style),
+        ]
+        if failures:
+            _, _, message = failures[-1]
+            summary_rows.append(
+                ("Error", message if message else "No error details captured", "red")
+            )
+        return _render_docker_live_view(
+            title="Docker Build",
+            summary_rows=summary_rows,
+            service_status=status_by_service,
+        )
 
     with Live(console=console, refresh_per_second=8, transient=False) as live:
-        for service in services:
-            if service.image:
-                status_by_service[service.name] = "skipped (external image)"
-                last_update = f"Skipped {service.name}: uses external image"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Build",
-                        summary_rows=[
-                            ("Phase", "Building internal service images", "cyan"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "dim"),
-                        ],
-                        service_status=status_by_service,
+        live.update(render())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(run_build, service): service for service in leaders
+            }
+            while pending:
+                done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    service = pending.pop(future)
+                    outcome = future.result()
+                    if outcome.cancelled:
+                        status_by_service[service.name] = (
+                            "cancelled (earlier build failed)"
+                        )
+                        mirror_followers(service)
+                        continue
+
+                    if outcome.returncode != 0:
+                        status_by_service[service.name] = (
+                            f"failed (exit {outcome.returncode})"
+                        )
+                        failures.append(
+                            (
+                                service.name,
+                                outcome.returncode,
+                                _tail_stderr(outcome.stderr),
+                            )
+                        )
+                        last_update = f"Build failed for {service.name}"
+                        last_update_style = "red"
+                        mirror_followers(service)
+                        continue
+
+                    if outcome.pending:
+                        bake_queue.append((service, outcome.build_hash))
+                        status_by_service[service.name] = "queued for bake"
+                        mirror_followers(service)
+                        continue
+
+                    if outcome.unchanged:
+                        where = " in ECR" if push_target else ""
+                        status_by_service[service.name] = (
+                            f"unchanged{where} ({_short_image_id(outcome.image_id)})"
+                        )
+                        last_update = f"{service.name} is unchanged"
+                    else:
+                        status_by_service[service.name] = _built_status(
+                            config, service, push_target
+                        )
+                        built_services.append(service)
+                        last_update = f"Built {service.name}"
+                    last_update_style = "green"
+                    mirror_followers(service)
+                live.update(render())
+
+        if bake_queue:
+            bake_file = write_bake_file(
+                config,
+                project_dir,
+                [service for service, _ in bake_queue],
+                cache_refs=cache_refs,
+                push_target=push_target,
+                followers_by_service=followers_by_leader,
+            )
+            metadata_file = bake_file.with_name(BAKE_METADATA_FILENAME)
+            metadata_file.unlink(missing_ok=True)
+            for service, _ in bake_queue:
+                status_by_service[service.name] = "building (bake)"
+                mirror_followers(service)
+            last_update = f"Running buildx bake ({bake_file})"
+            last_update_style = "white"
+            live.update(render())
+
+            result = _run_quiet(
+                [
+                    "docker",
+                    "buildx",
+                    "bake",
+                    "-f",
+                    str(bake_file),
+                    "--metadata-file",
+                    str(metadata_file),
+                    "default",
+                ],
+                cwd=project_dir,
+            )
+            bake_metadata = _read_build_metadata(metadata_file)
+            for service, build_hash in bake_queue:
+                if result.returncode != 0:
+                    status_by_service[service.name] = (
+                        f"failed (bake exit {result.returncode})"
                     )
+                    mirror_followers(service)
+                    continue
+                target_metadata = bake_metadata.get(_bake_target_name(service.name))
+                _record_built_image(
+                    config,
+                    service,
+                    manifest,
+                    build_hash,
+                    push_target=push_target,
+                    pushed_digest=_metadata_digest(target_metadata),
                 )
-                continue
-
-            tag = local_image_tag(config.project_name, service.name)
-            cmd = [
-                "docker",
-                "buildx",
-                "build",
-                "--load",
-                "-t",
-                tag,
-                "-f",
-                service.dockerfile,
-            ]
-            if service.docker_build_target:
-                cmd.extend(["--target", service.docker_build_target])
-            cmd.append(service.build_context)
-
-            status_by_service[service.name] = "building"
-            last_update = f"Building {service.name}"
-            live.update(
-                _render_docker_live_view(
-                    title="Docker Build",
-                    summary_rows=[
-                        ("Phase", "Building internal service images", "cyan"),
-                        ("Current service", service.name, "cyan"),
-                        ("Last update", last_update, "white"),
-                    ],
-                    service_status=status_by_service,
+                status_by_service[service.name] = _built_status(
+                    config, service, push_target
                 )
+                built_services.append(service)
+                mirror_followers(service)
+            if result.returncode != 0:
+                failures.append(
+                    ("buildx bake", result.returncode, _tail_stderr(result.stderr))
+                )
+                last_update = "buildx bake failed"
+                last_update_style = "red"
+            else:
+                last_update = f"Baked {len(bake_queue)} service image(s)"
+                last_update_style = "green"
+            live.update(render())
+
+    manifest.save()
+
+    if push_target and built_services:
+        _print_pushed_size_report(config, push_target, built_services, previous_sizes)
+    elif built_services:
+        _report_image_sizes(
+            config,
+            project_dir,
+            built_services,
+            size_budget_mb=size_budget_mb,
+            max_growth_percent=max_growth_percent,
+        )
+
+    if failures:
+        for failed_step, code, message in failures:
+            console.print(
+                f"[red]Build failed for {failed_step} with exit code {code}[/red]"
             )
+            if message:
+                console.print(f"[red]{message}[/red]")
+        raise SystemExit(failures[0][1])
 
-            result = _run_quiet(cmd, cwd=project_dir)
-            if result.returncode != 0:
-                status_by_service[service.name] = f"failed (exit {result.returncode})"
-                failed_code = result.returncode
-                failed_message = _tail_stderr(result.stderr)
-                last_update = f"Build failed for {service.name}"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Build",
-                        summary_rows=[
-                            ("Phase", "Building internal service images", "cyan"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "red"),
-                            (
-                                "Error",
-                                failed_message
-                                if failed_message
-                                else "No error details captured",
-                                "red",
-                            ),
-                        ],
-                        service_status=status_by_service,
-                    )
+    console.print("[green]✓ Docker build completed[/green]")
+
+
+def analyze_build_contexts(
+    config: ProjectConfig,
+    project_dir: Path,
+    service_name: str | None,
+) -> None:
+    """Report what each service's build context would send to BuildKit.
+
+    Contexts are walked with the same ``.dockerignore`` rules BuildKit
+    applies; services sharing a context and ignore file are analysed once.
+    """
+    services = select_internal_services(config, service_name)
+    if not services:
+        console.print("[dim]No internal service images to analyze.[/dim]")
+        return
+
+    contexts: dict[tuple[Path, tuple[str, ...]], list[ServiceConfig]] = {}
+    ignores: dict[tuple[Path, tuple[str, ...]], DockerIgnore] = {}
+    for service in services:
+        context_dir = (project_dir / service.build_context).resolve()
+        ignore = DockerIgnore.for_build(
+            project_dir, service.dockerfile, service.build_context
+        )
+        key = (context_dir, tuple(pattern.text for pattern in ignore.patterns))
+        contexts.setdefault(key, []).append(service)
+        ignores[key] = ignore
+
+    for key, context_services in contexts.items():
+        context_dir = key[0]
+        with console.status(f"Walking {context_dir}..."):
+            report = analyze_context(walk_context(context_dir, ignores[key]))
+
+        summary_table = Table(title="Summary", show_header=False, expand=True)
+        summary_table.add_column("Key", style="bold cyan", no_wrap=True, width=18)
+        summary_table.add_column("Value", overflow="fold")
+        summary_table.add_row("Services", ", ".join(s.name for s in context_services))
+        summary_table.add_row("Context", str(context_dir))
+        summary_table.add_row("Files", f"{report.file_count:,}")
+        summary_table.add_row("Size", _format_bytes(report.total_bytes))
+        summary_table.add_row(
+            "Est. transfer", f"~{report.estimated_transfer_seconds:.1f}s (local builder)"
+        )
+
+        dirs_table = Table(title="Largest directories", expand=True)
+        dirs_table.add_column("Directory", style="cyan", overflow="fold")
+        dirs_table.add_column("Size", justify="right")
+        dirs_table.add_column("Files", justify="right")
+        for rel_dir, size, count in report.largest_dirs:
+            dirs_table.add_row(rel_dir, _format_bytes(size), f"{count:,}")
+        if not report.largest_dirs:
+            dirs_table.add_row("-", "-", "-")
+
+        renderables = [summary_table, dirs_table]
+        if report.suggestions:
+            suggest_table = Table(title="Suggested .dockerignore entries", expand=True)
+            suggest_table.add_column("Entry", style="yellow", overflow="fold")
+            suggest_table.add_column("Saves", justify="right")
+            for entry, size in report.suggestions:
+                suggest_table.add_row(entry, _format_bytes(size))
+            renderables.append(suggest_table)
+
+        console.print(
+            Panel(Group(*renderables), border_style="cyan", title="Build Context")
+        )
+
+
+@dataclass
+class _BuildOutcome:
+    returncode: int = 0
+    stderr: str = ""
+    image_id: str = ""
+    build_hash: str = ""
+    unchanged: bool = False
+    pending: bool = False
+    cancelled: bool = False
+
+
+def _plan_service_build(
+    config: ProjectConfig,
+    project_dir: Path,
+    service: ServiceConfig,
+    *,
+    manifest: BuildManifest,
+    force: bool,
+    push_target: _RegistryPushTarget | None,
+    followers: list[ServiceConfig],
+    status_by_service: dict[str, str],
+) -> _BuildOutcome:
+    """Hash a service's build inputs and decide whether it needs a build.
+
+    Returns an ``unchanged`` outcome when the manifest entry matches and the
+    recorded image is still available (locally, or in ECR when pushing
+    directly, where it is retagged) for the service and every follower that
+    shares its image, otherwise a ``pending`` outcome carrying the build
+    hash to record once the image is built.
+    """
+    cmd = _buildx_build_command(
+        config, service, platforms=_build_platforms(service, push_target)
+    )
+    if push_target and push_target.output() != "type=registry":
+        # Compression changes the pushed bytes without changing the inputs.
+        cmd.extend(["--output", push_target.output()])
+    tag = local_image_tag(config.project_name, service.name)
+
+    status_by_service[service.name] = "hashing context"
+    try:
+        build_hash = manifest.compute_build_hash(project_dir, service, cmd)
+    except OSError:
+        build_hash = ""
+
+    previous = manifest.lookup(service.name)
+    if (
+        not force
+        and build_hash
+        and previous is not None
+        and previous.build_hash == build_hash
+    ):
+        if push_target is None:
+            image_id = _local_image_id(tag)
+            if (
+                image_id
+                and image_id == previous.image_id
+                and all(
+                    _run_quiet(
+                        [
+                            "docker",
+                            "tag",
+                            tag,
+                            local_image_tag(config.project_name, follower.name),
+                        ]
+                    ).returncode
+                    == 0
+                    for follower in followers
                 )
-                break
+            ):
+                return _BuildOutcome(image_id=image_id, unchanged=True)
+        else:
+            digest = previous.pushed_digests.get(push_target.env_name, "")
+            status_by_service[service.name] = "checking ECR"
+            if digest and all(
+                _retag_pushed_image(config, item, push_target, digest)
+                for item in [service, *followers]
+            ):
+                return _BuildOutcome(image_id=digest, unchanged=True)
+
+    return _BuildOutcome(build_hash=build_hash, pending=True)
+
+
+def _build_service_image(
+    config: ProjectConfig,
+    project_dir: Path,
+    service: ServiceConfig,
+    *,
+    manifest: BuildManifest,
+    build_hash: str,
+    cache_ref: str | None,
+    push_target: _RegistryPushTarget | None,
+    followers: list[ServiceConfig],
+    status_by_service: dict[str, str],
+) -> _BuildOutcome:
+    """Build one service image with ``docker buildx build`` and record it.
+
+    The image is also tagged (or pushed) for every follower service.
+    """
+    metadata_file: Path | None = None
+    if push_target:
+        metadata_file = (
+            project_dir / BUILD_DIR / "metadata" / f"{_bake_target_name(service.name)}.json"
+        )
+        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+        metadata_file.unlink(missing_ok=True)
+
+    status_by_service[service.name] = "building"
+    result = _run_quiet(
+        _buildx_build_command(
+            config,
+            service,
+            cache_ref=cache_ref,
+            push_target=push_target,
+            metadata_file=metadata_file,
+            followers=followers,
+        ),
+        cwd=project_dir,
+    )
+    if result.returncode != 0:
+        return _BuildOutcome(returncode=result.returncode, stderr=result.stderr)
+    return _record_built_image(
+        config,
+        service,
+        manifest,
+        build_hash,
+        push_target=push_target,
+        pushed_digest=(
+            _metadata_digest(_read_build_metadata(metadata_file))
+            if metadata_file
+            else ""
+        ),
+    )
+
+
+def _record_built_image(
+    config: ProjectConfig,
+    service: ServiceConfig,
+    manifest: BuildManifest,
+    build_hash: str,
+    *,
+    push_target: _RegistryPushTarget | None = None,
+    pushed_digest: str = "",
+) -> _BuildOutcome:
+    if not build_hash:
+        return _BuildOutcome(image_id=pushed_digest)
+
+    previous = manifest.lookup(service.name)
+    if previous is not None and previous.build_hash == build_hash:
+        image_id = previous.image_id
+        pushed_digests = dict(previous.pushed_digests)
+    else:
+        image_id = ""
+        pushed_digests = {}
+
+    if push_target is None:
+        image_id = _local_image_id(local_image_tag(config.project_name, service.name))
+    elif pushed_digest:
+        pushed_digests[push_target.env_name] = pushed_digest
+
+    if image_id or pushed_digests:
+        manifest.record(
+            service.name,
+            ImageManifestEntry(
+                build_hash=build_hash,
+                image_id=image_id,
+                built_at=datetime.now(UTC).isoformat(timespec="seconds"),
+                pushed_digests=pushed_digests,
+            ),
+        )
+    return _BuildOutcome(image_id=pushed_digest if push_target else image_id)
+
+
+@dataclass
+class _RegistryPushTarget:
+    """Where a direct build-and-push publishes service images."""
 
-            status_by_service[service.name] = f"built ({tag})"
-            last_update = f"Built {service.name}"
-            live.update(
-                _render_docker_live_view(
-                    title="Docker Build",
-                    summary_rows=[
-                        ("Phase", "Building internal service images", "cyan"),
-                        ("Current service", service.name, "cyan"),
-                        ("Last update", last_update, "green"),
-                    ],
-                    service_status=status_by_service,
+    ecr: Any
+    registry: str
+    env_name: str
+    immutable_tag: str
+    multi_arch: bool = False
+    compression: str | None = None
+    compression_level: int | None = None
+
+    def output(self) -> str:
+        """Return the buildx ``--output`` spec for this push."""
+        spec = "type=registry"
+        if self.compression or self.compression_level is not None:
+            spec += f",compression={self.compression or 'gzip'},force-compression=true"
+            if self.compression_level is not None:
+                spec += f",compression-level={self.compression_level}"
+            if self.compression == "zstd":
+                # zstd layers are only defined for OCI manifests.
+                spec += ",oci-mediatypes=true"
+        return spec
+
+    def repo(self, config: ProjectConfig, service: ServiceConfig) -> str:
+        return ecr_repo_name(config.project_name, self.env_name, service.name)
+
+    def tags(self, config: ProjectConfig, service: ServiceConfig) -> list[str]:
+        repo_uri = f"{self.registry}/{self.repo(config, service)}"
+        return [f"{repo_uri}:{self.immutable_tag}", f"{repo_uri}:latest"]
+
+
+def _retag_pushed_image(
+    config: ProjectConfig,
+    service: ServiceConfig,
+    push_target: _RegistryPushTarget,
+    digest: str,
+) -> bool:
+    """Point the immutable and latest tags at an already pushed *digest*."""
+    repo = push_target.repo(config, service)
+    try:
+        images = push_target.ecr.batch_get_image(
+            repositoryName=repo,
+            imageIds=[{"imageDigest": digest}],
+        ).get("images", [])
+        if not images:
+            return False
+        _put_image_tags(
+            push_target.ecr, repo, images[0], [push_target.immutable_tag, "latest"]
+        )
+    except ClientError:
+        return False
+    return True
+
+
+def _ecr_image_size(ecr, repo: str, tag: str) -> int | None:
+    """Return the compressed size ECR reports for *repo*:*tag*, if it exists."""
+    try:
+        details = ecr.describe_images(
+            repositoryName=repo, imageIds=[{"imageTag": tag}]
+        ).get("imageDetails", [])
+    except ClientError:
+        return None
+    if not details or details[0].get("imageSizeInBytes") is None:
+        return None
+    return int(details[0]["imageSizeInBytes"])
+
+
+def _print_pushed_size_report(
+    config: ProjectConfig,
+    push_target: _RegistryPushTarget,
+    services: list[ServiceConfig],
+    previous_sizes: dict[str, int | None],
+) -> None:
+    table = Table(
+        title=f"ECR image size ({push_target.compression or 'default'} layers)",
+        expand=True,
+    )
+    table.add_column("Service", style="cyan")
+    table.add_column("Previous latest", justify="right")
+    table.add_column("New", justify="right")
+    table.add_column("Change", justify="right")
+    for service in services:
+        before = previous_sizes.get(service.name)
+        after = _ecr_image_size(
+            push_target.ecr, push_target.repo(config, service), push_target.immutable_tag
+        )
+        change = "-"
+        if before and after is not None:
+            percent = (after - before) / before * 100
+            style = "green" if percent <= 0 else "yellow"
+            change = f"[{style}]{percent:+.1f}%[/{style}]"
+        table.add_row(
+            service.name,
+            _format_bytes(before) if before is not None else "-",
+            _format_bytes(after) if after is not None else "-",
+            change,
+        )
+    console.print(table)
+
+
+def _report_image_sizes(
+    config: ProjectConfig,
+    project_dir: Path,
+    services: list[ServiceConfig],
+    *,
+    size_budget_mb: int | None,
+    max_growth_percent: float,
+) -> None:
+    """Record and print size/layer breakdowns for freshly built local images."""
+    history = BuildHistory(project_dir)
+    table = Table(title="Image size", expand=True)
+    table.add_column("Service", style="cyan", no_wrap=True)
+    table.add_column("Size", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Layers", justify="right")
+    table.add_column("Largest layers", overflow="fold")
+    warnings: list[str] = []
+
+    for service in services:
+        record = _image_size_record(local_image_tag(config.project_name, service.name))
+        if record is None:
+            continue
+        previous = history.latest(service.name)
+        history.append(service.name, record)
+
+        change = "-"
+        if previous and previous.size_bytes:
+            percent = (record.size_bytes - previous.size_bytes) / previous.size_bytes * 100
+            style = "yellow" if percent > max_growth_percent else "white"
+            change = f"[{style}]{percent:+.1f}%[/{style}]"
+            if percent > max_growth_percent:
+                warnings.append(
+                    f"{service.name} grew {percent:.1f}% since its last build "
+                    f"({_format_bytes(previous.size_bytes)} -> "
+                    f"{_format_bytes(record.size_bytes)})"
                 )
+        if size_budget_mb is not None and record.size_bytes > size_budget_mb * 1e6:
+            warnings.append(
+                f"{service.name} is {_format_bytes(record.size_bytes)}, over the "
+                f"{size_budget_mb}MB budget"
             )
 
-    if failed_code is not None:
-        console.print(f"[red]Build failed with exit code {failed_code}[/red]")
-        if failed_message:
-            console.print(f"[red]{failed_message}[/red]")
-        raise SystemExit(failed_code)
+        largest = "\n".join(
+            f"{_format_bytes(float(size))}  {str(created_by)[:80]}"
+            for size, created_by in record.largest_layers
+        )
+        table.add_row(
+            service.name,
+            _format_bytes(record.size_bytes),
+            change,
+            str(record.layer_count),
+            largest or "-",
+        )
+
+    if not table.rows:
+        return
+    history.save()
+    console.print(table)
+    for warning in warnings:
+        console.print(f"[yellow]⚠ {warning}[/yellow]")
 
-    console.print("[green]✓ Docker build completed[/green]")
+
+def _image_size_record(tag: str) -> ImageSizeRecord | None:
+    inspect = _run_capture(["docker", "image", "inspect", "--format", "{{json .}}", tag])
+    history = _run_capture(
+        [
+            "docker",
+            "history",
+            "--no-trunc",
+            "--human=false",
+            "--format",
+            "{{json .}}",
+            tag,
+        ]
+    )
+    if inspect.returncode != 0 or history.returncode != 0:
+        return None
+    try:
+        info = json.loads(inspect.stdout)
+        layers = [json.loads(line) for line in history.stdout.splitlines() if line]
+    except ValueError:
+        return None
+
+    sized_layers: list[list[object]] = []
+    for layer in layers:
+        try:
+            size = int(layer.get("Size", 0))
+        except (TypeError, ValueError):
+            size = 0
+        created_by = " ".join(str(layer.get("CreatedBy", "")).split())
+        created_by = created_by.removeprefix("/bin/sh -c #(nop) ").removeprefix(
+            "/bin/sh -c "
+        )
+        sized_layers.append([size, created_by])
+    sized_layers.sort(key=lambda item: -int(item[0]))
+    return ImageSizeRecord(
+        built_at=datetime.now(UTC).isoformat(timespec="seconds"),
+        image_id=str(info.get("Id", "")),
+        size_bytes=int(info.get("Size", 0)),
+        layer_count=len(layers),
+        largest_layers=sized_layers[:_REPORTED_LAYERS],
+    )
+
+
+def _built_status(
+    config: ProjectConfig,
+    service: ServiceConfig,
+    push_target: _RegistryPushTarget | None,
+) -> str:
+    if push_target:
+        return f"built + pushed ({push_target.immutable_tag} + latest)"
+    return f"built ({local_image_tag(config.project_name, service.name)})"
+
+
+def _read_build_metadata(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _metadata_digest(metadata: dict[str, Any] | None) -> str:
+    if not metadata:
+        return ""
+    return str(metadata.get("containerimage.digest", ""))
+
+
+def write_bake_file(
+    config: ProjectConfig,
+    project_dir: Path,
+    services: list[ServiceConfig],
+    *,
+    cache_refs: dict[str, str] | None = None,
+    push_target: _RegistryPushTarget | None = None,
+    followers_by_service: dict[str, list[ServiceConfig]] | None = None,
+) -> Path:
+    """Write a ``docker buildx bake`` file covering *services*.
+
+    The file lives at ``.darth-infra/build/docker-bake.json`` so it can be
+    inspected or re-run by hand. Every service becomes a target in the
+    ``default`` group.
+    """
+    targets: dict[str, dict[str, object]] = {}
+    for service in services:
+        context_dir = (project_dir / service.build_context).resolve()
+        dockerfile = os.path.relpath(
+            (project_dir / service.dockerfile).resolve(), context_dir
+        )
+        target: dict[str, object] = {
+            "context": str(context_dir),
+            "dockerfile": Path(dockerfile).as_posix(),
+        }
+        target["tags"] = _image_tags(
+            config,
+            [service, *(followers_by_service or {}).get(service.name, [])],
+            push_target,
+        )
+        target["output"] = [push_target.output()] if push_target else ["type=docker"]
+        target["platforms"] = _build_platforms(service, push_target)
+        if service.docker_build_target:
+            target["target"] = service.docker_build_target
+        cache_ref = (cache_refs or {}).get(service.name)
+        if cache_ref:
+            target["cache-from"] = [f"type=registry,ref={cache_ref}"]
+            target["cache-to"] = [_registry_cache_to(cache_ref)]
+        targets[_bake_target_name(service.name)] = target
+
+    bake = {
+        "group": {"default": {"targets": list(targets)}},
+        "target": targets,
+    }
+    bake_file = project_dir / BUILD_DIR / BAKE_FILENAME
+    bake_file.parent.mkdir(parents=True, exist_ok=True)
+    bake_file.write_text(json.dumps(bake, indent=2) + "\n")
+    return bake_file
+
+
+def _bake_target_name(service_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", service_name)
+
+
+def _local_image_id(tag: str) -> str:
+    result = _run_capture(["docker", "image", "inspect", "--format", "{{.Id}}", tag])
+    if result.returncode != 0:
+        return ""
+    return result.stdout.strip()
+
+
+def _short_image_id(image_id: str) -> str:
+    return image_id.removeprefix("sha256:")[:12] or "cached"
+
+
+def default_build_jobs(service_count: int) -> int:
+    """Pick a build concurrency that fits this machine's CPUs and memory.
+
+    Each BuildKit solve already parallelizes its own stages, so we budget
+    two CPUs and ``_BUILD_MEMORY_PER_JOB_BYTES`` of RAM per concurrent build.
+    """
+    cpu_jobs = max(1, (os.cpu_count() or 1) // 2)
+    memory_jobs = cpu_jobs
+    try:
+        total_memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        memory_jobs = max(1, total_memory // _BUILD_MEMORY_PER_JOB_BYTES)
+    except (AttributeError, OSError, ValueError):
+        pass
+    return max(1, min(cpu_jobs, memory_jobs, service_count))
+
+
+def _buildx_build_command(
+    config: ProjectConfig,
+    service: ServiceConfig,
+    *,
+    cache_ref: str | None = None,
+    push_target: _RegistryPushTarget | None = None,
+    metadata_file: Path | None = None,
+    platforms: list[str] | None = None,
+    followers: list[ServiceConfig] | None = None,
+) -> list[str]:
+    if platforms is None:
+        platforms = _build_platforms(service, push_target)
+    cmd = ["docker", "buildx", "build", "--platform", ",".join(platforms)]
+    if push_target:
+        cmd.extend(["--output", push_target.output()])
+    else:
+        cmd.append("--load")
+    for tag in _image_tags(config, [service, *(followers or [])], push_target):
+        cmd.extend(["-t", tag])
+    cmd.extend(["-f", service.dockerfile])
+    if service.docker_build_target:
+        cmd.extend(["--target", service.docker_build_target])
+    if cache_ref:
+        cmd.extend(
+            [
+                "--cache-from",
+                f"type=registry,ref={cache_ref}",
+                "--cache-to",
+                _registry_cache_to(cache_ref),
+            ]
+        )
+    if metadata_file:
+        cmd.extend(["--metadata-file", str(metadata_file)])
+    cmd.append(service.build_context)
+    return cmd
+
+
+def _image_tags(
+    config: ProjectConfig,
+    services: list[ServiceConfig],
+    push_target: _RegistryPushTarget | None,
+) -> list[str]:
+    if push_target:
+        return [tag for service in services for tag in push_target.tags(config, service)]
+    return [local_image_tag(config.project_name, service.name) for service in services]
+
+
+def group_by_build_identity(
+    services: list[ServiceConfig],
+) -> list[list[ServiceConfig]]:
+    """Group services whose images would be identical, in config order.
+
+    Services share an image when they use the same Dockerfile, build context,
+    build target and platform, typically web/worker/beat services that only
+    differ in ``command``. The first service of each group builds the image.
+    """
+    groups: dict[tuple[str, str, str, str], list[ServiceConfig]] = {}
+    for service in services:
+        key = (
+            os.path.normpath(service.dockerfile),
+            os.path.normpath(service.build_context),
+            service.docker_build_target or "",
+            service_platform(service),
+        )
+        groups.setdefault(key, []).append(service)
+    return list(groups.values())
+
+
+def service_platform(service: ServiceConfig) -> str:
+    """Return the Docker platform *service*'s tasks run on.
+
+    Only EC2-backed services honour ``architecture``; Fargate task
+    definitions always run on x86_64.
+    """
+    if (
+        service.launch_type == LaunchType.EC2
+        and service.architecture == Architecture.ARM64
+    ):
+        return "linux/arm64"
+    return "linux/amd64"
+
+
+def _build_platforms(
+    service: ServiceConfig, push_target: _RegistryPushTarget | None
+) -> list[str]:
+    if push_target and push_target.multi_arch:
+        return list(MULTI_ARCH_PLATFORMS)
+    return [service_platform(service)]
+
+
+def _registry_cache_to(cache_ref: str) -> str:
+    # ECR only accepts cache manifests in OCI image-manifest form.
+    return (
+        f"type=registry,ref={cache_ref},mode=max,"
+        "image-manifest=true,oci-mediatypes=true"
+    )
+
+
+def registry_cache_ref(
+    registry: str, project_name: str, env_name: str, service_name: str
+) -> str:
+    """Return the ECR cache reference stored next to a service's image tags."""
+    repo = ecr_repo_name(project_name, env_name, service_name)
+    return f"{registry}/{repo}:{BUILD_CACHE_TAG}"
 
 
 def push_images(
     config: ProjectConfig,
     env_name: str,
     service_name: str | None,
+    *,
+    jobs: int | None = None,
 ) -> None:
-    """Tag and push local Docker images to ECR with latest + immutable tags."""
+    """Tag and push local Docker images to ECR with latest + immutable tags.
+
+    Each service runs its own tag/push pipeline; up to ``jobs`` pipelines run
+    concurrently (defaults to ``DEFAULT_PUSH_JOBS``). A failed pipeline stops
+    queued services from starting but lets in-flight pushes finish.
+
+    Services that share an image (see ``group_by_build_identity``) are not
+    pushed with docker: once the first service of their group is in ECR, its
+    blobs are mounted into their repositories and its manifest is tagged
+    there, so shared layers are uploaded only once.
+    """
     services = select_services(config, service_name)
-    account = boto3.client("sts").get_caller_identity()["Account"]
-    registry = ecr_registry_uri(account, config.aws_region)
+    registry = resolve_ecr_registry(config)
+    ecr = aws_client("ecr", region_name=config.aws_region)
 
-    login_cmd = (
-        f"aws ecr get-login-password --region {config.aws_region} "
-        f"| docker login --username AWS --password-stdin {registry}"
-    )
     status_by_service: dict[str, str] = {service.name: "queued" for service in services}
+    internal_services: list[ServiceConfig] = []
+    for service in services:
+        if service.image:
+            status_by_service[service.name] = "skipped (external image)"
+            continue
+        internal_services.append(service)
+
+    leaders: list[ServiceConfig] = []
+    followers_by_leader: dict[str, list[ServiceConfig]] = {}
+    for group in group_by_build_identity(internal_services):
+        leaders.append(group[0])
+        followers_by_leader[group[0].name] = group[1:]
+        for follower in group[1:]:
+            status_by_service[follower.name] = f"waiting for {group[0].name}"
+
+    max_workers = jobs or min(DEFAULT_PUSH_JOBS, max(1, len(internal_services)))
+    phase = "ECR authentication"
     last_update = "Logging in to ECR"
-    failed_code: int | None = None
-    failed_message = ""
+    last_update_style = "white"
+    failures: list[tuple[str, int, str]] = []
     immutable_tag = build_immutable_tag()
+    copied_layers_by_service: dict[str, int] = {}
+    stop_scheduling = threading.Event()
 
-    with Live(console=console, refresh_per_second=8, transient=False) as live:
-        live.update(
-            _render_docker_live_view(
-                title="Docker Push",
-                summary_rows=[
-                    ("Phase", "ECR authentication", "cyan"),
-                    ("Registry", registry, "white"),
-                    ("Last update", last_update, "white"),
-                ],
-                service_status=status_by_service,
+    def render() -> Group:
+        summary_rows = [
+            ("Phase", phase, "cyan"),
+            ("Registry", registry, "white"),
+            ("Immutable tag", immutable_tag, "white"),
+            ("Parallel pushes", str(max_workers), "white"),
+            ("Last update", last_update, last_update_style),
+        ]
+        if failures:
+            _, _, message = failures[-1]
+            summary_rows.append(
+                ("Error", message if message else "No error details captured", "red")
             )
+        return _render_docker_live_view(
+            title="Docker Push",
+            summary_rows=summary_rows,
+            service_status=status_by_service,
         )
 
-        login_result = _run_quiet(login_cmd, shell=True)
+    def run_pipeline(
+        service: ServiceConfig,
+        leader: ServiceConfig | None = None,
+    ) -> subprocess.CompletedProcess[str] | None:
+        if stop_scheduling.is_set():
+            return None
+        if leader is None:
+            result = _push_service_pipeline(
+                config,
+                env_name,
+                service,
+                ecr=ecr,
+                registry=registry,
+                immutable_tag=immutable_tag,
+                status_by_service=status_by_service,
+            )
+        else:
+            result = _push_follower_image(
+                config,
+                env_name,
+                service,
+                leader,
+                ecr=ecr,
+                registry=registry,
+                immutable_tag=immutable_tag,
+                status_by_service=status_by_service,
+                copied_layers_by_service=copied_layers_by_service,
+            )
+        if result.returncode != 0:
+            stop_scheduling.set()
+        return result
+
+    with Live(console=console, refresh_per_second=8, transient=False) as live:
+        live.update(render())
+
+        login_result = ecr_docker_login(config, registry)
         if login_result.returncode != 0:
-            failed_code = login_result.returncode
-            failed_message = _tail_stderr(login_result.stderr)
-            live.update(
-                _render_docker_live_view(
-                    title="Docker Push",
-                    summary_rows=[
-                        ("Phase", "ECR authentication", "cyan"),
-                        ("Registry", registry, "white"),
-                        ("Last update", "ECR login failed", "red"),
-                        (
-                            "Error",
-                            failed_message
-                            if failed_message
-                            else "No error details captured",
-                            "red",
-                        ),
-                    ],
-                    service_status=status_by_service,
-                )
+            failures.append(
+                ("ECR login", login_result.returncode, _tail_stderr(login_result.stderr))
             )
+            last_update = "ECR login failed"
+            last_update_style = "red"
+            live.update(render())
         else:
+            phase = "Pushing service images"
             last_update = "ECR login succeeded"
-            live.update(
-                _render_docker_live_view(
-                    title="Docker Push",
-                    summary_rows=[
-                        ("Phase", "Pushing service images", "cyan"),
-                        ("Registry", registry, "white"),
-                        ("Immutable tag", immutable_tag, "white"),
-                        ("Last update", last_update, "green"),
-                    ],
-                    service_status=status_by_service,
-                )
+            last_update_style = "green"
+            live.update(render())
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = {
+                    executor.submit(run_pipeline, service): service
+                    for service in leaders
+                }
+                while pending:
+                    done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        service = pending.pop(future)
+                        result = future.result()
+                        followers = followers_by_leader.pop(service.name, [])
+                        if result is not None and result.returncode == 0:
+                            for follower in followers:
+                                pending[
+                                    executor.submit(run_pipeline, follower, service)
+                                ] = follower
+                        else:
+                            for follower in followers:
+                                status_by_service[follower.name] = (
+                                    f"cancelled ({service.name} push failed)"
+                                )
+                        if result is None:
+                            status_by_service[service.name] = (
+                                "cancelled (earlier push failed)"
+                            )
+                            continue
+                        if result.returncode != 0:
+                            failures.append(
+                                (
+                                    service.name,
+                                    result.returncode,
+                                    _tail_stderr(result.stderr),
+                                )
+                            )
+                            last_update = f"Push failed for {service.name}"
+                            last_update_style = "red"
+                            continue
+                        last_update = f"Pushed {service.name}"
+                        last_update_style = "green"
+                    live.update(render())
+
+    for name, copied in copied_layers_by_service.items():
+        console.print(
+            f"[yellow]{name}: registry declined {copied} layer mount(s); "
+            "copied them through this machine instead[/yellow]"
+        )
+
+    if failures:
+        for failed_step, code, message in failures:
+            console.print(
+                f"[red]Push failed for {failed_step} with exit code {code}[/red]"
             )
+            if message:
+                console.print(f"[red]{message}[/red]")
+        raise SystemExit(failures[0][1])
 
-        if failed_code is None:
-            for service in services:
-                if service.image:
-                    status_by_service[service.name] = "skipped (external image)"
-                    last_update = f"Skipped {service.name}: uses external image"
-                    live.update(
-                        _render_docker_live_view(
-                            title="Docker Push",
-                            summary_rows=[
-                                ("Phase", "Pushing service images", "cyan"),
-                                ("Registry", registry, "white"),
-                                ("Immutable tag", immutable_tag, "white"),
-                                ("Last update", last_update, "dim"),
-                            ],
-                            service_status=status_by_service,
-                        )
-                    )
-                    continue
+    console.print("[green]✓ Docker push completed[/green]")
 
-                local_tag = local_image_tag(config.project_name, service.name)
-                repo = ecr_repo_name(config.project_name, env_name, service.name)
-                latest_remote_tag = f"{registry}/{repo}:latest"
-                immutable_remote_tag = f"{registry}/{repo}:{immutable_tag}"
-
-                status_by_service[service.name] = "tagging immutable"
-                last_update = f"Tagging {service.name} for immutable push"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Push",
-                        summary_rows=[
-                            ("Phase", "Pushing service images", "cyan"),
-                            ("Registry", registry, "white"),
-                            ("Immutable tag", immutable_tag, "white"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "white"),
-                        ],
-                        service_status=status_by_service,
-                    )
-                )
 
-                tag_immutable_result = _run_quiet(
-                    ["docker", "tag", local_tag, immutable_remote_tag]
-                )
-                if tag_immutable_result.returncode != 0:
-                    status_by_service[service.name] = (
-                        f"failed tagging immutable (exit {tag_immutable_result.returncode})"
-                    )
-                    failed_code = tag_immutable_result.returncode
-                    failed_message = _tail_stderr(tag_immutable_result.stderr)
-                    live.update(
-                        _render_docker_live_view(
-                            title="Docker Push",
-                            summary_rows=[
-                                ("Phase", "Pushing service images", "cyan"),
-                                ("Registry", registry, "white"),
-                                ("Current service", service.name, "cyan"),
-                                (
-                                    "Last update",
-                                    "Failed while tagging immutable image",
-                                    "red",
-                                ),
-                                (
-                                    "Error",
-                                    failed_message
-                                    if failed_message
-                                    else "No error details captured",
-                                    "red",
-                                ),
-                            ],
-                            service_status=status_by_service,
-                        )
-                    )
-                    break
-
-                status_by_service[service.name] = "pushing immutable"
-                last_update = f"Pushing immutable image for {service.name}"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Push",
-                        summary_rows=[
-                            ("Phase", "Pushing service images", "cyan"),
-                            ("Registry", registry, "white"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "white"),
-                        ],
-                        service_status=status_by_service,
-                    )
-                )
+def _push_follower_image(
+    config: ProjectConfig,
+    env_name: str,
+    service: ServiceConfig,
+    leader: ServiceConfig,
+    *,
+    ecr,
+    registry: str,
+    immutable_tag: str,
+    status_by_service: dict[str, str],
+    copied_layers_by_service: dict[str, int],
+) -> subprocess.CompletedProcess[str]:
+    """Publish the image *leader* just pushed under *service*'s repository."""
+    source_repo = ecr_repo_name(config.project_name, env_name, leader.name)
+    target_repo = ecr_repo_name(config.project_name, env_name, service.name)
+    status_by_service[service.name] = f"copying from {leader.name}"
+    try:
+        images = ecr.batch_get_image(
+            repositoryName=source_repo,
+            imageIds=[{"imageTag": immutable_tag}],
+            acceptedMediaTypes=_MANIFEST_MEDIA_TYPES,
+        ).get("images", [])
+        if not images:
+            raise ValueError(f"{source_repo}:{immutable_tag} not found")
+        root = images[0]
+        _replicate_image(
+            ecr,
+            registry=registry,
+            region=config.aws_region,
+            source_repo=source_repo,
+            target_repo=target_repo,
+            root=root,
+            service_name=service.name,
+            status_by_service=status_by_service,
+            copied_layers_by_service=copied_layers_by_service,
+        )
+        _put_image_tags(
+            ecr,
+            target_repo,
+            {**root, "imageId": {"imageDigest": root["imageId"]["imageDigest"]}},
+            [immutable_tag, "latest"],
+        )
+    except (BotoCoreError, ClientError, OSError, ValueError) as exc:
+        status_by_service[service.name] = f"failed copying from {leader.name}"
+        return subprocess.CompletedProcess([], 1, "", str(exc))
 
-                push_immutable_result = _run_quiet(
-                    ["docker", "push", immutable_remote_tag]
-                )
-                if push_immutable_result.returncode != 0:
+    status_by_service[service.name] = f"pushed latest + immutable (from {leader.name})"
+    return subprocess.CompletedProcess([], 0, "", "")
+
+
+def _push_service_pipeline(
+    config: ProjectConfig,
+    env_name: str,
+    service: ServiceConfig,
+    *,
+    ecr,
+    registry: str,
+    immutable_tag: str,
+    status_by_service: dict[str, str],
+) -> subprocess.CompletedProcess[str]:
+    """Publish one service image under its immutable and latest tags.
+
+    When ECR already holds the local image, no layers are pushed: both tags
+    are pointed at the existing manifest with ``put_image``. Otherwise the
+    immutable tag is pushed once with docker and ``latest`` is retagged
+    through the manifest API instead of a second ``docker push``.
+    """
+    local_tag = local_image_tag(config.project_name, service.name)
+    repo = ecr_repo_name(config.project_name, env_name, service.name)
+    immutable_remote_tag = f"{registry}/{repo}:{immutable_tag}"
+
+    status_by_service[service.name] = "checking ECR"
+    local_id, repo_digests = _local_image_digests(local_tag, f"{registry}/{repo}")
+    if not local_id:
+        return subprocess.CompletedProcess(
+            [], 1, "", f"Local image {local_tag} not found; run darth-infra build first"
+        )
+
+    try:
+        remote = _find_remote_image(ecr, repo, local_id, repo_digests)
+        if remote is not None:
+            status_by_service[service.name] = "retagging in ECR"
+            _put_image_tags(ecr, repo, remote, [immutable_tag, "latest"])
+            status_by_service[service.name] = (
+                f"unchanged in ECR ({_short_image_id(remote['imageId']['imageDigest'])})"
+            )
+            return subprocess.CompletedProcess([], 0, "", "")
+    except ClientError as exc:
+        return subprocess.CompletedProcess([], 1, "", str(exc))
+
+    steps: list[tuple[str, list[str]]] = [
+        ("tagging immutable", ["docker", "tag", local_tag, immutable_remote_tag]),
+        ("pushing immutable", ["docker", "push", immutable_remote_tag]),
+    ]
+    for label, cmd in steps:
+        status_by_service[service.name] = label
+        if cmd[1] == "push":
+            progress = _PushProgress()
+
+            def on_line(line: str, label: str = label, progress=progress) -> None:
+                progress.feed(line)
+                status_by_service[service.name] = f"{label} ({progress.describe()})"
+
+            result = _run_streaming(cmd, on_line=on_line, pseudo_tty=True)
+        else:
+            result = _run_quiet(cmd)
+        if result.returncode != 0:
+            status_by_service[service.name] = (
+                f"failed {label} (exit {result.returncode})"
+            )
+            return result
+
+    status_by_service[service.name] = "tagging latest in ECR"
+    try:
+        images = ecr.batch_get_image(
+            repositoryName=repo,
+            imageIds=[{"imageTag": immutable_tag}],
+        ).get("images", [])
+        if not images:
+            raise RuntimeError(f"Pushed tag {immutable_tag} not found in {repo}")
+        _put_image_tags(ecr, repo, images[0], ["latest"])
+    except (ClientError, RuntimeError) as exc:
+        status_by_service[service.name] = "failed tagging latest"
+        return subprocess.CompletedProcess([], 1, "", str(exc))
+
+    status_by_service[service.name] = "pushed latest + immutable"
+    return result
+
+
+def _local_image_digests(local_tag: str, repository: str) -> tuple[str, list[str]]:
+    """Return the local image ID and any repo digests it has for *repository*."""
+    result = _run_capture(
+        ["docker", "image", "inspect", "--format", "{{json .}}", local_tag]
+    )
+    if result.returncode != 0:
+        return "", []
+    try:
+        info = json.loads(result.stdout)
+    except ValueError:
+        return "", []
+    repo_digests = [
+        str(ref).split("@", 1)[1]
+        for ref in info.get("RepoDigests") or []
+        if str(ref).startswith(f"{repository}@")
+    ]
+    return str(info.get("Id", "")), repo_digests
+
+
+def _find_remote_image(
+    ecr,
+    repo: str,
+    local_id: str,
+    repo_digests: list[str],
+) -> dict | None:
+    """Find an image in *repo* that is byte-identical to the local image.
+
+    Candidates are the digests docker recorded from earlier pushes to this
+    repo plus the current ``latest`` tag. A candidate matches when its
+    manifest digest or config digest equals the local image ID.
+    """
+    image_ids: list[dict[str, str]] = [
+        {"imageDigest": digest} for digest in repo_digests
+    ]
+    image_ids.append({"imageTag": "latest"})
+    try:
+        images = ecr.batch_get_image(repositoryName=repo, imageIds=image_ids).get(
+            "images", []
+        )
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", ""))
+        if code == "RepositoryNotFoundException":
+            raise
+        return None
+
+    for image in images:
+        digest = str(image.get("imageId", {}).get("imageDigest", ""))
+        if digest == local_id:
+            return image
+        try:
+            manifest = json.loads(image.get("imageManifest", ""))
+        except ValueError:
+            continue
+        config_digest = str(manifest.get("config", {}).get("digest", ""))
+        if config_digest and config_digest == local_id:
+            return image
+    return None
+
+
+def _put_image_tags(ecr, repo: str, image: dict, tags: list[str]) -> None:
+    """Point each of *tags* at *image*'s manifest without moving any layers."""
+    manifest = image["imageManifest"]
+    media_type = image.get("imageManifestMediaType")
+    current_tag = str(image.get("imageId", {}).get("imageTag", ""))
+    for tag in tags:
+        if tag == current_tag:
+            continue
+        kwargs: dict[str, str] = {
+            "repositoryName": repo,
+            "imageManifest": manifest,
+            "imageTag": tag,
+        }
+        if media_type:
+            kwargs["imageManifestMediaType"] = media_type
+        try:
+            ecr.put_image(**kwargs)
+        except ClientError as exc:
+            code = str(exc.response.get("Error", {}).get("Code", ""))
+            if code != "ImageAlreadyExistsException":
+                raise
+
+
+def promote_images(
+    config: ProjectConfig,
+    from_env: str,
+    to_env: str,
+    service_name: str | None,
+    *,
+    tag: str | None = None,
+    jobs: int | None = None,
+) -> None:
+    """Copy service images from one environment's ECR repos to another's.
+
+    Everything goes through the registry: manifests are read with
+    ``batch_get_image``, missing blobs are mounted from the source
+    repository (falling back to a registry-side layer copy) and the
+    manifest is written with ``put_image``. No docker daemon is involved
+    and layers are never re-uploaded from this machine when mounting works.
+
+    ``tag`` selects the source image (default ``latest``). The target gets
+    ``latest`` plus the source's immutable ``build-...`` tag, or a fresh
+    ``build_immutable_tag`` when the source image has none.
+    """
+    services = select_services(config, service_name)
+    registry = resolve_ecr_registry(config)
+    ecr = aws_client("ecr", region_name=config.aws_region)
+    source_tag = tag or "latest"
+
+    status_by_service: dict[str, str] = {service.name: "queued" for service in services}
+    internal_services: list[ServiceConfig] = []
+    for service in services:
+        if service.image:
+            status_by_service[service.name] = "skipped (external image)"
+            continue
+        internal_services.append(service)
+
+    max_workers = jobs or min(DEFAULT_PUSH_JOBS, max(1, len(internal_services)))
+    fallback_tag = build_immutable_tag()
+    copied_layers_by_service: dict[str, int] = {}
+    failures: list[tuple[str, int, str]] = []
+    last_update = "Starting promotion"
+    last_update_style = "white"
+
+    def render() -> Group:
+        summary_rows = [
+            ("Phase", f"Promoting {from_env} -> {to_env}", "cyan"),
+            ("Registry", registry, "white"),
+            ("Source tag", source_tag, "white"),
+            ("Parallel copies", str(max_workers), "white"),
+            ("Last update", last_update, last_update_style),
+        ]
+        if failures:
+            _, _, message = failures[-1]
+            summary_rows.append(
+                ("Error", message if message else "No error details captured", "red")
+            )
+        return _render_docker_live_view(
+            title="Image Promotion",
+            summary_rows=summary_rows,
+            service_status=status_by_service,
+        )
+
+    def run_promotion(service: ServiceConfig) -> str:
+        return _promote_service_image(
+            config,
+            service,
+            ecr=ecr,
+            registry=registry,
+            from_env=from_env,
+            to_env=to_env,
+            source_tag=source_tag,
+            fallback_tag=fallback_tag,
+            status_by_service=status_by_service,
+            copied_layers_by_service=copied_layers_by_service,
+        )
+
+    with Live(console=console, refresh_per_second=8, transient=False) as live:
+        live.update(render())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {
+                executor.submit(run_promotion, service): service
+                for service in internal_services
+            }
+            while pending:
+                done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in done:
+                    service = pending.pop(future)
+                    try:
+                        promoted_tag = future.result()
+                    except (BotoCoreError, ClientError, OSError, ValueError) as exc:
+                        status_by_service[service.name] = "failed"
+                        failures.append((service.name, 1, str(exc)))
+                        last_update = f"Promotion failed for {service.name}"
+                        last_update_style = "red"
+                        continue
                     status_by_service[service.name] = (
-                        f"failed pushing immutable (exit {push_immutable_result.returncode})"
-                    )
-                    failed_code = push_immutable_result.returncode
-                    failed_message = _tail_stderr(push_immutable_result.stderr)
-                    live.update(
-                        _render_docker_live_view(
-                            title="Docker Push",
-                            summary_rows=[
-                                ("Phase", "Pushing service images", "cyan"),
-                                ("Registry", registry, "white"),
-                                ("Current service", service.name, "cyan"),
-                                ("Last update", "Immutable push failed", "red"),
-                                (
-                                    "Error",
-                                    failed_message
-                                    if failed_message
-                                    else "No error details captured",
-                                    "red",
-                                ),
-                            ],
-                            service_status=status_by_service,
-                        )
-                    )
-                    break
-
-                status_by_service[service.name] = "tagging latest"
-                last_update = f"Tagging latest image for {service.name}"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Push",
-                        summary_rows=[
-                            ("Phase", "Pushing service images", "cyan"),
-                            ("Registry", registry, "white"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "white"),
-                        ],
-                        service_status=status_by_service,
+                        f"promoted ({promoted_tag} + latest)"
                     )
-                )
+                    last_update = f"Promoted {service.name}"
+                    last_update_style = "green"
+                live.update(render())
+
+    for name, copied in copied_layers_by_service.items():
+        console.print(
+            f"[yellow]{name}: registry declined {copied} layer mount(s); "
+            "copied them through this machine instead[/yellow]"
+        )
+
+    if failures:
+        for failed_step, code, message in failures:
+            console.print(
+                f"[red]Promotion failed for {failed_step} with exit code {code}[/red]"
+            )
+            if message:
+                console.print(f"[red]{message}[/red]")
+        raise SystemExit(failures[0][1])
+
+    console.print(f"[green]✓ Promoted images from {from_env} to {to_env}[/green]")
+
+
+_MANIFEST_MEDIA_TYPES = [
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+]
+_IMMUTABLE_TAG = re.compile(r"^build-\d{14}$")
+
+
+def _promote_service_image(
+    config: ProjectConfig,
+    service: ServiceConfig,
+    *,
+    ecr,
+    registry: str,
+    from_env: str,
+    to_env: str,
+    source_tag: str,
+    fallback_tag: str,
+    status_by_service: dict[str, str],
+    copied_layers_by_service: dict[str, int],
+) -> str:
+    """Copy one service image between repos and return its immutable tag.
+
+    Blobs the registry refused to mount are counted in
+    ``copied_layers_by_service`` so the caller can report the slow path.
+    """
+    source_repo = ecr_repo_name(config.project_name, from_env, service.name)
+    target_repo = ecr_repo_name(config.project_name, to_env, service.name)
+
+    status_by_service[service.name] = f"resolving {source_tag}"
+    images = ecr.batch_get_image(
+        repositoryName=source_repo,
+        imageIds=[{"imageTag": source_tag}],
+        acceptedMediaTypes=_MANIFEST_MEDIA_TYPES,
+    ).get("images", [])
+    if not images:
+        raise ValueError(f"{source_repo}:{source_tag} not found")
+    root = images[0]
+    digest = root["imageId"]["imageDigest"]
+
+    described = ecr.describe_images(
+        repositoryName=source_repo, imageIds=[{"imageDigest": digest}]
+    ).get("imageDetails", [])
+    source_tags = described[0].get("imageTags", []) if described else []
+    immutable_tag = next(
+        (item for item in source_tags if _IMMUTABLE_TAG.match(item)),
+        source_tag if _IMMUTABLE_TAG.match(source_tag) else fallback_tag,
+    )
+
+    _replicate_image(
+        ecr,
+        registry=registry,
+        region=config.aws_region,
+        source_repo=source_repo,
+        target_repo=target_repo,
+        root=root,
+        service_name=service.name,
+        status_by_service=status_by_service,
+        copied_layers_by_service=copied_layers_by_service,
+    )
+    _put_image_tags(
+        ecr,
+        target_repo,
+        {**root, "imageId": {"imageDigest": digest}},
+        [immutable_tag, "latest"],
+    )
+    return immutable_tag
+
+
+def _replicate_image(
+    ecr,
+    *,
+    registry: str,
+    region: str,
+    source_repo: str,
+    target_repo: str,
+    root: dict,
+    service_name: str,
+    status_by_service: dict[str, str],
+    copied_layers_by_service: dict[str, int],
+) -> None:
+    """Make *root*, an image from *source_repo*, taggable in *target_repo*.
+
+    Missing blobs are mounted across repositories (falling back to a layer
+    copy) and child manifests of an index are written; the caller then tags
+    the root manifest with ``_put_image_tags``.
+    """
+    # Child manifests of an index must exist in the target before the index.
+    children: list[dict] = []
+    root_manifest = json.loads(root["imageManifest"])
+    child_digests = [item["digest"] for item in root_manifest.get("manifests", [])]
+    if child_digests:
+        children = ecr.batch_get_image(
+            repositoryName=source_repo,
+            imageIds=[{"imageDigest": child} for child in child_digests],
+            acceptedMediaTypes=_MANIFEST_MEDIA_TYPES,
+        ).get("images", [])
+
+    blobs: list[str] = []
+    for image in [root, *children]:
+        for blob in _manifest_blobs(json.loads(image["imageManifest"])):
+            if blob not in blobs:
+                blobs.append(blob)
 
-                tag_latest_result = _run_quiet(
-                    ["docker", "tag", immutable_remote_tag, latest_remote_tag]
+    missing: list[str] = []
+    for start in range(0, len(blobs), 100):
+        availability = ecr.batch_check_layer_availability(
+            repositoryName=target_repo, layerDigests=blobs[start : start + 100]
+        )
+        missing.extend(
+            layer["layerDigest"]
+            for layer in availability.get("layers", [])
+            if layer.get("layerAvailability") != "AVAILABLE"
+        )
+        missing.extend(
+            failure["layerDigest"] for failure in availability.get("failures", [])
+        )
+
+    if missing:
+        credentials = ecr_credentials(registry.split(".", 1)[0], region)
+        for index, blob in enumerate(missing, start=1):
+            status_by_service[service_name] = (
+                f"mounting layers ({index}/{len(missing)})"
+            )
+            if not _mount_blob(registry, credentials, source_repo, target_repo, blob):
+                status_by_service[service_name] = (
+                    f"copying layer {index}/{len(missing)} ({_short_image_id(blob)})"
                 )
-                if tag_latest_result.returncode != 0:
-                    status_by_service[service.name] = (
-                        f"failed tagging latest (exit {tag_latest_result.returncode})"
-                    )
-                    failed_code = tag_latest_result.returncode
-                    failed_message = _tail_stderr(tag_latest_result.stderr)
-                    live.update(
-                        _render_docker_live_view(
-                            title="Docker Push",
-                            summary_rows=[
-                                ("Phase", "Pushing service images", "cyan"),
-                                ("Registry", registry, "white"),
-                                ("Current service", service.name, "cyan"),
-                                (
-                                    "Last update",
-                                    "Failed while tagging latest image",
-                                    "red",
-                                ),
-                                (
-                                    "Error",
-                                    failed_message
-                                    if failed_message
-                                    else "No error details captured",
-                                    "red",
-                                ),
-                            ],
-                            service_status=status_by_service,
-                        )
-                    )
-                    break
-
-                status_by_service[service.name] = "pushing latest"
-                last_update = f"Pushing latest image for {service.name}"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Push",
-                        summary_rows=[
-                            ("Phase", "Pushing service images", "cyan"),
-                            ("Registry", registry, "white"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "white"),
-                        ],
-                        service_status=status_by_service,
-                    )
+                _copy_blob(ecr, source_repo, target_repo, blob)
+                copied_layers_by_service[service_name] = (
+                    copied_layers_by_service.get(service_name, 0) + 1
                 )
 
-                push_latest_result = _run_quiet(["docker", "push", latest_remote_tag])
-                if push_latest_result.returncode != 0:
-                    status_by_service[service.name] = (
-                        f"failed pushing latest (exit {push_latest_result.returncode})"
-                    )
-                    failed_code = push_latest_result.returncode
-                    failed_message = _tail_stderr(push_latest_result.stderr)
-                    live.update(
-                        _render_docker_live_view(
-                            title="Docker Push",
-                            summary_rows=[
-                                ("Phase", "Pushing service images", "cyan"),
-                                ("Registry", registry, "white"),
-                                ("Current service", service.name, "cyan"),
-                                ("Last update", "Latest push failed", "red"),
-                                (
-                                    "Error",
-                                    failed_message
-                                    if failed_message
-                                    else "No error details captured",
-                                    "red",
-                                ),
-                            ],
-                            service_status=status_by_service,
-                        )
-                    )
-                    break
-
-                status_by_service[service.name] = "pushed latest + immutable"
-                last_update = f"Pushed {service.name}"
-                live.update(
-                    _render_docker_live_view(
-                        title="Docker Push",
-                        summary_rows=[
-                            ("Phase", "Pushing service images", "cyan"),
-                            ("Registry", registry, "white"),
-                            ("Immutable tag", immutable_tag, "white"),
-                            ("Current service", service.name, "cyan"),
-                            ("Last update", last_update, "green"),
-                        ],
-                        service_status=status_by_service,
-                    )
-                )
+    status_by_service[service_name] = "tagging in ECR"
+    for child in children:
+        kwargs: dict[str, str] = {
+            "repositoryName": target_repo,
+            "imageManifest": child["imageManifest"],
+            "imageDigest": child["imageId"]["imageDigest"],
+        }
+        if child.get("imageManifestMediaType"):
+            kwargs["imageManifestMediaType"] = child["imageManifestMediaType"]
+        try:
+            ecr.put_image(**kwargs)
+        except ClientError as exc:
+            code = str(exc.response.get("Error", {}).get("Code", ""))
+            if code != "ImageAlreadyExistsException":
+                raise
 
-    if failed_code is not None:
-        console.print(f"[red]Push failed with exit code {failed_code}[/red]")
-        if failed_message:
-            console.print(f"[red]{failed_message}[/red]")
-        raise SystemExit(failed_code)
 
-    console.print("[green]✓ Docker push completed[/green]")
+def _manifest_blobs(manifest: dict) -> list[str]:
+    blobs: list[str] = []
+    config_blob = manifest.get("config", {}).get("digest")
+    if config_blob:
+        blobs.append(config_blob)
+    blobs.extend(layer["digest"] for layer in manifest.get("layers", []))
+    return blobs
+
+
+def _mount_blob(
+    registry: str,
+    credentials: EcrCredentials,
+    source_repo: str,
+    target_repo: str,
+    digest: str,
+) -> bool:
+    """Ask the registry to mount *digest* from *source_repo* into *target_repo*.
+
+    Returns False when the registry declines the mount, in which case the
+    caller has to copy the blob. A declined mount answers 202 with a fresh
+    upload session; that session is cancelled so it does not linger.
+    """
+    query = urllib.parse.urlencode({"mount": digest, "from": source_repo})
+    auth = base64.b64encode(
+        f"{credentials.username}:{credentials.password}".encode()
+    ).decode()
+    url = f"https://{registry}/v2/{target_repo}/blobs/uploads/?{query}"
+    request = urllib.request.Request(
+        url,
+        data=b"",
+        method="POST",
+        headers={"Authorization": f"Basic {auth}"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            if response.status == 201:
+                return True
+            location = response.headers.get("Location")
+    except urllib.error.HTTPError:
+        return False
+    if location:
+        _cancel_blob_upload(urllib.parse.urljoin(url, location), auth)
+    return False
+
+
+def _cancel_blob_upload(upload_url: str, auth: str) -> None:
+    request = urllib.request.Request(
+        upload_url, method="DELETE", headers={"Authorization": f"Basic {auth}"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30):
+            pass
+    except OSError:
+        # The registry expires abandoned sessions on its own eventually.
+        pass
+
+
+def _copy_blob(ecr, source_repo: str, target_repo: str, digest: str) -> None:
+    """Stream a blob from *source_repo* into *target_repo* via the layer API."""
+    download_url = ecr.get_download_url_for_layer(
+        repositoryName=source_repo, layerDigest=digest
+    )["downloadUrl"]
+    upload = ecr.initiate_layer_upload(repositoryName=target_repo)
+    part_size = int(upload.get("partSize") or 20 * 1024 * 1024)
+    offset = 0
+    with urllib.request.urlopen(download_url, timeout=300) as response:
+        while chunk := response.read(part_size):
+            ecr.upload_layer_part(
+                repositoryName=target_repo,
+                uploadId=upload["uploadId"],
+                partFirstByte=offset,
+                partLastByte=offset + len(chunk) - 1,
+                layerPartBlob=chunk,
+            )
+            offset += len(chunk)
+    try:
+        ecr.complete_layer_upload(
+            repositoryName=target_repo,
+            uploadId=upload["uploadId"],
+            layerDigests=[digest],
+        )
+    except ClientError as exc:
+        code = str(exc.response.get("Error", {}).get("Code", ""))
+        if code != "LayerAlreadyExistsException":
+            raise
+
+
+@dataclass
+class _PushProgress:
+    """Per-layer progress parsed from ``docker push`` output.
+
+    Byte counts only appear in the progress bars docker prints to a terminal
+    (see ``_run_streaming(pseudo_tty=True)``); plain piped output reports
+    layer states only.
+    """
+
+    layer_status: dict[str, str] = field(default_factory=dict)
+    layer_bytes_done: dict[str, float] = field(default_factory=dict)
+    layer_bytes_total: dict[str, float] = field(default_factory=dict)
+    digest: str = ""
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        digest_match = _PUSH_DIGEST_LINE.search(line)
+        if digest_match:
+            self.digest = digest_match.group("digest")
+            return
+
+        layer_match = _PUSH_LAYER_LINE.match(line)
+        if not layer_match:
+            return
+        layer = layer_match.group("layer")
+        status = layer_match.group("status").strip()
+        self.layer_status[layer] = status
+
+        bytes_match = _PUSH_BYTES.search(status)
+        if bytes_match:
+            self.layer_bytes_done[layer] = _parse_docker_size(bytes_match.group("done"))
+            self.layer_bytes_total[layer] = _parse_docker_size(
+                bytes_match.group("total")
+            )
+        elif _is_layer_done(status) and layer in self.layer_bytes_total:
+            self.layer_bytes_done[layer] = self.layer_bytes_total[layer]
+
+    def describe(self) -> str:
+        total_layers = len(self.layer_status)
+        if not total_layers:
+            return "preparing"
+        done_layers = sum(
+            1 for status in self.layer_status.values() if _is_layer_done(status)
+        )
+        summary = f"{done_layers}/{total_layers} layers"
+        total_bytes = sum(self.layer_bytes_total.values())
+        if total_bytes:
+            done_bytes = sum(self.layer_bytes_done.values())
+            summary = (
+                f"{summary}, {_format_bytes(done_bytes)}/{_format_bytes(total_bytes)}"
+            )
+        return summary
+
+
+_PUSH_LAYER_LINE = re.compile(r"^(?P<layer>[0-9a-f]{12,64}): (?P<status>.+)$")
+_PUSH_BYTES = re.compile(
+    r"(?P<done>\d+(?:\.\d+)?\s*[kKMGT]?B)\s*/\s*(?P<total>\d+(?:\.\d+)?\s*[kKMGT]?B)"
+)
+_PUSH_DIGEST_LINE = re.compile(r"digest: (?P<digest>sha256:[0-9a-f]{64})")
+_SIZE_MULTIPLIERS = {"": 1, "k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9, "T": 1e12}
+
+
+def _is_layer_done(status: str) -> bool:
+    return (
+        status == "Pushed"
+        or status == "Layer already exists"
+        or status.startswith("Mounted from")
+    )
+
+
+def _parse_docker_size(value: str) -> float:
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([kKMGT]?)B", value.strip())
+    if not match:
+        return 0.0
+    return float(match.group(1)) * _SIZE_MULTIPLIERS[match.group(2)]
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "kB", "MB", "GB"):
+        if value < 1000:
+            return f"{value:.1f}{unit}" if unit != "B" else f"{int(value)}B"
+        value /= 1000
+    return f"{value:.1f}TB"
 
 
 def local_image_tag(project_name: str, service_name: str) -> str:
@@ -466,6 +1883,43 @@ def ecr_registry_uri(account_id: str, region: str) -> str:
     return f"{account_id}.dkr.ecr.{region}.amazonaws.com"
 
 
+def resolve_ecr_registry(config: ProjectConfig) -> str:
+    """Return the ECR registry host for the caller's account and project region."""
+    account = aws_client("sts").get_caller_identity()["Account"]
+    return ecr_registry_uri(account, config.aws_region)
+
+
+def ecr_docker_login(
+    config: ProjectConfig, registry: str
+) -> subprocess.CompletedProcess[str]:
+    """Log the local docker client in to *registry*.
+
+    Uses a cached ECR authorization token and skips ``docker login`` when this
+    process already logged in to *registry* with the same token.
+    """
+    account = registry.split(".", 1)[0]
+    try:
+        credentials = ecr_credentials(account, config.aws_region)
+    except (BotoCoreError, ClientError) as exc:
+        return subprocess.CompletedProcess(["docker", "login", registry], 1, "", str(exc))
+
+    login_cmd = [
+        "docker",
+        "login",
+        "--username",
+        credentials.username,
+        "--password-stdin",
+        registry,
+    ]
+    with _docker_login_lock:
+        if _docker_logins.get(registry) == credentials.password:
+            return subprocess.CompletedProcess(login_cmd, 0, "", "")
+        result = _run_quiet(login_cmd, input_text=credentials.password)
+        if result.returncode == 0:
+            _docker_logins[registry] = credentials.password
+    return result
+
+
 def ecr_repo_name(project_name: str, env_name: str, service_name: str) -> str:
     return f"{project_name}/{env_name}/{service_name}"
 
@@ -497,17 +1951,119 @@ def _run_quiet(
     *,
     cwd: Path | None = None,
     shell: bool = False,
+    input_text: str | None = None,
 ) -> subprocess.CompletedProcess[str]:
     return subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
         shell=shell,
+        input=input_text,
         text=True,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
     )
 
 
+def _run_capture(
+    cmd: list[str],
+    *,
+    cwd: Path | None = None,
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        text=True,
+        capture_output=True,
+    )
+
+
+def _run_streaming(
+    cmd: list[str],
+    *,
+    on_line: Callable[[str], None],
+    cwd: Path | None = None,
+    tail_lines: int = 50,
+    pseudo_tty: bool = False,
+) -> subprocess.CompletedProcess[str]:
+    """Run *cmd*, feeding each merged stdout/stderr line to *on_line*.
+
+    With ``pseudo_tty`` (POSIX only) the command writes to a pseudo-terminal,
+    so tools like ``docker push`` print their in-place progress bars; those
+    ``\r``-delimited updates are split into lines and stripped of cursor
+    escapes. Only the last ``tail_lines`` lines are kept and returned as
+    ``stderr`` so ``_tail_stderr`` works the same as for ``_run_quiet``.
+    """
+    tail: deque[str] = deque(maxlen=tail_lines)
+
+    def emit(line: str) -> None:
+        tail.append(line)
+        on_line(line)
+
+    if pseudo_tty and os.name == "posix":
+        returncode = _stream_pty(cmd, cwd=cwd, emit=emit)
+        return subprocess.CompletedProcess(cmd, returncode, "", "\n".join(tail))
+
+    process = subprocess.Popen(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    assert process.stdout is not None
+    for line in process.stdout:
+        emit(line)
+    returncode = process.wait()
+    return subprocess.CompletedProcess(cmd, returncode, "", "".join(tail))
+
+
+_TERMINAL_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+_TERMINAL_LINE_BREAK = re.compile(r"[\r\n]")
+
+
+def _stream_pty(
+    cmd: list[str], *, cwd: Path | None, emit: Callable[[str], None]
+) -> int:
+    import pty
+
+    primary_fd, secondary_fd = pty.openpty()
+    try:
+        process = subprocess.Popen(
+            cmd,
+            cwd=str(cwd) if cwd else None,
+            stdin=subprocess.DEVNULL,
+            stdout=secondary_fd,
+            stderr=secondary_fd,
+        )
+    finally:
+        os.close(secondary_fd)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    try:
+        while True:
+            try:
+                chunk = os.read(primary_fd, 65536)
+            except OSError:
+                # Linux reports EIO once the child has closed the terminal.
+                break
+            if not chunk:
+                break
+            *lines, pending = _TERMINAL_LINE_BREAK.split(
+                pending + decoder.decode(chunk)
+            )
+            for line in lines:
+                line = _TERMINAL_ESCAPE.sub("", line)
+                if line.strip():
+                    emit(line)
+        pending = _TERMINAL_ESCAPE.sub("", pending + decoder.decode(b"", final=True))
+        if pending.strip():
+            emit(pending)
+    finally:
+        os.close(primary_fd)
+    return process.wait()
+
+
 def _tail_stderr(stderr: str | None, *, max_lines: int = 5) -> str:
     if not stderr:
         return ""
@@ -521,11 +2077,26 @@ def _status_style(value: str) -> str:
     lowered = value.lower()
     if "failed" in lowered:
         return "red"
-    if "pushed" in lowered or "built" in lowered:
+    if (
+        "pushed" in lowered
+        or "built" in lowered
+        or "unchanged" in lowered
+        or "promoted" in lowered
+    ):
         return "green"
-    if "skipped" in lowered:
+    if "skipped" in lowered or "cancelled" in lowered:
         return "dim"
-    if "building" in lowered or "pushing" in lowered or "tagging" in lowered:
+    if (
+        "building" in lowered
+        or "pushing" in lowered
+        or "tagging" in lowered
+        or "hashing" in lowered
+        or "checking" in lowered
+        or "retagging" in lowered
+        or "resolving" in lowered
+        or "mounting" in lowered
+        or "copying" in lowered
+    ):
         return "yellow"
     return "white"
 
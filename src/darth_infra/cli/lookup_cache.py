@@ -0,0 +1,67 @@
+"""On-disk TTL cache for deploy lookups that rarely change."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from .build_manifest import STATE_DIR
+
+CACHE_DIR = STATE_DIR / "cache"
+LOOKUP_CACHE_FILENAME = "lookups.json"
+DEFAULT_LOOKUP_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+
+class LookupCache:
+    """Cache of resolved network/shared-ALB/Cloud Map lookups.
+
+    Stored at ``.darth-infra/cache/lookups.json``. Entries are keyed by the
+    caller (account, region and the config fields that drive the lookups)
+    and expire after ``ttl_seconds``. With ``refresh`` every read misses,
+    but fresh results are still written back.
+    """
+
+    def __init__(
+        self,
+        project_dir: Path,
+        *,
+        ttl_seconds: int = DEFAULT_LOOKUP_CACHE_TTL_SECONDS,
+        refresh: bool = False,
+    ) -> None:
+        self.path = project_dir / CACHE_DIR / LOOKUP_CACHE_FILENAME
+        self.ttl_seconds = ttl_seconds
+        self.refresh = refresh
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if self.refresh or self.ttl_seconds <= 0:
+            return None
+        entry = self._read().get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("data"), dict):
+            return None
+        stored_at = entry.get("stored_at")
+        if not isinstance(stored_at, (int, float)):
+            return None
+        if time.time() - stored_at > self.ttl_seconds:
+            return None
+        return entry["data"]
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        entries = self._read()
+        entries[key] = {"stored_at": time.time(), "data": data}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(entries, indent=2) + "\n")
+
+    def invalidate(self) -> None:
+        """Drop every cached lookup, e.g. after a resource-existence failure."""
+        self.path.unlink(missing_ok=True)
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
@@ -6,6 +6,7 @@ from .init_cmd import init_cmd
 from .deploy_cmd import deploy
 from .build_cmd import build
 from .push_cmd import push
+from .promote_cmd import promote
 from .logs_cmd import logs
 from .exec_cmd import exec_cmd
 from .secret_cmd import secret_cmd
@@ -25,6 +26,7 @@ cli.add_command(init_cmd, name="tui")
 cli.add_command(deploy)
 cli.add_command(build)
 cli.add_command(push)
+cli.add_command(promote)
 cli.add_command(logs)
 cli.add_command(exec_cmd, name="exec")
 cli.add_command(secret_cmd)
@@ -0,0 +1,106 @@
+"""Adaptive polling for long-running CloudFormation operations."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from botocore.exceptions import ClientError
+
+_THROTTLING_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestLimitExceeded",
+        "TooManyRequestsException",
+    }
+)
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    """Return True when *exc* is an AWS API throttling error."""
+    if not isinstance(exc, ClientError):
+        return False
+    return str(exc.response.get("Error", {}).get("Code", "")) in _THROTTLING_CODES
+
+
+class AdaptivePoller:
+    """Decide how long to wait between polls of an AWS operation.
+
+    Polling starts at ``min_interval`` and grows by ``backoff`` for every poll
+    that observes no change, up to ``max_interval``. A state change drops the
+    interval back to ``min_interval`` (things are moving, so look again soon);
+    throttling doubles it, up to twice ``max_interval``. Callers may report a
+    ``progress`` fraction so that ``remaining_seconds`` can be estimated.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        backoff: float = 1.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.interval = min_interval
+        self.polls = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._started = clock()
+        self._last_state: object = None
+        self._progress: float | None = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._clock() - self._started
+
+    @property
+    def remaining_seconds(self) -> float | None:
+        if not self._progress or self._progress >= 1:
+            return None
+        return self.elapsed_seconds * (1 - self._progress) / self._progress
+
+    def observe(self, state: object, *, progress: float | None = None) -> bool:
+        """Record the latest polled *state*; return True when it changed."""
+        self.polls += 1
+        if progress is not None:
+            self._progress = min(max(progress, 0.0), 1.0)
+        changed = self.polls == 1 or state != self._last_state
+        self._last_state = state
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changed
+
+    def throttled(self) -> None:
+        """Back off harder after the API reported throttling."""
+        self.interval = min(max(self.interval, self.min_interval) * 2, self.max_interval * 2)
+
+    def wait(self) -> None:
+        self._sleep(self.interval)
+
+    def describe(self) -> str:
+        """Human-readable elapsed (and estimated remaining) time."""
+        text = f"{_format_seconds(self.elapsed_seconds)} elapsed"
+        remaining = self.remaining_seconds
+        if remaining is not None:
+            text += f", ~{_format_seconds(remaining)} remaining"
+        return text
+
+
+def _format_seconds(seconds: float) -> str:
+    total = int(round(seconds))
+    minutes, secs = divmod(total, 60)
+    if minutes >= 60:
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
@@ -0,0 +1,62 @@
+"""``darth-infra promote`` — copy images between environments without rebuilding."""
+
+from __future__ import annotations
+
+import click
+
+from .helpers import console, require_config
+from .image_ops import promote_images
+
+
+@click.command()
+@click.option(
+    "--from",
+    "from_env",
+    required=True,
+    help="Environment whose ECR images are promoted (e.g. prod).",
+)
+@click.option(
+    "--to",
+    "to_env",
+    required=True,
+    help="Environment that receives the images (e.g. feature-xyz).",
+)
+@click.option(
+    "--tag",
+    default=None,
+    help="Source image tag to promote (e.g. build-20260101120000). Defaults to latest.",
+)
+@click.option(
+    "--service",
+    "service_name",
+    default=None,
+    help="Promote only a specific service. Promotes all if omitted.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum concurrent service promotions. Defaults to 4.",
+)
+def promote(
+    from_env: str,
+    to_env: str,
+    tag: str | None,
+    service_name: str | None,
+    jobs: int | None,
+) -> None:
+    """Copy service images from one environment's ECR repositories to another's."""
+    config, _ = require_config()
+    for env_name in (from_env, to_env):
+        if env_name not in config.environments:
+            console.print(
+                f"[red]Environment '{env_name}' not found in darth-infra.toml. "
+                f"Available: {', '.join(config.environments)}[/red]"
+            )
+            raise SystemExit(1)
+    if from_env == to_env:
+        console.print("[red]--from and --to must be different environments.[/red]")
+        raise SystemExit(1)
+
+    promote_images(config, from_env, to_env, service_name, tag=tag, jobs=jobs)
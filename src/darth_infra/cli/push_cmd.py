@@ -21,7 +21,14 @@ from .image_ops import push_images
     default=None,
     help="Push only a specific service. Pushes all if omitted.",
 )
-def push(env_name: str, service_name: str | None) -> None:
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum concurrent service pushes. Defaults to 4.",
+)
+def push(env_name: str, service_name: str | None, jobs: int | None) -> None:
     """Tag and push Docker images to ECR."""
     config, _ = require_config()
-    push_images(config, env_name, service_name)
+    push_images(config, env_name, service_name, jobs=jobs)
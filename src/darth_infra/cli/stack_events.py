@@ -0,0 +1,180 @@
+"""Incremental CloudFormation stack event reading for the deploy monitor."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+# Safety net for runaway pagination on very old stacks; each page holds up to
+# 100 events and the cursor normally stops us after the first page.
+_MAX_PAGES_PER_READ = 50
+_DEFAULT_DEDUPE_WINDOW = timedelta(minutes=30)
+
+
+class RecentKeys:
+    """Bounded, time-windowed "have I seen this?" set.
+
+    Keys are remembered together with their event timestamp and forgotten
+    once they fall more than ``window`` behind the newest timestamp seen.
+    Events older than that horizon are treated as already seen, so memory
+    stays proportional to the window rather than to the deploy length.
+    """
+
+    def __init__(self, window: timedelta = _DEFAULT_DEDUPE_WINDOW) -> None:
+        self.window = window
+        self._keys: dict[str, datetime] = {}
+        self._newest: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, timestamp: datetime) -> bool:
+        """Record *key*; return True when it had not been seen before."""
+        timestamp = _aware(timestamp)
+        if self._newest is not None and timestamp < self._newest - self.window:
+            return False
+        if key in self._keys:
+            return False
+        self._keys[key] = timestamp
+        if self._newest is None or timestamp > self._newest:
+            self._newest = timestamp
+            horizon = timestamp - self.window
+            for stale in [k for k, seen in self._keys.items() if seen < horizon]:
+                del self._keys[stale]
+        return True
+
+
+@dataclass
+class _TrackedStack:
+    stack_id: str
+    label: str
+    cursor: str | None = None
+    active: bool = True
+    last_status: str = "UPDATE_IN_PROGRESS"
+
+
+@dataclass
+class StackEventReader:
+    """Read each stack event exactly once, across a stack and its nested stacks.
+
+    Every ``read_new`` call pages ``describe_stack_events`` backward (newest
+    first) only until it reaches the last event returned for that stack, or an
+    event older than ``since``. Nested stacks are picked up from their parent's
+    events while they are being updated and skipped once the parent reports
+    them finished.
+
+    Attributes:
+        cf: CloudFormation client.
+        stack_name: Root stack name or ID.
+        since: Ignore events older than this (e.g. from previous deploys).
+        events_read: Total new events returned so far.
+        last_error: Error from the most recent ``read_new``, if any.
+    """
+
+    cf: Any
+    stack_name: str
+    since: datetime | None = None
+    events_read: int = 0
+    last_error: str = ""
+    _stacks: dict[str, _TrackedStack] = field(default_factory=dict)
+    _seen: RecentKeys = field(default_factory=RecentKeys)
+
+    def __post_init__(self) -> None:
+        self._stacks[self.stack_name] = _TrackedStack(
+            stack_id=self.stack_name, label=self.stack_name
+        )
+
+    def read_new(self) -> list[dict[str, Any]]:
+        """Return events that appeared since the last call, oldest first.
+
+        Nested stack events carry an extra ``"StackLabel"`` key holding the
+        parent's logical ID for that stack.
+        """
+        self.last_error = ""
+        new_events: list[dict[str, Any]] = []
+        pending = [tracked for tracked in self._stacks.values() if tracked.active]
+        read: set[str] = set()
+        while pending:
+            tracked = pending.pop(0)
+            read.add(tracked.stack_id)
+            is_nested = tracked.stack_id != self.stack_name
+            for event in self._read_stack(tracked):
+                if is_nested:
+                    event = {**event, "StackLabel": tracked.label}
+                new_events.append(event)
+                nested = self._track_nested_stack(event)
+                if nested and nested.stack_id not in read and nested not in pending:
+                    pending.append(nested)
+            # A finished nested stack is read one last time, then skipped
+            # until its parent starts updating it again.
+            if is_nested and "IN_PROGRESS" not in tracked.last_status:
+                tracked.active = False
+
+        new_events.sort(key=lambda event: _aware(_timestamp(event)))
+        self.events_read += len(new_events)
+        return new_events
+
+    def _read_stack(self, tracked: _TrackedStack) -> list[dict[str, Any]]:
+        """New events for one stack, oldest first."""
+        fetched: list[dict[str, Any]] = []
+        kwargs: dict[str, Any] = {"StackName": tracked.stack_id}
+        for _ in range(_MAX_PAGES_PER_READ):
+            try:
+                page = self.cf.describe_stack_events(**kwargs)
+            except ClientError as exc:
+                # Keep the cursor where it was; the next read resumes there.
+                self.last_error = str(exc)
+                return []
+            reached_known = False
+            for event in page.get("StackEvents", []):
+                event_id = str(event.get("EventId", "")).strip()
+                if not event_id:
+                    continue
+                if event_id == tracked.cursor or self._before_since(event):
+                    reached_known = True
+                    break
+                fetched.append(event)
+            next_token = page.get("NextToken")
+            if reached_known or not next_token:
+                break
+            kwargs["NextToken"] = next_token
+
+        if fetched:
+            tracked.cursor = str(fetched[0]["EventId"]).strip()
+        return [
+            event
+            for event in reversed(fetched)
+            if self._seen.add(str(event["EventId"]).strip(), _timestamp(event))
+        ]
+
+    def _track_nested_stack(self, event: dict[str, Any]) -> _TrackedStack | None:
+        if event.get("ResourceType") != "AWS::CloudFormation::Stack":
+            return None
+        physical_id = str(event.get("PhysicalResourceId", "")).strip()
+        if not physical_id.startswith("arn:") or physical_id == event.get("StackId"):
+            return None
+        tracked = self._stacks.get(physical_id)
+        if tracked is None:
+            tracked = _TrackedStack(
+                stack_id=physical_id,
+                label=str(event.get("LogicalResourceId", "nested")),
+            )
+            self._stacks[physical_id] = tracked
+        tracked.active = True
+        tracked.last_status = str(event.get("ResourceStatus", ""))
+        return tracked
+
+    def _before_since(self, event: dict[str, Any]) -> bool:
+        return self.since is not None and _aware(_timestamp(event)) < _aware(self.since)
+
+
+def _timestamp(event: dict[str, Any]) -> datetime:
+    value = event.get("Timestamp")
+    return value if isinstance(value, datetime) else datetime.min.replace(tzinfo=UTC)
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
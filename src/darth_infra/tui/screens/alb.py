@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import threading
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll
@@ -20,6 +19,7 @@ from textual.widgets import (
     Switch,
 )
 
+from ...aws_clients import aws_client
 from ..step_rail import StepRail
 
 
@@ -1223,7 +1223,7 @@ class AlbScreen(Screen):
 
     def _fetch_cloudfront_certificates_worker(self) -> None:
         try:
-            acm = boto3.client("acm", region_name="us-east-1")
+            acm = aws_client("acm", region_name="us-east-1")
             paginator = acm.get_paginator("list_certificates")
             summaries: list[dict[str, object]] = []
             for page in paginator.paginate(CertificateStatuses=["ISSUED"]):
@@ -1310,7 +1310,7 @@ class AlbScreen(Screen):
     ) -> None:
         try:
             existing = set(used)
-            elbv2 = boto3.client("elbv2", region_name=region)
+            elbv2 = aws_client("elbv2", region_name=region)
             resolved_listener_arn = listener_arn
             if not resolved_listener_arn:
                 if not alb_name:
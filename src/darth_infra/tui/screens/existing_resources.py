@@ -5,13 +5,13 @@ from __future__ import annotations
 import threading
 from typing import Any
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.screen import Screen
 from textual.widgets import Button, Input, Label, Select, SelectionList, Static
 
+from ...aws_clients import aws_client
 from ..step_rail import StepRail
 
 
@@ -130,7 +130,7 @@ class ExistingResourcesScreen(Screen):
         if not vpc_name:
             return None
 
-        ec2 = boto3.client("ec2", region_name=self._aws_region())
+        ec2 = aws_client("ec2", region_name=self._aws_region())
         vpcs = ec2.describe_vpcs(
             Filters=[{"Name": "tag:Name", "Values": [vpc_name]}]
         ).get("Vpcs", [])
@@ -160,7 +160,7 @@ class ExistingResourcesScreen(Screen):
 
     def _fetch_subnets_worker(self, vpc_id: str) -> None:
         try:
-            ec2 = boto3.client("ec2", region_name=self._aws_region())
+            ec2 = aws_client("ec2", region_name=self._aws_region())
             subnets = ec2.describe_subnets(
                 Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
             ).get("Subnets", [])
@@ -244,7 +244,7 @@ class ExistingResourcesScreen(Screen):
 
     def _fetch_albs_worker(self) -> None:
         try:
-            elbv2 = boto3.client("elbv2", region_name=self._aws_region())
+            elbv2 = aws_client("elbv2", region_name=self._aws_region())
             paginator = elbv2.get_paginator("describe_load_balancers")
             entries: list[tuple[str, str, dict[str, Any]]] = []
             for page in paginator.paginate():
@@ -313,7 +313,7 @@ class ExistingResourcesScreen(Screen):
 
     def _fetch_alb_details_worker(self, alb_arn: str) -> None:
         try:
-            elbv2 = boto3.client("elbv2", region_name=self._aws_region())
+            elbv2 = aws_client("elbv2", region_name=self._aws_region())
             listeners = elbv2.describe_listeners(LoadBalancerArn=alb_arn).get(
                 "Listeners", []
             )
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import threading
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
 from textual.app import ComposeResult
@@ -22,6 +21,7 @@ from textual.widgets import (
     Static,
 )
 
+from ...aws_clients import aws_client
 from ..step_rail import StepRail
 
 
@@ -345,7 +345,7 @@ class SecretsScreen(Screen):
     def _fetch_existing_secrets_worker(self) -> None:
         region = str(self._state.get("aws_region", "us-east-1"))
         try:
-            sm = boto3.client("secretsmanager", region_name=region)
+            sm = aws_client("secretsmanager", region_name=region)
             paginator = sm.get_paginator("list_secrets")
             records: list[dict[str, str]] = []
             for page in paginator.paginate():
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import threading
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Vertical, VerticalScroll
@@ -23,6 +22,7 @@ from textual.widgets import (
     TextArea,
 )
 
+from ...aws_clients import aws_client
 from ..step_rail import StepRail
 
 
@@ -849,7 +849,7 @@ class ServicesScreen(Screen):
 
     def _fetch_shared_alb_worker(self, aws_region: str, shared_alb_name: str) -> None:
         try:
-            elbv2 = boto3.client("elbv2", region_name=aws_region)
+            elbv2 = aws_client("elbv2", region_name=aws_region)
             lbs = elbv2.describe_load_balancers(Names=[shared_alb_name]).get(
                 "LoadBalancers", []
             )
@@ -1183,7 +1183,7 @@ class ServicesScreen(Screen):
             existing = set(used)
             if mode == "shared":
                 listener_arn = shared_listener_arn
-                elbv2 = boto3.client("elbv2", region_name=aws_region)
+                elbv2 = aws_client("elbv2", region_name=aws_region)
                 if not listener_arn:
                     if not shared_alb_name:
                         raise RuntimeError(
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import threading
+
+from darth_infra import aws_clients
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.created: list[tuple[str, str | None, object]] = []
+
+    def client(self, service_name, region_name=None, config=None):
+        self.created.append((service_name, region_name, config))
+        return object()
+
+
+def test_aws_client_reuses_one_client_per_service_and_region(monkeypatch) -> None:
+    session = FakeSession()
+    monkeypatch.setattr(aws_clients, "_session", session)
+    monkeypatch.setattr(aws_clients, "_clients", {})
+
+    results: list[object] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                aws_clients.aws_client("cloudformation", region_name="us-east-1")
+            )
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other_region = aws_clients.aws_client("cloudformation", region_name="eu-west-1")
+
+    assert len({id(client) for client in results}) == 1
+    assert other_region is not results[0]
+    assert [(name, region) for name, region, _ in session.created] == [
+        ("cloudformation", "us-east-1"),
+        ("cloudformation", "eu-west-1"),
+    ]
+    config = session.created[0][2]
+    assert config.retries == {"max_attempts": 10, "mode": "adaptive"}
+    assert config.max_pool_connections == aws_clients.MAX_POOL_CONNECTIONS
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from darth_infra.cli import build_context
+from darth_infra.cli.build_context import (
+    DockerIgnore,
+    analyze_context,
+    hash_context,
+    walk_context,
+)
+
+
+def test_dockerignore_matches_directories_and_exceptions() -> None:
+    ignore = DockerIgnore(
+        [
+            "# comment",
+            "node_modules",
+            "**/*.pyc",
+            "/.git",
+            "*.md",
+            "!README.md",
+        ]
+    )
+    assert ignore.matches("node_modules")
+    assert ignore.matches("node_modules/react/index.js")
+    assert ignore.matches("app/deep/mod.pyc")
+    assert ignore.matches(".git/config")
+    assert ignore.matches("CHANGELOG.md")
+    assert not ignore.matches("README.md")
+    assert not ignore.matches("docs/guide.md")
+    assert not ignore.matches("app/main.py")
+
+
+def test_dockerignore_does_not_prune_directories_with_reincluded_children() -> None:
+    ignore = DockerIgnore(["vendor", "!vendor/keep.txt"])
+    assert not ignore.can_prune("vendor")
+    assert ignore.matches("vendor/drop.txt")
+    assert not ignore.matches("vendor/keep.txt")
+    assert DockerIgnore(["vendor"]).can_prune("vendor")
+
+
+def test_walk_and_hash_context_respect_ignore_and_cache(tmp_path: Path) -> None:
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('hi')\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+    ignore = DockerIgnore(["node_modules"])
+
+    files = walk_context(tmp_path, ignore)
+    assert [item.path for item in files] == ["app/main.py"]
+
+    cache: dict[str, list[object]] = {}
+    first = hash_context(tmp_path, files, file_cache=cache)
+    assert list(cache) == ["app/main.py"]
+    assert hash_context(tmp_path, files, file_cache=cache) == first
+
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("changed")
+    assert hash_context(tmp_path, walk_context(tmp_path, ignore)) == first
+
+    (tmp_path / "app" / "main.py").write_text("print('changed')\n")
+    changed = hash_context(tmp_path, walk_context(tmp_path, ignore), file_cache=cache)
+    assert changed != first
+
+
+def test_walk_context_spreads_one_deep_directory_across_workers(
+    tmp_path: Path, monkeypatch
+) -> None:
+    for name in ("a", "b"):
+        (tmp_path / "node_modules" / name / "lib").mkdir(parents=True)
+        (tmp_path / "node_modules" / name / "lib" / "index.js").write_text(name)
+    (tmp_path / "node_modules" / "a" / "cache").mkdir()
+    (tmp_path / "node_modules" / "a" / "cache" / "blob").write_text("x")
+    (tmp_path / "Dockerfile").write_text("FROM scratch\n")
+
+    # Both package dirs sit under a single top-level dir; they can only
+    # meet at the barrier if they are scanned concurrently.
+    barrier = threading.Barrier(2, timeout=5)
+    scandir_sorted = build_context._scandir_sorted
+
+    def scandir_meeting_at_barrier(path: Path):
+        if path.parent.name == "node_modules":
+            barrier.wait()
+        return scandir_sorted(path)
+
+    monkeypatch.setattr(build_context, "_scandir_sorted", scandir_meeting_at_barrier)
+
+    files = walk_context(tmp_path, DockerIgnore(["**/cache"]), jobs=4)
+
+    assert [item.path for item in files] == [
+        "Dockerfile",
+        "node_modules/a/lib/index.js",
+        "node_modules/b/lib/index.js",
+    ]
+
+
+def test_analyze_context_reports_heavy_dirs_and_suggestions(tmp_path: Path) -> None:
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_bytes(b"x" * 100)
+    (tmp_path / "node_modules" / "react").mkdir(parents=True)
+    (tmp_path / "node_modules" / "react" / "index.js").write_bytes(b"x" * 5000)
+    (tmp_path / "frontend" / "node_modules").mkdir(parents=True)
+    (tmp_path / "frontend" / "node_modules" / "dep.js").write_bytes(b"x" * 300)
+    (tmp_path / "dump.sql").write_bytes(b"x" * (11 * 1024 * 1024))
+    (tmp_path / ".dockerignore").write_text("app/main.py\n")
+
+    files = walk_context(tmp_path, DockerIgnore.for_build(tmp_path, "Dockerfile", "."))
+    report = analyze_context(files)
+
+    assert report.file_count == 4
+    assert report.total_bytes == 11 * 1024 * 1024 + 5300 + len("app/main.py\n")
+    assert report.largest_dirs[0] == ("node_modules", 5000, 1)
+    assert [entry for entry, _ in report.suggestions] == [
+        "dump.sql",
+        "node_modules",
+        "**/node_modules",
+    ]
+    assert report.estimated_transfer_seconds > 0
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+
+from darth_infra.cli.cfn_package import package_nested_templates
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.puts: list[str] = []
+        self._lock = threading.Lock()
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        with self._lock:
+            if Key not in self.objects:
+                raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, ContentType: str) -> None:
+        with self._lock:
+            self.objects[Key] = Body
+            self.puts.append(Key)
+
+
+def _write_templates(project_dir: Path) -> Path:
+    generated = project_dir / "templates" / "generated"
+    (generated / "services").mkdir(parents=True)
+    (project_dir / "templates" / "custom").mkdir(parents=True)
+    (generated / "services" / "web.yaml").write_text("Resources: {}\n")
+    (project_dir / "templates" / "custom" / "overrides.yaml").write_text(
+        "Resources:\n  Nested:\n    Type: AWS::CloudFormation::Stack\n"
+        "    Properties:\n      TemplateURL: 'extra.yaml'\n"
+    )
+    (project_dir / "templates" / "custom" / "extra.yaml").write_text("Resources: {}\n")
+    root = generated / "root.yaml"
+    root.write_text(
+        "Resources:\n"
+        "  ServiceWeb:\n"
+        "    Type: AWS::CloudFormation::Stack\n"
+        "    Properties:\n"
+        "      TemplateURL: services/web.yaml\n"
+        "      Parameters:\n"
+        "        ProjectName: !Ref ProjectName\n"
+        "  CustomOverrides:\n"
+        "    Type: AWS::CloudFormation::Stack\n"
+        "    Properties:\n"
+        "      TemplateURL: ../custom/overrides.yaml\n"
+        "  External:\n"
+        "    Type: AWS::CloudFormation::Stack\n"
+        "    Properties:\n"
+        "      TemplateURL: https://example.s3.amazonaws.com/t.yaml\n"
+    )
+    return root
+
+
+def test_package_rewrites_nested_urls_and_skips_existing(tmp_path: Path) -> None:
+    root = _write_templates(tmp_path)
+    s3 = FakeS3()
+
+    first = package_nested_templates(
+        root, s3=s3, bucket="artifacts", region="eu-west-1", key_prefix="templates/demo"
+    )
+    second = package_nested_templates(
+        root, s3=s3, bucket="artifacts", region="eu-west-1", key_prefix="templates/demo"
+    )
+
+    # web.yaml and extra.yaml share a body, so they share one content-hash key.
+    assert len(first.uploads) == 2
+    assert sorted(first.uploaded) == sorted(first.uploads)
+    assert second.uploaded == [] and sorted(second.reused) == sorted(first.uploads)
+    assert len(s3.puts) == 2
+
+    assert "services/web.yaml" not in first.body
+    assert "../custom/overrides.yaml" not in first.body
+    assert "https://example.s3.amazonaws.com/t.yaml" in first.body
+    assert first.body.count("https://artifacts.s3.eu-west-1.amazonaws.com/templates/demo/") == 2
+    assert "ProjectName: !Ref ProjectName" in first.body
+    overrides = next(body for body in first.uploads.values() if "Nested" in body)
+    assert "TemplateURL: 'extra.yaml'" not in overrides
+    assert "templates/demo/" in overrides
+
+
+def test_package_rejects_missing_nested_template(tmp_path: Path) -> None:
+    root = tmp_path / "root.yaml"
+    root.write_text("Resources:\n  A:\n    Properties:\n      TemplateURL: missing.yaml\n")
+
+    with pytest.raises(FileNotFoundError):
+        package_nested_templates(
+            root, s3=FakeS3(), bucket="b", region="us-east-1", key_prefix="t"
+        )
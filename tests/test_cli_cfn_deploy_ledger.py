@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+from darth_infra.cli import cfn
+from darth_infra.cli.deploy_ledger import DeployLedger
+from darth_infra.config.models import ProjectConfig, ServiceConfig
+
+
+class FakeCloudFormation:
+    def __init__(self) -> None:
+        self.change_sets: list[dict] = []
+        self.updated_at = datetime(2026, 1, 1, tzinfo=UTC)
+
+    def describe_stacks(self, StackName: str) -> dict:
+        return {
+            "Stacks": [
+                {
+                    "StackId": "stack-id-1",
+                    "StackStatus": "UPDATE_COMPLETE",
+                    "LastUpdatedTime": self.updated_at,
+                }
+            ]
+        }
+
+    def create_change_set(self, **kwargs) -> dict:
+        self.change_sets.append(kwargs)
+        return {"Id": f"cs-{len(self.change_sets)}"}
+
+    def execute_change_set(self, ChangeSetName: str, StackName: str) -> None:
+        self.updated_at = datetime(2026, 1, 1, 0, len(self.change_sets), tzinfo=UTC)
+
+
+def _lookups(listener_arn: str = "") -> cfn.ResolvedLookupData:
+    return cfn.ResolvedLookupData(
+        vpc_id="vpc-1",
+        vpc_cidr="10.0.0.0/16",
+        private_subnet_ids=["subnet-a"],
+        public_subnet_ids=["subnet-b"],
+        shared_listener_arn=listener_arn,
+        shared_alb_security_group_id="",
+        shared_alb_dns_name="",
+        default_listener_priority=None,
+        path_rule_priorities={},
+        rds_snapshot_identifier="",
+        external_secret_arns={},
+        existing_service_discovery_namespace_id="",
+    )
+
+
+def test_deploy_skips_change_set_when_fingerprint_matches(
+    monkeypatch, tmp_path: Path
+) -> None:
+    cf = FakeCloudFormation()
+    monkeypatch.setattr(cfn, "aws_client", lambda *args, **kwargs: cf)
+    monkeypatch.setattr(
+        cfn, "_validate_update_stack_named_resource_collisions", lambda **kw: None
+    )
+    monkeypatch.setattr(
+        cfn, "_wait_for_changeset", lambda *args: ("CREATE_COMPLETE", "", [])
+    )
+    monkeypatch.setattr(cfn, "_monitor_stack_deploy", lambda **kwargs: True)
+
+    config = ProjectConfig(project_name="demo", services=[ServiceConfig(name="web")])
+    template = tmp_path / "packaged-root.yaml"
+    template.write_text("Resources: {}\n")
+    ledger = DeployLedger(tmp_path)
+
+    def deploy(lookups: cfn.ResolvedLookupData, ledger: DeployLedger = ledger) -> int:
+        return cfn.deploy_changeset(
+            config,
+            "prod",
+            template,
+            lookups,
+            no_execute=False,
+            changeset_name=None,
+            deploy_ledger=ledger,
+        )
+
+    assert deploy(_lookups()) == 0
+    assert "TemplateBody" in cf.change_sets[0]
+
+    # Same template and parameters: no change set at all.
+    assert deploy(_lookups()) == 0
+    assert len(cf.change_sets) == 1
+
+    # Only a parameter changed: the previous template is reused.
+    assert deploy(_lookups(listener_arn="arn:listener")) == 0
+    assert cf.change_sets[1].get("UsePreviousTemplate") is True
+    assert "TemplateBody" not in cf.change_sets[1]
+
+    # Someone else updated the stack since: always create a full change set.
+    cf.updated_at = datetime(2026, 2, 1, tzinfo=UTC)
+    assert deploy(_lookups(listener_arn="arn:listener")) == 0
+    assert "TemplateBody" in cf.change_sets[2]
+
+    forced = DeployLedger(tmp_path, refresh=True)
+    assert deploy(_lookups(listener_arn="arn:listener"), forced) == 0
+    assert len(cf.change_sets) == 4
+
+
+def test_prepared_or_named_change_sets_ignore_the_ledger(
+    monkeypatch, tmp_path: Path
+) -> None:
+    cf = FakeCloudFormation()
+    monkeypatch.setattr(cfn, "aws_client", lambda *args, **kwargs: cf)
+    monkeypatch.setattr(
+        cfn, "_validate_update_stack_named_resource_collisions", lambda **kw: None
+    )
+    monkeypatch.setattr(
+        cfn, "_wait_for_changeset", lambda *args: ("CREATE_COMPLETE", "", [])
+    )
+    monkeypatch.setattr(cfn, "_monitor_stack_deploy", lambda **kwargs: True)
+
+    config = ProjectConfig(project_name="demo", services=[ServiceConfig(name="web")])
+    template = tmp_path / "packaged-root.yaml"
+    template.write_text("Resources: {}\n")
+    ledger = DeployLedger(tmp_path)
+
+    def deploy(*, no_execute: bool = False, changeset_name: str | None = None) -> int:
+        return cfn.deploy_changeset(
+            config,
+            "prod",
+            template,
+            _lookups(),
+            no_execute=no_execute,
+            changeset_name=changeset_name,
+            deploy_ledger=ledger,
+        )
+
+    assert deploy() == 0
+    # The fingerprint matches, yet a prepared change set is still created in full.
+    assert deploy(no_execute=True) == 0
+    assert len(cf.change_sets) == 2
+    assert "TemplateBody" in cf.change_sets[1]
+
+    assert deploy(changeset_name="release-42") == 0
+    assert cf.change_sets[2]["ChangeSetName"] == "release-42"
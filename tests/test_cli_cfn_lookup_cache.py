@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from darth_infra.cli import cfn
+from darth_infra.cli.lookup_cache import LookupCache
+from darth_infra.config.models import ProjectConfig, ServiceConfig
+
+
+class FakeSts:
+    def get_caller_identity(self) -> dict[str, str]:
+        return {"Account": "123456789012"}
+
+
+def _patch_lookups(monkeypatch) -> dict[str, int]:
+    calls = {"network": 0, "alb": 0, "validate": 0, "snapshot": 0}
+
+    def count(name, result):
+        def run(*args, **kwargs):
+            calls[name] += 1
+            return result
+
+        return run
+
+    monkeypatch.setattr(cfn, "aws_client", lambda *args, **kwargs: FakeSts())
+    monkeypatch.setattr(
+        cfn,
+        "_resolve_network",
+        count("network", ("vpc-1", "10.0.0.0/16", ["subnet-a"], ["subnet-b"])),
+    )
+    monkeypatch.setattr(cfn, "_resolve_shared_alb", count("alb", ("", "", "")))
+    monkeypatch.setattr(cfn, "_resolve_listener_priorities", lambda *a: (None, {}))
+    monkeypatch.setattr(cfn, "_resolve_rds_snapshot", count("snapshot", ""))
+    monkeypatch.setattr(cfn, "_resolve_external_secrets", lambda *a: {})
+    monkeypatch.setattr(
+        cfn, "_resolve_existing_service_discovery_namespace", lambda *a: ""
+    )
+    monkeypatch.setattr(cfn, "_validate_resolved_lookup_data", count("validate", None))
+    return calls
+
+
+def _config() -> ProjectConfig:
+    return ProjectConfig(project_name="demo", services=[ServiceConfig(name="web")])
+
+
+def test_lookup_cache_reuses_stable_lookups_until_refreshed(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls = _patch_lookups(monkeypatch)
+
+    first = cfn.resolve_lookup_data(_config(), "prod", cache=LookupCache(tmp_path))
+    second = cfn.resolve_lookup_data(_config(), "prod", cache=LookupCache(tmp_path))
+
+    assert first == second
+    assert second.private_subnet_ids == ["subnet-a"]
+    assert calls == {"network": 1, "alb": 1, "validate": 1, "snapshot": 2}
+
+    cfn.resolve_lookup_data(
+        _config(), "prod", cache=LookupCache(tmp_path, refresh=True)
+    )
+    assert calls["network"] == 2
+
+    other_vpc = _config()
+    other_vpc.vpc_name = "other-vpc"
+    cfn.resolve_lookup_data(other_vpc, "prod", cache=LookupCache(tmp_path))
+    assert calls["network"] == 3
+
+
+def test_lookup_cache_expires_and_invalidates(monkeypatch, tmp_path: Path) -> None:
+    cache = LookupCache(tmp_path, ttl_seconds=60)
+    cache.put("key", {"vpc_id": "vpc-1"})
+    assert cache.get("key") == {"vpc_id": "vpc-1"}
+
+    now = cfn.time.time()
+    monkeypatch.setattr("darth_infra.cli.lookup_cache.time.time", lambda: now + 61)
+    assert cache.get("key") is None
+
+    monkeypatch.undo()
+    cache.invalidate()
+    assert cache.get("key") is None
+    assert not cache.path.exists()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from darth_infra.cli.cfn import _resolve_external_secrets, _run_dependent_lookups
+from darth_infra.config.models import (
+    ProjectConfig,
+    SecretConfig,
+    SecretSource,
+    ServiceConfig,
+)
+
+
+def test_dependent_lookups_run_independent_work_concurrently() -> None:
+    order: list[str] = []
+    lock = threading.Lock()
+
+    def lookup(name: str, result):
+        def run(*deps):
+            time.sleep(0.2)
+            with lock:
+                order.append(name)
+            return (result, deps)
+
+        return run
+
+    started = time.monotonic()
+    results = _run_dependent_lookups(
+        {
+            "network": ((), lookup("network", "vpc-1")),
+            "alb": ((), lookup("alb", "listener")),
+            "secrets": ((), lookup("secrets", {})),
+            "namespace": (("network",), lookup("namespace", "ns-1")),
+        }
+    )
+
+    assert time.monotonic() - started < 0.6
+    assert results["namespace"] == ("ns-1", (("vpc-1", ()),))
+    assert order.index("namespace") > order.index("network")
+
+
+def test_dependent_lookups_reraise_first_failure() -> None:
+    def fail():
+        raise RuntimeError("no VPC")
+
+    with pytest.raises(RuntimeError, match="no VPC"):
+        _run_dependent_lookups(
+            {
+                "network": ((), fail),
+                "namespace": (("network",), lambda network: "ns-1"),
+            }
+        )
+
+
+def test_external_secrets_are_described_concurrently(monkeypatch) -> None:
+    class FakeSecretsManager:
+        def describe_secret(self, *, SecretId: str) -> dict[str, str]:
+            time.sleep(0.2)
+            return {"ARN": f"arn:aws:secretsmanager:::secret:{SecretId}"}
+
+    config = ProjectConfig(
+        project_name="demo",
+        services=[ServiceConfig(name="web", port=8000)],
+        secrets=[
+            SecretConfig(
+                name=f"S{i}",
+                source=SecretSource.EXISTING,
+                existing_secret_name=f"shared/s{i}",
+            )
+            for i in range(4)
+        ],
+    )
+
+    started = time.monotonic()
+    arns = _resolve_external_secrets(config, FakeSecretsManager())
+
+    assert time.monotonic() - started < 0.6
+    assert list(arns) == ["S0", "S1", "S2", "S3"]
+    assert arns["S2"] == "arn:aws:secretsmanager:::secret:shared/s2"
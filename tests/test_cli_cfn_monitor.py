@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime, timedelta
+
+from darth_infra.cli import cfn
+from darth_infra.cli.poller import AdaptivePoller
+from darth_infra.config.models import ProjectConfig, ServiceConfig
+
+
+class FakeCloudFormation:
+    def __init__(self) -> None:
+        self.status_calls = 0
+
+    def describe_stacks(self, StackName: str) -> dict:
+        self.status_calls += 1
+        status = "UPDATE_IN_PROGRESS" if self.status_calls < 3 else "UPDATE_COMPLETE"
+        return {"Stacks": [{"StackStatus": status}]}
+
+    def describe_stack_events(self, StackName: str) -> dict:
+        return {"StackEvents": []}
+
+
+def test_monitor_does_not_block_on_slow_sources(monkeypatch) -> None:
+    release = threading.Event()
+    ecs_calls = 0
+
+    def slow_ecs(**kwargs):
+        nonlocal ecs_calls
+        ecs_calls += 1
+        release.wait(timeout=5)
+        return {"rows": [], "messages": []}
+
+    monkeypatch.setattr(cfn, "aws_client", lambda *args, **kwargs: object())
+    monkeypatch.setattr(cfn, "_collect_ecs_deploy_observability", slow_ecs)
+    monkeypatch.setattr(cfn, "_collect_incomplete_resources", lambda cf, name, **kwargs: [])
+    monkeypatch.setattr(cfn, "_MONITOR_TICK_BUDGET_SECONDS", 0.05)
+    monkeypatch.setattr(
+        cfn,
+        "AdaptivePoller",
+        lambda **kwargs: AdaptivePoller(**kwargs, sleep=lambda seconds: None),
+    )
+
+    cf = FakeCloudFormation()
+    try:
+        success = cfn._monitor_stack_deploy(
+            cf=cf,
+            config=ProjectConfig(
+                project_name="demo", services=[ServiceConfig(name="web")]
+            ),
+            env_name="prod",
+            stack_name="demo-ecs-prod",
+            max_poll_interval_seconds=15,
+        )
+    finally:
+        release.set()
+
+    assert success is True
+    assert cf.status_calls == 3
+    # The stuck ECS collection rolled over instead of being resubmitted.
+    assert ecs_calls == 1
+
+
+class FakeEcs:
+    def __init__(self, tasks: list[dict]) -> None:
+        self.tasks = {task["taskArn"]: task for task in tasks}
+        self.list_calls = 0
+        self.described: list[list[str]] = []
+
+    def list_tasks(self, **kwargs) -> dict:
+        self.list_calls += 1
+        group = f"service:{kwargs['serviceName']}"
+        arns = [arn for arn, task in self.tasks.items() if task["group"] == group]
+        start = int(kwargs.get("nextToken", 0))
+        end = start + kwargs["maxResults"]
+        page = {"taskArns": arns[start:end]}
+        if end < len(arns):
+            page["nextToken"] = str(end)
+        return page
+
+    def describe_tasks(self, cluster: str, tasks: list[str]) -> dict:
+        self.described.append(tasks)
+        return {"tasks": [self.tasks[arn] for arn in tasks]}
+
+
+def _task(task_id: str, group: str, last_status: str = "STOPPED") -> dict:
+    return {
+        "taskArn": f"arn:aws:ecs:us-east-1:1:task/demo/{task_id}",
+        "group": group,
+        "lastStatus": last_status,
+        "stoppedReason": "Essential container in task exited",
+        "containers": [{"name": "app", "reason": "exit 1"}],
+    }
+
+
+def test_task_failures_are_listed_per_service_and_described_once() -> None:
+    ecs = FakeEcs(
+        [
+            _task("t1", "service:demo-prod-web"),
+            _task("t2", "service:demo-prod-worker"),
+            _task("t3", "service:demo-prod-web", last_status="DEPROVISIONING"),
+            _task("t4", "family:seed-copy"),
+        ]
+    )
+    state = cfn.DeployMonitorState(
+        stack_events=None,
+        seen_service_event_keys=None,
+        stopped_tasks={},
+        log_since_ms_by_service={},
+        last_pending_signature="",
+    )
+    names = {"demo-prod-web": "web", "demo-prod-worker": "worker"}
+
+    first = cfn._collect_recent_task_failures("demo", names, ecs, state)
+    assert sorted(first) == ["web", "worker"]
+    assert [m["key"] for m in first["web"]] == ["web task", "web container"]
+    # One batched describe for both services; other workloads are never listed.
+    assert len(ecs.described) == 1 and len(ecs.described[0]) == 3
+
+    ecs.tasks[_task("t3", "")["taskArn"]]["lastStatus"] = "STOPPED"
+    second = cfn._collect_recent_task_failures("demo", names, ecs, state)
+    # Only the task that was still stopping is described again.
+    assert ecs.described[1] == [_task("t3", "")["taskArn"]]
+    assert list(second) == ["web"]
+
+    assert cfn._collect_recent_task_failures("demo", names, ecs, state) == {}
+    assert len(ecs.described) == 2 and ecs.list_calls == 6
+
+
+def test_task_failures_page_through_large_listings_and_expire_by_age() -> None:
+    now = datetime.now(UTC)
+    # A busy shared cluster: other stacks' stopped tasks are filtered out by
+    # ECS and cost no calls at all.
+    tasks = [
+        {**_task(f"o{index}", "service:other-prod-api"), "stoppedAt": now}
+        for index in range(1000)
+    ]
+    tasks += [
+        {**_task(f"w{index}", "service:demo-prod-web"), "stoppedAt": now}
+        for index in range(450)
+    ]
+    tasks.append({**_task("crash", "service:demo-prod-web"), "stoppedAt": now})
+    expired = {
+        **_task("expired", "service:demo-prod-web"),
+        "stoppedAt": now - timedelta(hours=2),
+    }
+    tasks.append(expired)
+    ecs = FakeEcs(tasks)
+    state = cfn.DeployMonitorState(
+        stack_events=None,
+        seen_service_event_keys=None,
+        stopped_tasks={"cached-old": expired},
+        log_since_ms_by_service={},
+        last_pending_signature="",
+    )
+    names = {"demo-prod-web": "web"}
+
+    failures = cfn._collect_recent_task_failures("demo", names, ecs, state)
+    # The crash sits past the first three pages and is still found; the task
+    # that stopped two hours ago is neither cached nor reported.
+    assert any(m["value"].startswith("stopped (crash)") for m in failures["web"])
+    assert len(failures["web"]) == 451 * 2
+    assert ecs.list_calls == 5 and len(ecs.described) == 5
+    assert "cached-old" not in state.stopped_tasks
+    assert expired["taskArn"] not in state.stopped_tasks
+    assert len(state.stopped_tasks) == 451
+
+    ecs.described.clear()
+    assert cfn._collect_recent_task_failures("demo", names, ecs, state) == {}
+    assert ecs.described == [[expired["taskArn"]]]
+
+
+class FakeNestedCloudFormation:
+    def __init__(self) -> None:
+        self.listed: list[str] = []
+        self.web_status = "UPDATE_IN_PROGRESS"
+
+    def get_paginator(self, name: str):
+        cf = self
+
+        class Paginator:
+            def paginate(self, StackName: str):
+                cf.listed.append(StackName)
+                yield {"StackResourceSummaries": cf.resources(StackName)}
+
+        return Paginator()
+
+    def resources(self, stack_name: str) -> list[dict]:
+        if stack_name == "root":
+            return [
+                {
+                    "LogicalResourceId": "ServiceWeb",
+                    "ResourceType": "AWS::CloudFormation::Stack",
+                    "PhysicalResourceId": "arn:web",
+                    "ResourceStatus": self.web_status,
+                    "LastUpdatedTimestamp": "t1",
+                }
+            ]
+        return [
+            {
+                "LogicalResourceId": "Service",
+                "ResourceType": "AWS::ECS::Service",
+                "ResourceStatus": "UPDATE_COMPLETE",
+            }
+        ]
+
+
+def test_incomplete_resources_skip_settled_nested_stacks() -> None:
+    cf = FakeNestedCloudFormation()
+    settled: dict = {}
+
+    cfn._collect_incomplete_resources(cf, "root", settled_stacks=settled)
+    cf.web_status = "UPDATE_COMPLETE"
+    cfn._collect_incomplete_resources(cf, "root", settled_stacks=settled)
+    rows = cfn._collect_incomplete_resources(cf, "root", settled_stacks=settled)
+
+    assert rows == []
+    assert cf.listed == ["root", "arn:web", "root", "arn:web", "root"]
+
+
+NEW_TASK_DEF = "arn:aws:ecs:us-east-1:1:task-definition/demo-prod-web:8"
+OLD_TASK_DEF = "arn:aws:ecs:us-east-1:1:task-definition/demo-prod-web:7"
+
+
+def _run_fail_fast_monitor(monkeypatch, stopped_tasks: list[dict]) -> tuple[bool, bool]:
+    class FakeUpdatingCloudFormation(FakeCloudFormation):
+        cancelled = False
+
+        def describe_stacks(self, StackName: str) -> dict:
+            self.status_calls += 1
+            if self.cancelled:
+                status = "UPDATE_ROLLBACK_COMPLETE"
+            elif self.status_calls < 4:
+                status = "UPDATE_IN_PROGRESS"
+            else:
+                status = "UPDATE_COMPLETE"
+            return {"Stacks": [{"StackStatus": status}]}
+
+        def cancel_update_stack(self, StackName: str) -> None:
+            self.cancelled = True
+
+    def ecs_source(*, state, **kwargs):
+        state.primary_task_definitions["web"] = NEW_TASK_DEF
+        for index, task in enumerate(stopped_tasks):
+            state.stopped_tasks[f"task-{index}"] = {
+                "group": "service:demo-prod-web",
+                "createdAt": datetime.now(UTC),
+                "stoppedAt": datetime.now(UTC),
+                **task,
+            }
+        return {"rows": [], "messages": []}
+
+    monkeypatch.setattr(cfn, "aws_client", lambda *args, **kwargs: object())
+    monkeypatch.setattr(cfn, "_collect_ecs_deploy_observability", ecs_source)
+    monkeypatch.setattr(cfn, "_collect_incomplete_resources", lambda *a, **kw: [])
+    monkeypatch.setattr(
+        cfn,
+        "AdaptivePoller",
+        lambda **kwargs: AdaptivePoller(**kwargs, sleep=lambda seconds: None),
+    )
+
+    cf = FakeUpdatingCloudFormation()
+    success = cfn._monitor_stack_deploy(
+        cf=cf,
+        config=ProjectConfig(
+            project_name="demo", services=[ServiceConfig(name="web")]
+        ),
+        env_name="prod",
+        stack_name="demo-ecs-prod",
+        max_poll_interval_seconds=15,
+        fail_fast=cfn.FailFastPolicy(max_failed_tasks=3, window_minutes=5),
+    )
+    return success, cf.cancelled
+
+
+def test_fail_fast_cancels_update_on_crash_loop(monkeypatch) -> None:
+    crashed = {
+        "taskDefinitionArn": NEW_TASK_DEF,
+        "stopCode": "EssentialContainerExited",
+        "containers": [{"name": "app", "exitCode": 1}],
+    }
+
+    success, cancelled = _run_fail_fast_monitor(monkeypatch, [crashed] * 3)
+
+    assert cancelled is True
+    assert success is False
+
+
+def test_fail_fast_ignores_old_revision_tasks_stopped_by_rollout(monkeypatch) -> None:
+    scaled_in = {
+        "taskDefinitionArn": OLD_TASK_DEF,
+        "stopCode": "ServiceSchedulerInitiated",
+        "stoppedReason": "Scaling activity initiated by (deployment ecs-svc/123)",
+        "containers": [{"name": "app", "exitCode": 137}],
+    }
+    # Even without the stop code, an old revision never counts.
+    old_crash = {**scaled_in, "stopCode": "EssentialContainerExited"}
+
+    success, cancelled = _run_fail_fast_monitor(
+        monkeypatch, [scaled_in, scaled_in, scaled_in, old_crash, old_crash]
+    )
+
+    assert cancelled is False
+    assert success is True
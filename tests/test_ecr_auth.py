@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import base64
+import subprocess
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from darth_infra.cli import ecr_auth, image_ops
+from darth_infra.config.models import ProjectConfig
+
+
+class FakeEcr:
+    def __init__(self, expires_in: timedelta = timedelta(hours=12)) -> None:
+        self.calls = 0
+        self.expires_in = expires_in
+
+    def get_authorization_token(self):
+        self.calls += 1
+        token = base64.b64encode(f"AWS:secret-{self.calls}".encode()).decode()
+        return {
+            "authorizationData": [
+                {
+                    "authorizationToken": token,
+                    "expiresAt": datetime.now(UTC) + self.expires_in,
+                }
+            ]
+        }
+
+
+def test_ecr_credentials_reuses_cached_token(tmp_path: Path) -> None:
+    cache_path = tmp_path / "ecr-auth.json"
+    ecr = FakeEcr()
+
+    first = ecr_auth.ecr_credentials("123", "us-east-1", cache_path=cache_path, ecr=ecr)
+    second = ecr_auth.ecr_credentials("123", "us-east-1", cache_path=cache_path, ecr=ecr)
+
+    assert first.username == "AWS"
+    assert first.password == second.password == "secret-1"
+    assert ecr.calls == 1
+    assert cache_path.stat().st_mode & 0o077 == 0
+
+    ecr_auth.ecr_credentials("123", "eu-west-1", cache_path=cache_path, ecr=ecr)
+    assert ecr.calls == 2
+
+
+def test_ecr_credentials_refreshes_expiring_token(tmp_path: Path) -> None:
+    cache_path = tmp_path / "ecr-auth.json"
+    ecr = FakeEcr(expires_in=timedelta(minutes=1))
+
+    ecr_auth.ecr_credentials("123", "us-east-1", cache_path=cache_path, ecr=ecr)
+    refreshed = ecr_auth.ecr_credentials(
+        "123", "us-east-1", cache_path=cache_path, ecr=ecr
+    )
+
+    assert ecr.calls == 2
+    assert refreshed.password == "secret-2"
+
+
+def test_ecr_docker_login_runs_docker_login_once_per_token(monkeypatch) -> None:
+    logins: list[tuple[list[str], str | None]] = []
+
+    def fake_run_quiet(cmd, *, cwd=None, shell=False, input_text=None):
+        logins.append((cmd, input_text))
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(image_ops, "_docker_logins", {})
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run_quiet)
+    monkeypatch.setattr(
+        image_ops,
+        "ecr_credentials",
+        lambda account, region: ecr_auth.EcrCredentials(
+            "AWS", f"token-{account}-{region}", datetime.now(UTC) + timedelta(hours=1)
+        ),
+    )
+    config = ProjectConfig(project_name="demo", services=[], aws_region="us-east-1")
+    registry = "123456789012.dkr.ecr.us-east-1.amazonaws.com"
+
+    assert image_ops.ecr_docker_login(config, registry).returncode == 0
+    assert image_ops.ecr_docker_login(config, registry).returncode == 0
+
+    assert len(logins) == 1
+    cmd, password = logins[0]
+    assert cmd[:2] == ["docker", "login"] and cmd[-1] == registry
+    assert password == "token-123456789012-us-east-1"
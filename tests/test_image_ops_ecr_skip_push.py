@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import subprocess
+
+from darth_infra.cli import image_ops
+from darth_infra.config.models import ProjectConfig, ServiceConfig
+
+REGISTRY = "123456789012.dkr.ecr.us-east-1.amazonaws.com"
+LOCAL_ID = "sha256:" + "a" * 64
+MANIFEST_DIGEST = "sha256:" + "b" * 64
+
+
+class FakeEcr:
+    def __init__(self, images: list[dict]) -> None:
+        self.images = images
+        self.put_calls: list[tuple[str, str]] = []
+
+    def batch_get_image(
+        self, *, repositoryName: str, imageIds: list[dict], acceptedMediaTypes=None
+    ) -> dict:
+        found = []
+        for image_id in imageIds:
+            for image in self.images:
+                if image_id.get("imageTag") in image["tags"] or (
+                    image_id.get("imageDigest") == image["digest"]
+                ):
+                    found.append(
+                        {
+                            "imageId": {"imageDigest": image["digest"], **image_id},
+                            "imageManifest": image["manifest"],
+                            "imageManifestMediaType": "application/vnd.docker.distribution.manifest.v2+json",
+                        }
+                    )
+        return {"images": found}
+
+    def batch_check_layer_availability(self, *, repositoryName, layerDigests) -> dict:
+        return {
+            "layers": [
+                {"layerDigest": digest, "layerAvailability": "UNAVAILABLE"}
+                for digest in layerDigests
+            ]
+        }
+
+    def put_image(self, **kwargs) -> dict:
+        self.put_calls.append((kwargs["repositoryName"], kwargs["imageTag"]))
+        return {}
+
+
+def _patch_local_image(monkeypatch, docker_calls: list[list[str]]) -> None:
+    def fake_run_capture(cmd, *, cwd=None):
+        payload = {"Id": LOCAL_ID, "RepoDigests": []}
+        return subprocess.CompletedProcess(cmd, 0, json.dumps(payload), "")
+
+    def fake_run(cmd, *, cwd=None, shell=False):
+        docker_calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(image_ops, "_run_capture", fake_run_capture)
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run)
+    monkeypatch.setattr(
+        image_ops, "_run_streaming", lambda cmd, *, on_line, **kwargs: fake_run(cmd)
+    )
+
+
+def _pipeline(ecr: FakeEcr, status: dict[str, str]):
+    config = ProjectConfig(
+        project_name="demo", services=[ServiceConfig(name="web", port=8000)]
+    )
+    return image_ops._push_service_pipeline(
+        config,
+        "prod",
+        config.services[0],
+        ecr=ecr,
+        registry=REGISTRY,
+        immutable_tag="build-20260101000000",
+        status_by_service=status,
+    )
+
+
+def test_push_skips_docker_when_ecr_has_identical_image(monkeypatch) -> None:
+    docker_calls: list[list[str]] = []
+    _patch_local_image(monkeypatch, docker_calls)
+    ecr = FakeEcr(
+        [
+            {
+                "tags": ["latest"],
+                "digest": MANIFEST_DIGEST,
+                "manifest": json.dumps({"config": {"digest": LOCAL_ID}}),
+            }
+        ]
+    )
+    status: dict[str, str] = {}
+    result = _pipeline(ecr, status)
+
+    assert result.returncode == 0
+    assert docker_calls == []
+    assert ecr.put_calls == [("demo/prod/web", "build-20260101000000")]
+    assert status["web"].startswith("unchanged in ECR")
+
+
+def test_push_uploads_once_and_retags_latest_via_manifest(monkeypatch) -> None:
+    docker_calls: list[list[str]] = []
+    _patch_local_image(monkeypatch, docker_calls)
+    ecr = FakeEcr(
+        [
+            {
+                "tags": ["build-20260101000000"],
+                "digest": MANIFEST_DIGEST,
+                "manifest": json.dumps({"config": {"digest": "sha256:" + "c" * 64}}),
+            }
+        ]
+    )
+    status: dict[str, str] = {}
+    result = _pipeline(ecr, status)
+
+    assert result.returncode == 0
+    assert [cmd[1] for cmd in docker_calls] == ["tag", "push"]
+    assert ecr.put_calls == [("demo/prod/web", "latest")]
+    assert status["web"] == "pushed latest + immutable"
+
+
+def test_push_images_mounts_shared_image_into_follower_repos(monkeypatch) -> None:
+    docker_calls: list[list[str]] = []
+    _patch_local_image(monkeypatch, docker_calls)
+    ecr = FakeEcr(
+        [
+            {
+                "tags": ["build-20260101000000"],
+                "digest": MANIFEST_DIGEST,
+                "manifest": json.dumps({"config": {"digest": "sha256:" + "c" * 64}}),
+            }
+        ]
+    )
+    monkeypatch.setattr(image_ops, "resolve_ecr_registry", lambda config: REGISTRY)
+    monkeypatch.setattr(
+        image_ops,
+        "ecr_docker_login",
+        lambda config, registry: subprocess.CompletedProcess([], 0, "", ""),
+    )
+    monkeypatch.setattr(image_ops, "aws_client", lambda *args, **kwargs: ecr)
+    monkeypatch.setattr(image_ops, "build_immutable_tag", lambda: "build-20260101000000")
+    monkeypatch.setattr(image_ops, "ecr_credentials", lambda account, region: None)
+    mounts: list[tuple[str, str, str]] = []
+
+    def fake_mount(registry, credentials, source_repo, target_repo, digest):
+        mounts.append((source_repo, target_repo, digest))
+        return True
+
+    monkeypatch.setattr(image_ops, "_mount_blob", fake_mount)
+    config = ProjectConfig(
+        project_name="demo",
+        services=[
+            ServiceConfig(name="web", port=8000),
+            ServiceConfig(name="worker", port=None),
+        ],
+    )
+
+    image_ops.push_images(config, "prod", None, jobs=4)
+
+    # Only the first service of the shared image is pushed with docker.
+    pushes = [cmd[-1] for cmd in docker_calls if cmd[1] == "push"]
+    assert pushes == [f"{REGISTRY}/demo/prod/web:build-20260101000000"]
+    assert mounts == [("demo/prod/web", "demo/prod/worker", "sha256:" + "c" * 64)]
+    assert ("demo/prod/worker", "build-20260101000000") in ecr.put_calls
+    assert ("demo/prod/worker", "latest") in ecr.put_calls
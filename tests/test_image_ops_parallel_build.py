@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from darth_infra.cli import image_ops
+from darth_infra.config.models import LaunchType, ProjectConfig, ServiceConfig
+
+
+def _config() -> ProjectConfig:
+    return ProjectConfig(
+        project_name="demo",
+        services=[
+            ServiceConfig(name="web", port=8000, docker_build_target="web"),
+            ServiceConfig(name="worker", port=None, docker_build_target="worker"),
+            ServiceConfig(name="beat", port=None, docker_build_target="beat"),
+            ServiceConfig(name="search", image="docker.io/library/opensearch:2"),
+        ],
+    )
+
+
+def _patch_docker(monkeypatch, returncodes: dict[str, int], delay: float = 0.0):
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def fake_run_quiet(cmd, *, cwd=None, shell=False):
+        if cmd[:2] == ["docker", "tag"]:
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+        tag = cmd[cmd.index("-t") + 1]
+        service = tag.split(":")[0].removeprefix("demo-")
+        with lock:
+            calls.append(service)
+        time.sleep(delay)
+        code = returncodes.get(service, 0)
+        return subprocess.CompletedProcess(cmd, code, "", "boom" if code else "")
+
+    def fake_run_capture(cmd, *, cwd=None):
+        return subprocess.CompletedProcess(cmd, 0, f"sha256:{cmd[-1]}\n", "")
+
+    monkeypatch.setattr(image_ops, "ensure_docker_buildx", lambda: None)
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run_quiet)
+    monkeypatch.setattr(image_ops, "_run_capture", fake_run_capture)
+    return calls
+
+
+def test_build_images_builds_internal_services_concurrently(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls = _patch_docker(monkeypatch, {}, delay=0.2)
+    started = time.monotonic()
+    image_ops.build_images(_config(), tmp_path, None, jobs=3)
+    assert sorted(calls) == ["beat", "web", "worker"]
+    assert time.monotonic() - started < 0.5
+
+
+def test_build_images_fail_fast_cancels_queued_builds(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls = _patch_docker(monkeypatch, {"web": 7})
+    with pytest.raises(SystemExit) as excinfo:
+        image_ops.build_images(_config(), tmp_path, None, jobs=1)
+    assert excinfo.value.code == 7
+    assert calls == ["web"]
+
+
+def test_build_images_keep_going_reports_first_failure(
+    monkeypatch, tmp_path: Path
+) -> None:
+    calls = _patch_docker(monkeypatch, {"web": 3, "beat": 5})
+    with pytest.raises(SystemExit) as excinfo:
+        image_ops.build_images(
+            _config(), tmp_path, None, jobs=1, keep_going=True
+        )
+    assert excinfo.value.code == 3
+    assert calls == ["web", "worker", "beat"]
+
+
+def test_default_build_jobs_is_bounded_by_service_count() -> None:
+    assert image_ops.default_build_jobs(1) == 1
+    assert 1 <= image_ops.default_build_jobs(50) <= 50
+
+
+def test_build_images_skips_services_with_unchanged_inputs(
+    monkeypatch, tmp_path: Path
+) -> None:
+    (tmp_path / "Dockerfile").write_text("FROM python:3.12\n")
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    calls = _patch_docker(monkeypatch, {})
+    image_ops.build_images(_config(), tmp_path, None, jobs=1)
+    assert len(calls) == 3
+
+    calls.clear()
+    image_ops.build_images(_config(), tmp_path, None, jobs=1)
+    assert calls == []
+
+    (tmp_path / "app.py").write_text("print('changed')\n")
+    image_ops.build_images(_config(), tmp_path, "web", jobs=1)
+    assert calls == ["web"]
+
+    calls.clear()
+    image_ops.build_images(_config(), tmp_path, "web", jobs=1, force=True)
+    assert calls == ["web"]
+
+
+def test_build_images_bake_mode_runs_one_bake_for_changed_services(
+    monkeypatch, tmp_path: Path
+) -> None:
+    (tmp_path / "docker").mkdir()
+    (tmp_path / "docker" / "Dockerfile").write_text("FROM python:3.12\n")
+    config = _config()
+    config.services[0].dockerfile = "docker/Dockerfile"
+    config.services[0].docker_build_target = "web"
+    _patch_docker(monkeypatch, {})
+    bake_calls: list[list[str]] = []
+
+    def fake_run_quiet(cmd, *, cwd=None, shell=False):
+        bake_calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run_quiet)
+    image_ops.build_images(config, tmp_path, None, bake=True)
+
+    assert len(bake_calls) == 1
+    assert bake_calls[0][:3] == ["docker", "buildx", "bake"]
+    bake = json.loads((tmp_path / ".darth-infra/build/docker-bake.json").read_text())
+    assert sorted(bake["group"]["default"]["targets"]) == ["beat", "web", "worker"]
+    assert bake["target"]["web"]["dockerfile"] == "docker/Dockerfile"
+    assert bake["target"]["web"]["target"] == "web"
+    assert bake["target"]["web"]["tags"] == ["demo-web:latest"]
+
+    bake_calls.clear()
+    image_ops.build_images(config, tmp_path, None, bake=True)
+    assert bake_calls == []
+
+
+def test_registry_cache_flags_target_service_ecr_repo() -> None:
+    config = _config()
+    cache_ref = image_ops.registry_cache_ref(
+        "123456789012.dkr.ecr.us-east-1.amazonaws.com", "demo", "prod", "web"
+    )
+    assert cache_ref.endswith("/demo/prod/web:buildcache")
+
+    cmd = image_ops._buildx_build_command(config, config.services[0], cache_ref=cache_ref)
+    assert cmd[cmd.index("--cache-from") + 1] == f"type=registry,ref={cache_ref}"
+    cache_to = cmd[cmd.index("--cache-to") + 1]
+    assert cache_to.startswith(f"type=registry,ref={cache_ref},mode=max")
+    assert "image-manifest=true" in cache_to
+    assert cmd[-1] == "."
+
+
+class _FakeEcr:
+    def __init__(self) -> None:
+        self.put_calls: list[tuple[str, str]] = []
+
+    def batch_get_image(self, *, repositoryName, imageIds):
+        digest = imageIds[0]["imageDigest"]
+        return {
+            "images": [
+                {"imageId": {"imageDigest": digest}, "imageManifest": "{}"}
+            ]
+        }
+
+    def put_image(self, *, repositoryName, imageManifest, imageTag, **_):
+        self.put_calls.append((repositoryName, imageTag))
+        return {}
+
+    def describe_images(self, *, repositoryName, imageIds):
+        size = 100 if imageIds[0]["imageTag"] == "latest" else 80
+        return {"imageDetails": [{"imageSizeInBytes": size}]}
+
+
+def test_build_images_push_mode_pushes_without_local_load(
+    monkeypatch, tmp_path: Path
+) -> None:
+    (tmp_path / "Dockerfile").write_text("FROM python:3.12\n")
+    registry = "123456789012.dkr.ecr.us-east-1.amazonaws.com"
+    builds: list[list[str]] = []
+    ecr = _FakeEcr()
+
+    def fake_run_quiet(cmd, *, cwd=None, shell=False):
+        builds.append(cmd)
+        metadata = Path(cmd[cmd.index("--metadata-file") + 1])
+        metadata.write_text(json.dumps({"containerimage.digest": "sha256:abc"}))
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(image_ops, "ensure_docker_buildx", lambda: None)
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run_quiet)
+    monkeypatch.setattr(image_ops, "resolve_ecr_registry", lambda config: registry)
+    monkeypatch.setattr(
+        image_ops,
+        "ecr_docker_login",
+        lambda config, reg: subprocess.CompletedProcess([], 0, "", ""),
+    )
+    monkeypatch.setattr(image_ops, "aws_client", lambda *a, **kw: ecr)
+    monkeypatch.setattr(image_ops, "build_immutable_tag", lambda: "20260101-abc")
+
+    image_ops.build_images(_config(), tmp_path, "web", push_env="prod")
+
+    assert len(builds) == 1
+    cmd = builds[0]
+    assert cmd[cmd.index("--output") + 1] == "type=registry"
+    assert "--load" not in cmd
+    tags = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-t"]
+    assert tags == [
+        f"{registry}/demo/prod/web:20260101-abc",
+        f"{registry}/demo/prod/web:latest",
+    ]
+    manifest = json.loads(
+        (tmp_path / ".darth-infra/build/image-manifest.json").read_text()
+    )
+    assert manifest["services"]["web"]["pushed_digests"] == {"prod": "sha256:abc"}
+
+    builds.clear()
+    image_ops.build_images(_config(), tmp_path, "web", push_env="prod")
+    assert builds == []
+    assert ecr.put_calls == [
+        ("demo/prod/web", "20260101-abc"),
+        ("demo/prod/web", "latest"),
+    ]
+
+
+def test_build_command_targets_service_platform() -> None:
+    config = ProjectConfig(
+        project_name="demo",
+        services=[
+            ServiceConfig(name="web", port=8000),
+            ServiceConfig(
+                name="search",
+                port=None,
+                launch_type=LaunchType.EC2,
+                ec2_instance_type="m7g.large",
+            ),
+        ],
+    )
+    web, search = config.services
+
+    assert image_ops.service_platform(web) == "linux/amd64"
+    assert image_ops.service_platform(search) == "linux/arm64"
+    cmd = image_ops._buildx_build_command(config, search)
+    assert cmd[cmd.index("--platform") + 1] == "linux/arm64"
+
+    push_target = image_ops._RegistryPushTarget(
+        ecr=None,
+        registry="123456789012.dkr.ecr.us-east-1.amazonaws.com",
+        env_name="prod",
+        immutable_tag="build-1",
+        multi_arch=True,
+    )
+    cmd = image_ops._buildx_build_command(config, web, push_target=push_target)
+    assert cmd[cmd.index("--platform") + 1] == "linux/amd64,linux/arm64"
+
+
+def test_build_images_multi_arch_requires_push(monkeypatch, tmp_path: Path) -> None:
+    _patch_docker(monkeypatch, {})
+    with pytest.raises(SystemExit) as excinfo:
+        image_ops.build_images(_config(), tmp_path, None, multi_arch=True)
+    assert excinfo.value.code == 1
+
+
+def test_build_images_builds_shared_images_once(monkeypatch, tmp_path: Path) -> None:
+    config = ProjectConfig(
+        project_name="demo",
+        services=[
+            ServiceConfig(name="web", port=8000, command="gunicorn app"),
+            ServiceConfig(name="worker", port=None, command="celery worker"),
+            ServiceConfig(name="beat", port=None, command="celery beat"),
+            ServiceConfig(name="admin", port=None, docker_build_target="admin"),
+        ],
+    )
+    assert [
+        [service.name for service in group]
+        for group in image_ops.group_by_build_identity(config.services)
+    ] == [["web", "worker", "beat"], ["admin"]]
+
+    builds: list[list[str]] = []
+    tags: list[list[str]] = []
+
+    def fake_run_quiet(cmd, *, cwd=None, shell=False):
+        (tags if cmd[1] == "tag" else builds).append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(image_ops, "ensure_docker_buildx", lambda: None)
+    monkeypatch.setattr(image_ops, "_run_quiet", fake_run_quiet)
+    monkeypatch.setattr(
+        image_ops,
+        "_run_capture",
+        lambda cmd, *, cwd=None: subprocess.CompletedProcess(cmd, 0, "sha256:x\n", ""),
+    )
+
+    image_ops.build_images(config, tmp_path, None)
+    assert len(builds) == 2
+    web_build = next(cmd for cmd in builds if "demo-web:latest" in cmd)
+    assert [web_build[i + 1] for i, arg in enumerate(web_build) if arg == "-t"] == [
+        "demo-web:latest",
+        "demo-worker:latest",
+        "demo-beat:latest",
+    ]
+
+    builds.clear()
+    image_ops.build_images(config, tmp_path, None)
+    assert builds == []
+    assert sorted(cmd[-1] for cmd in tags) == ["demo-beat:latest", "demo-worker:latest"]
+
+
+def test_push_target_output_enables_forced_zstd_compression() -> None:
+    push_target = image_ops._RegistryPushTarget(
+        ecr=None,
+        registry="123456789012.dkr.ecr.us-east-1.amazonaws.com",
+        env_name="prod",
+        immutable_tag="build-1",
+        compression="zstd",
+        compression_level=9,
+    )
+    assert push_target.output() == (
+        "type=registry,compression=zstd,force-compression=true,"
+        "compression-level=9,oci-mediatypes=true"
+    )
+
+
+def test_build_images_compression_requires_push(monkeypatch, tmp_path: Path) -> None:
+    _patch_docker(monkeypatch, {})
+    with pytest.raises(SystemExit) as excinfo:
+        image_ops.build_images(_config(), tmp_path, None, compression="zstd")
+    assert excinfo.value.code == 1
+
+
+def test_build_images_records_size_history_and_flags_growth(
+    monkeypatch, tmp_path: Path, capsys
+) -> None:
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    _patch_docker(monkeypatch, {})
+    sizes = iter([400_000_000, 900_000_000])
+    current: dict[str, int] = {}
+
+    def fake_run_capture(cmd, *, cwd=None):
+        if cmd[1] == "history":
+            lines = [
+                json.dumps({"Size": "350000000", "CreatedBy": "/bin/sh -c pip install -r req.txt"}),
+                json.dumps({"Size": "0", "CreatedBy": "/bin/sh -c #(nop)  CMD [\"app\"]"}),
+            ]
+            return subprocess.CompletedProcess(cmd, 0, "\n".join(lines), "")
+        if "{{json .}}" in cmd:
+            size = current.setdefault("size", next(sizes))
+            payload = {"Id": "sha256:web", "Size": size}
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(payload), "")
+        return subprocess.CompletedProcess(cmd, 0, f"sha256:{cmd[-1]}\n", "")
+
+    monkeypatch.setattr(image_ops, "_run_capture", fake_run_capture)
+    image_ops.build_images(_config(), tmp_path, "web", size_budget_mb=500)
+    current.clear()
+    (tmp_path / "app.py").write_text("print('changed')\n")
+    image_ops.build_images(_config(), tmp_path, "web", size_budget_mb=500)
+
+    history = json.loads(
+        (tmp_path / ".darth-infra/build/image-history.json").read_text()
+    )
+    records = history["services"]["web"]
+    assert [record["size_bytes"] for record in records] == [400_000_000, 900_000_000]
+    assert records[-1]["layer_count"] == 2
+    assert records[-1]["largest_layers"][0] == [350000000, "pip install -r req.txt"]
+    output = capsys.readouterr().out
+    assert "web grew 125.0%" in output
+    assert "over the 500MB budget" in output
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+
+from darth_infra.cli import image_ops
+from darth_infra.cli.ecr_auth import EcrCredentials
+from darth_infra.config.models import ProjectConfig, ServiceConfig
+
+REGISTRY = "123456789012.dkr.ecr.us-east-1.amazonaws.com"
+INDEX_DIGEST = "sha256:" + "1" * 64
+AMD64_DIGEST = "sha256:" + "2" * 64
+ARM64_DIGEST = "sha256:" + "3" * 64
+
+
+def _platform_manifest(prefix: str) -> str:
+    return json.dumps(
+        {
+            "config": {"digest": f"sha256:{prefix}c"},
+            "layers": [{"digest": "sha256:base"}, {"digest": f"sha256:{prefix}app"}],
+        }
+    )
+
+
+class FakeEcr:
+    def __init__(self) -> None:
+        self.manifests = {
+            INDEX_DIGEST: json.dumps(
+                {"manifests": [{"digest": AMD64_DIGEST}, {"digest": ARM64_DIGEST}]}
+            ),
+            AMD64_DIGEST: _platform_manifest("amd"),
+            ARM64_DIGEST: _platform_manifest("arm"),
+        }
+        self.target_blobs = {"sha256:base"}
+        self.put_calls: list[tuple[str, str | None, str | None]] = []
+
+    def batch_get_image(self, *, repositoryName, imageIds, acceptedMediaTypes=None):
+        images = []
+        for image_id in imageIds:
+            digest = INDEX_DIGEST if image_id.get("imageTag") else image_id["imageDigest"]
+            images.append(
+                {
+                    "imageId": {"imageDigest": digest, **image_id},
+                    "imageManifest": self.manifests[digest],
+                }
+            )
+        return {"images": images}
+
+    def describe_images(self, *, repositoryName, imageIds):
+        return {"imageDetails": [{"imageTags": ["latest", "build-20260101120000"]}]}
+
+    def batch_check_layer_availability(self, *, repositoryName, layerDigests):
+        return {
+            "layers": [
+                {
+                    "layerDigest": digest,
+                    "layerAvailability": "AVAILABLE"
+                    if digest in self.target_blobs
+                    else "UNAVAILABLE",
+                }
+                for digest in layerDigests
+            ]
+        }
+
+    def put_image(self, *, repositoryName, imageManifest, imageTag=None, imageDigest=None, **_):
+        self.put_calls.append((repositoryName, imageTag, imageDigest))
+        return {}
+
+
+def test_promote_mounts_missing_blobs_and_copies_manifests(monkeypatch) -> None:
+    ecr = FakeEcr()
+    mounts: list[tuple[str, str, str]] = []
+
+    def fake_mount(registry, credentials, source_repo, target_repo, digest):
+        mounts.append((source_repo, target_repo, digest))
+        return True
+
+    monkeypatch.setattr(image_ops, "resolve_ecr_registry", lambda config: REGISTRY)
+    monkeypatch.setattr(image_ops, "aws_client", lambda *args, **kwargs: ecr)
+    monkeypatch.setattr(image_ops, "ecr_credentials", lambda account, region: None)
+    monkeypatch.setattr(image_ops, "_mount_blob", fake_mount)
+    config = ProjectConfig(
+        project_name="demo",
+        services=[
+            ServiceConfig(name="web", port=8000),
+            ServiceConfig(name="search", image="docker.io/library/opensearch:2"),
+        ],
+        environments=["prod", "feature-xyz"],
+    )
+
+    image_ops.promote_images(config, "prod", "feature-xyz", None)
+
+    assert sorted(digest for _, _, digest in mounts) == [
+        "sha256:amdapp",
+        "sha256:amdc",
+        "sha256:armapp",
+        "sha256:armc",
+    ]
+    assert {(source, target) for source, target, _ in mounts} == {
+        ("demo/prod/web", "demo/feature-xyz/web")
+    }
+    assert ecr.put_calls == [
+        ("demo/feature-xyz/web", None, AMD64_DIGEST),
+        ("demo/feature-xyz/web", None, ARM64_DIGEST),
+        ("demo/feature-xyz/web", "build-20260101120000", None),
+        ("demo/feature-xyz/web", "latest", None),
+    ]
+
+
+def test_declined_mount_cancels_upload_session(monkeypatch) -> None:
+    requests: list[tuple[str, str]] = []
+
+    class FakeResponse:
+        status = 202
+        headers = {"Location": "/v2/demo/feature-xyz/web/blobs/uploads/abc"}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info) -> None:
+            return None
+
+    def fake_urlopen(request, timeout):
+        requests.append((request.get_method(), request.full_url))
+        return FakeResponse()
+
+    monkeypatch.setattr(image_ops.urllib.request, "urlopen", fake_urlopen)
+
+    mounted = image_ops._mount_blob(
+        REGISTRY,
+        EcrCredentials(username="AWS", password="token", expires_at=datetime.now(UTC)),
+        "demo/prod/web",
+        "demo/feature-xyz/web",
+        "sha256:base",
+    )
+
+    assert mounted is False
+    assert requests[1] == (
+        "DELETE",
+        f"https://{REGISTRY}/v2/demo/feature-xyz/web/blobs/uploads/abc",
+    )
+
+
+def test_promote_reports_copy_fallback_per_service(monkeypatch) -> None:
+    ecr = FakeEcr()
+    copied: list[str] = []
+    printed: list[str] = []
+
+    monkeypatch.setattr(image_ops, "resolve_ecr_registry", lambda config: REGISTRY)
+    monkeypatch.setattr(image_ops, "aws_client", lambda *args, **kwargs: ecr)
+    monkeypatch.setattr(image_ops, "ecr_credentials", lambda account, region: None)
+    monkeypatch.setattr(image_ops, "_mount_blob", lambda *args: False)
+    monkeypatch.setattr(
+        image_ops, "_copy_blob", lambda ecr, source, target, digest: copied.append(digest)
+    )
+    monkeypatch.setattr(
+        image_ops.console, "print", lambda message, *a, **kw: printed.append(str(message))
+    )
+    config = ProjectConfig(
+        project_name="demo",
+        services=[ServiceConfig(name="web", port=8000)],
+        environments=["prod", "feature-xyz"],
+    )
+
+    image_ops.promote_images(config, "prod", "feature-xyz", None)
+
+    assert len(copied) == 4
+    assert any("web: registry declined 4 layer mount(s)" in line for line in printed)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+from darth_infra.cli.image_ops import _PushProgress, _run_streaming
+
+# What ``docker push`` writes when stdout is a terminal: every layer line is
+# redrawn in place with cursor movement and carriage returns.
+_FAKE_DOCKER_PUSH = r"""
+import sys
+if not sys.stdout.isatty():
+    print("5f70bf18a086: Preparing")
+    print("5f70bf18a086: Pushed")
+    sys.exit(0)
+w = sys.stdout.write
+w("The push refers to repository [demo/web]\n")
+w("5f70bf18a086: Preparing \r\n")
+w("a3ed95caeb02: Preparing \r\n")
+w("\x1b[2A\x1b[2K\r5f70bf18a086: Layer already exists \r\x1b[2B")
+w("\x1b[1A\x1b[2K\ra3ed95caeb02: Pushing [=====>      ]  12.5MB/50MB\r\x1b[1B")
+sys.stdout.flush()
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs a pseudo-terminal")
+def test_streaming_under_pty_reports_byte_progress() -> None:
+    progress = _PushProgress()
+    lines: list[str] = []
+
+    def on_line(line: str) -> None:
+        lines.append(line)
+        progress.feed(line)
+
+    result = _run_streaming(
+        [sys.executable, "-c", _FAKE_DOCKER_PUSH], on_line=on_line, pseudo_tty=True
+    )
+
+    assert result.returncode == 0
+    assert not any("\x1b" in line for line in lines)
+    assert progress.describe() == "1/2 layers, 12.5MB/50.0MB"
+
+
+def test_streaming_over_pipe_reports_layers_only() -> None:
+    progress = _PushProgress()
+    result = _run_streaming(
+        [sys.executable, "-c", _FAKE_DOCKER_PUSH], on_line=progress.feed
+    )
+
+    assert result.returncode == 0
+    assert progress.describe() == "1/1 layers"
+
+
+def test_push_progress_tracks_layers_and_bytes() -> None:
+    progress = _PushProgress()
+    for line in [
+        "The push refers to repository [123.dkr.ecr.us-east-1.amazonaws.com/demo/prod/web]",
+        "5f70bf18a086: Preparing",
+        "a3ed95caeb02: Preparing",
+        "5f70bf18a086: Layer already exists",
+        "a3ed95caeb02: Pushing [=====>      ]  12.5MB/50MB",
+    ]:
+        progress.feed(line)
+
+    assert progress.describe() == "1/2 layers, 12.5MB/50.0MB"
+
+    progress.feed("a3ed95caeb02: Pushed")
+    progress.feed(
+        "build-20260101000000: digest: sha256:"
+        + "0" * 64
+        + " size: 1234"
+    )
+    assert progress.describe() == "2/2 layers, 50.0MB/50.0MB"
+    assert progress.digest == "sha256:" + "0" * 64
+
+
+def test_push_progress_before_any_layer_output() -> None:
+    assert _PushProgress().describe() == "preparing"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from botocore.exceptions import ClientError
+
+from darth_infra.cli import cfn
+from darth_infra.cli.poller import AdaptivePoller, is_throttling_error
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_poller_backs_off_while_idle_and_resets_on_change() -> None:
+    clock = FakeClock()
+    poller = AdaptivePoller(
+        min_interval=1, max_interval=4, backoff=2, clock=clock, sleep=clock.sleep
+    )
+
+    for state in ["A", "A", "A", "A", "B"]:
+        poller.observe(state)
+        poller.wait()
+    assert clock.sleeps == [1, 2, 4, 4, 1]
+
+    poller.throttled()
+    assert poller.interval == 2
+    poller.throttled()
+    poller.throttled()
+    assert poller.interval == 8
+
+    poller.observe("B", progress=0.25)
+    assert poller.remaining_seconds == clock.now * 3
+    assert "remaining" in poller.describe()
+
+
+def test_wait_for_changeset_backs_off_on_throttling(monkeypatch) -> None:
+    clock = FakeClock()
+    monkeypatch.setattr(
+        cfn,
+        "AdaptivePoller",
+        lambda **kwargs: AdaptivePoller(**kwargs, clock=clock, sleep=clock.sleep),
+    )
+    throttle = ClientError({"Error": {"Code": "Throttling"}}, "DescribeChangeSet")
+    responses: list[object] = [
+        {"Status": "CREATE_PENDING"},
+        throttle,
+        {"Status": "CREATE_IN_PROGRESS"},
+        {"Status": "CREATE_COMPLETE", "Changes": [{"Type": "Resource"}]},
+    ]
+
+    class FakeCloudFormation:
+        def describe_change_set(self, ChangeSetName: str) -> dict:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+    status, _, changes = cfn._wait_for_changeset(FakeCloudFormation(), "cs-1")
+
+    assert is_throttling_error(throttle)
+    assert status == "CREATE_COMPLETE" and changes == [{"Type": "Resource"}]
+    assert clock.sleeps == [0.5, 1.0, 0.5]
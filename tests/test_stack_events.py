@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from darth_infra.cli.stack_events import RecentKeys, StackEventReader
+
+T0 = datetime(2026, 1, 1, tzinfo=UTC)
+NESTED_ARN = "arn:aws:cloudformation:us-east-1:1:stack/demo-ServiceWeb/abc"
+
+
+def _event(event_id: str, minute: int, **extra) -> dict:
+    return {
+        "EventId": event_id,
+        "Timestamp": T0 + timedelta(minutes=minute),
+        "LogicalResourceId": extra.pop("logical", event_id),
+        "ResourceType": extra.pop("type", "AWS::ECS::Service"),
+        "ResourceStatus": extra.pop("status", "UPDATE_IN_PROGRESS"),
+        **extra,
+    }
+
+
+class FakeCloudFormation:
+    """Serves events newest first, two per page."""
+
+    def __init__(self) -> None:
+        self.events: dict[str, list[dict]] = {"root": [], NESTED_ARN: []}
+        self.calls: list[tuple[str, str | None]] = []
+
+    def describe_stack_events(self, StackName: str, NextToken: str | None = None):
+        self.calls.append((StackName, NextToken))
+        newest_first = sorted(
+            self.events[StackName], key=lambda e: e["Timestamp"], reverse=True
+        )
+        start = int(NextToken or 0)
+        page = {"StackEvents": newest_first[start : start + 2]}
+        if start + 2 < len(newest_first):
+            page["NextToken"] = str(start + 2)
+        return page
+
+
+def test_reader_pages_back_to_cursor_and_follows_nested_stacks() -> None:
+    cf = FakeCloudFormation()
+    cf.events["root"] = [_event("old", -10, status="UPDATE_COMPLETE")]
+    reader = StackEventReader(cf, "root", since=T0)
+
+    cf.events["root"] += [
+        _event("r1", 1),
+        _event(
+            "r2",
+            2,
+            logical="ServiceWeb",
+            type="AWS::CloudFormation::Stack",
+            PhysicalResourceId=NESTED_ARN,
+            StackId="root-id",
+        ),
+        _event("r3", 3),
+    ]
+    cf.events[NESTED_ARN] = [_event("n1", 2), _event("n2", 3)]
+    first = reader.read_new()
+    assert [e["EventId"] for e in first] == ["r1", "r2", "n1", "r3", "n2"]
+    assert first[2]["StackLabel"] == "ServiceWeb"
+
+    # Three new root events span two pages; reading stops at the cursor.
+    cf.calls.clear()
+    cf.events["root"] += [
+        _event("r4", 4),
+        _event("r5", 5),
+        _event(
+            "r6",
+            6,
+            logical="ServiceWeb",
+            type="AWS::CloudFormation::Stack",
+            status="UPDATE_COMPLETE",
+            PhysicalResourceId=NESTED_ARN,
+            StackId="root-id",
+        ),
+    ]
+    second = reader.read_new()
+    assert [e["EventId"] for e in second] == ["r4", "r5", "r6"]
+    assert cf.calls == [("root", None), ("root", "2"), (NESTED_ARN, None)]
+
+    # The nested stack finished, so it is no longer polled.
+    cf.calls.clear()
+    assert reader.read_new() == []
+    assert cf.calls == [("root", None)]
+    assert reader.events_read == 8
+
+
+def test_recent_keys_forget_entries_outside_window() -> None:
+    keys = RecentKeys(window=timedelta(minutes=5))
+    assert keys.add("a", T0)
+    assert not keys.add("a", T0)
+    assert keys.add("b", T0 + timedelta(minutes=10))
+    assert len(keys) == 1
+    # Too old to matter: treated as already seen.
+    assert not keys.add("c", T0)